@@ -1,6 +1,22 @@
 import argparse
+import signal
 
 from pants.solver import PantsSolver
+from pants.astar import AStarSolver
+from pants.idastar import IDAStarSolver
+from pants.bidirectional import BidirectionalSolver
+from pants.oracle import OracleSolver
+from pants.vectorized import VectorizedSolver
+from pants.portfolio import PortfolioSolver
+from pants.hda import HDASolver
+from pants.bounded import BeamSolver, BoundedSolver
+from pants.anytime import AnytimeSolver
+from pants.constructive import ConstructiveSolver
+from pants.macros import MacroSolver, MacroAStarSolver, carry_macros
+from pants.optimize import shorten
+from pants.stats import SolverStats
+from pants.store import SolutionStore
+from pants.trace import SearchTrace
 from pants import heuristics
 
 
@@ -15,10 +31,129 @@ def display(solver):
         print('Nodes evaluated:  {}'.format(solver.evaluated))
 
 
+def optimize(solver, window):
+    if solver.solved:
+        before = solver.solution.depth
+        solver.solution = shorten(solver.solution, window)
+        print('Optimized:  {} moves, from {}'.format(solver.solution.depth, before))
+
+
+def display_constructive(solver, show_path):
+    # Large solutions are only counted, never stored
+    if show_path:
+        path = solver.path()
+    else:
+        solver.solve()
+    print('Solved!')
+    print('Moves:  {}'.format(solver.length))
+    if show_path:
+        print(str(path))
+
+
+def display_stats(stats):
+    summary = stats.summary()
+    print('Iterations:  {}'.format(summary['iterations']))
+    print('Nodes expanded:  {}'.format(summary['expanded']))
+    print('Duplicates pruned:  {}'.format(summary['duplicates']))
+    print('Largest working set:  {}'.format(summary['frontier_peak']))
+    print('Time:  {:.3f}s ({:.0f} nodes/sec)'.format(summary['seconds'], summary['nodes_per_second'] or 0))
+    for phase, seconds in summary['phases'].items():
+        print('    {:<12}{:8.3f}s  {:5.1f}%'.format(phase, seconds, 100 * seconds / (summary['seconds'] or 1)))
+
+
+def display_progress(stats):
+    print('Iteration {}:  {} evaluated, {:.0f} nodes/sec, working set {}'.format(
+        stats.iterations, stats.solver.evaluated, stats.nodes_per_second or 0, len(stats.solver.working_set)))
+
+
+def display_improvements(solver):
+    for improvement in solver.improvements:
+        weight = 'best-first' if improvement['weight'] == float('inf') else 'weight {}'.format(improvement['weight'])
+        print('{:8.3f}s:  {} moves ({}, {} nodes evaluated)'.format(
+            improvement['seconds'], improvement['moves'], weight, improvement['evaluated']))
+    print('Optimal:  {}'.format('yes' if solver.optimal else 'not proven'))
+
+
+def solve_with_checkpoints(solver, filename, every):
+    # Job schedulers stop jobs with SIGTERM.  Rather than interrupting an
+    # iteration half way, stop (and save) at the next snapshot.
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    saved = solver.iterations
+    for snapshot in solver.iter_solve(min(every, 1000)):
+        if stopping or snapshot['iterations'] - saved >= every:
+            solver.checkpoint(filename)
+            saved = snapshot['iterations']
+        if stopping:
+            print('Interrupted after {} iterations, saved to {}'.format(solver.iterations, filename))
+            break
+
+
 def run():
     parser = argparse.ArgumentParser(description='Solve the Pants Problem.')
     parser.add_argument('--size', type=int, default=5, help='The size of the problem set (defaults to 5)')
     parser.add_argument('--heuristic', default='BreadthFirst', help='The heuristc class to use.')
+    parser.add_argument('--algorithm', choices=['best-first', 'astar', 'idastar', 'bidirectional', 'oracle', 'vectorized', 'hda',
+                                                'beam', 'bounded', 'anytime', 'constructive'],
+                        help='The search algorithm to use (defaults to best-first, or constructive above --constructive-above)')
+    parser.add_argument('--constructive-above', type=int, default=100,
+                        help='The size above which the constructive solver is used when no --algorithm is given '
+                             '(defaults to 100)')
+    parser.add_argument('--weight', type=float,
+                        help='The weight of the heuristic score for astar and idastar (defaults to 1.0), '
+                             'or for hda (defaults to greedy best-first)')
+    parser.add_argument('--batch-size', type=int, default=16,
+                        help='The number of paths expanded together by vectorized (defaults to 16)')
+    parser.add_argument('--width', type=int, default=100,
+                        help='The number of paths kept from each layer by beam (defaults to 100)')
+    parser.add_argument('--max-nodes', type=int,
+                        help='The most paths bounded keeps in its working set and its closed set')
+    parser.add_argument('--max-memory', type=float,
+                        help='The memory budget of bounded in megabytes, used when --max-nodes is not given')
+    parser.add_argument('--time-limit', type=float,
+                        help='The number of seconds to search for (best-first, astar, vectorized, bounded and anytime); '
+                             'anytime keeps improving its solution until then')
+    parser.add_argument('--macros', action='store_true',
+                        help='Search best-first or astar by compound moves:  carrying a value, or jumping the pointer')
+    parser.add_argument('--max-carry', type=int,
+                        help='The longest carry (and twice the longest jump) of --macros (defaults to the whole state)')
+    parser.add_argument('--optimize', type=int, nargs='?', const=8,
+                        help='Shorten the solution by replacing every N moves with a shortest series (N defaults to 8)')
+    parser.add_argument('--store', nargs='?', const='',
+                        help='Reuse and extend the solutions of earlier runs kept in this SQLite file '
+                             '(defaults to $PANTS_STORE, or pants-store.sqlite in the temp directory)')
+    parser.add_argument('--symmetry', action='store_true',
+                        help='Treat mirror image states as duplicates (all but oracle, hda and beam)')
+    parser.add_argument('--portfolio',
+                        help='A comma separated list of heuristic classes to race in parallel, instead of --heuristic')
+    parser.add_argument('--workers', type=int, help='The number of worker processes for hda (defaults to the CPU count)')
+    parser.add_argument('--jobs', type=int, help='The number of worker processes for --portfolio (defaults to the CPU count)')
+    parser.add_argument('--deadline', type=float, help='The number of seconds to wait for --portfolio solutions')
+    parser.add_argument('--shortest', action='store_true',
+                        help='Keep the shortest --portfolio solution within the deadline, rather than the first')
+    parser.add_argument('--stats', action='store_true',
+                        help='Count and time the phases of the search, and print the totals')
+    parser.add_argument('--progress', type=int, nargs='?', const=10000,
+                        help='Print progress every N iterations of best-first, astar and vectorized (defaults to 10000)')
+    parser.add_argument('--trace',
+                        help='Record every push and expansion of a best-first style search to this binary file '
+                             '(see python3 -m pants.trace)')
+    parser.add_argument('--checkpoint',
+                        help='Save the search of best-first, astar or vectorized to this file as it goes, '
+                             'and when interrupted (without an iteration limit)')
+    parser.add_argument('--checkpoint-every', type=int, default=100000,
+                        help='The number of iterations between checkpoints (defaults to 100000)')
+    parser.add_argument('--resume', help='Continue the search saved in this checkpoint file')
+    parser.add_argument('--frontier', default='auto', choices=['auto', 'heap', 'bucket'],
+                        help='The priority queue for best-first, astar and vectorized (defaults to auto)')
+    parser.add_argument('--tie-break', default='fifo', choices=['fifo', 'lifo', 'deepest'],
+                        help='The order of equally scored paths for best-first, astar and vectorized (defaults to fifo)')
 
     args = parser.parse_args()
 
@@ -28,19 +163,229 @@ def run():
     print('Initial state:  {}'.format(initial))
     print('Goal state  {}:'.format(goal))
 
+    store = None if args.store is None else SolutionStore(args.store or None)
+
+    if args.algorithm is None and not args.portfolio:
+        args.algorithm = 'constructive' if args.size > args.constructive_above else 'best-first'
+
+    if args.algorithm == 'constructive':
+        print('Algorithm:  constructive (heuristic unused)')
+        display_constructive(ConstructiveSolver(initial, goal), args.size <= args.constructive_above)
+        return
+
+    if args.portfolio:
+        names = args.portfolio.split(',')
+        print('Portfolio:  {}'.format(', '.join(names)))
+
+        try:
+            solver = PortfolioSolver(initial, goal, names, args.jobs, args.deadline, args.shortest)
+        except ValueError as error:
+            print('ERROR:  {}'.format(error))
+            return
+
+        solver.solve()
+        if solver.solved:
+            print('Winner:  {}'.format(solver.winner))
+        if args.optimize:
+            optimize(solver, args.optimize)
+        if store is not None and solver.solved:
+            store.record(goal, solver.solution)
+        display(solver)
+        return
+
     heuristic = getattr(heuristics, args.heuristic, None)
+    weight = 1.0 if args.weight is None else args.weight
 
     if heuristic and type(heuristic) is type:
         print('Heuristic:  {}'.format(args.heuristic))
 
-        solver = PantsSolver(
-            initial=initial,
-            goal=goal,
-            heuristic=heuristic(goal)
-        )
+        if args.algorithm == 'astar':
+            print('Algorithm:  A* (weight {})'.format(weight))
+            if args.macros:
+                solver = MacroAStarSolver(
+                    initial=initial,
+                    goal=goal,
+                    heuristic=heuristic(goal),
+                    macros=carry_macros(args.size, args.max_carry),
+                    weight=weight,
+                    frontier=args.frontier,
+                    tie_break=args.tie_break,
+                    symmetry=args.symmetry
+                )
+            else:
+                solver = AStarSolver(
+                    initial=initial,
+                    goal=goal,
+                    heuristic=heuristic(goal),
+                    weight=weight,
+                    frontier=args.frontier,
+                    tie_break=args.tie_break,
+                    symmetry=args.symmetry
+                )
+        elif args.algorithm == 'idastar':
+            print('Algorithm:  IDA* (weight {})'.format(weight))
+            solver = IDAStarSolver(
+                initial=initial,
+                goal=goal,
+                heuristic=heuristic(goal),
+                weight=weight
+            )
+        elif args.algorithm == 'bidirectional':
+            print('Algorithm:  bidirectional breadth-first (heuristic unused)')
+            solver = BidirectionalSolver(
+                initial=initial,
+                goal=goal,
+                symmetry=args.symmetry
+            )
+        elif args.algorithm == 'oracle':
+            print('Algorithm:  exact distance oracle (heuristic unused)')
+            solver = OracleSolver(
+                initial=initial,
+                goal=goal
+            )
+        elif args.algorithm == 'vectorized':
+            print('Algorithm:  vectorized best-first (batches of {})'.format(args.batch_size))
+            solver = VectorizedSolver(
+                initial=initial,
+                goal=goal,
+                heuristic=heuristic(goal),
+                batch_size=args.batch_size,
+                frontier=args.frontier,
+                tie_break=args.tie_break,
+                symmetry=args.symmetry
+            )
+        elif args.algorithm == 'hda':
+            solver = HDASolver(
+                initial=initial,
+                goal=goal,
+                heuristic_class=heuristic,
+                workers=args.workers,
+                weight=args.weight
+            )
+            print('Algorithm:  hash-distributed best-first ({} workers)'.format(solver.workers))
+        elif args.algorithm == 'beam':
+            print('Algorithm:  beam search (width {})'.format(args.width))
+            solver = BeamSolver(
+                initial=initial,
+                goal=goal,
+                heuristic=heuristic(goal),
+                width=args.width
+            )
+        elif args.algorithm == 'anytime':
+            # The improving searches prune with the heuristic, so it must be admissible
+            bound = heuristic if getattr(heuristic, 'admissible', False) else heuristics.KendallTau
+            print('Algorithm:  anytime A* (first solution by best-first, then improved with {})'.format(bound.__name__))
+            solver = AnytimeSolver(
+                initial=initial,
+                goal=goal,
+                heuristic=bound(goal),
+                greedy=heuristic(goal),
+                frontier=args.frontier,
+                tie_break=args.tie_break,
+                symmetry=args.symmetry
+            )
+        elif args.algorithm == 'bounded':
+            if args.max_nodes is None and args.max_memory is None:
+                print('ERROR:  bounded needs --max-nodes or --max-memory')
+                return
+            solver = BoundedSolver(
+                initial=initial,
+                goal=goal,
+                heuristic=heuristic(goal),
+                max_nodes=args.max_nodes,
+                max_bytes=None if args.max_memory is None else int(args.max_memory * 2 ** 20),
+                frontier=args.frontier,
+                tie_break=args.tie_break,
+                symmetry=args.symmetry
+            )
+            print('Algorithm:  memory-bounded best-first ({} nodes)'.format(solver.max_nodes))
+        elif args.macros:
+            print('Algorithm:  best-first by macros')
+            solver = MacroSolver(
+                initial=initial,
+                goal=goal,
+                heuristic=heuristic(goal),
+                macros=carry_macros(args.size, args.max_carry),
+                frontier=args.frontier,
+                tie_break=args.tie_break,
+                symmetry=args.symmetry
+            )
+        else:
+            solver = PantsSolver(
+                initial=initial,
+                goal=goal,
+                heuristic=heuristic(goal),
+                frontier=args.frontier,
+                tie_break=args.tie_break,
+                symmetry=args.symmetry
+            )
 
-        solver.solve()
+        if args.checkpoint or args.resume:
+            if not isinstance(solver, PantsSolver) or args.algorithm == 'anytime' or args.macros:
+                print('ERROR:  --checkpoint and --resume are not available for {}'.format(
+                    'macros' if args.macros else args.algorithm))
+                return
+
+        if args.resume:
+            arguments = {'weight': weight} if args.algorithm == 'astar' else {}
+            if args.algorithm == 'vectorized':
+                arguments['batch_size'] = args.batch_size
+            elif args.algorithm == 'bounded':
+                arguments['max_nodes'] = solver.max_nodes
+            solver = type(solver).resume(args.resume, solver.heuristic, **arguments)
+            print('Resumed:  {} iterations, {} nodes evaluated'.format(solver.iterations, solver.evaluated))
+
+        if args.macros and args.algorithm not in ('best-first', 'astar'):
+            print('(--macros is not available for {})'.format(args.algorithm))
+
+        # Solutions of these searches are the shortest, and so is every remainder of them
+        exact = args.algorithm in ('oracle', 'bidirectional') or (
+            args.algorithm in ('astar', 'idastar') and weight == 1 and getattr(heuristic, 'admissible', False))
+        if store is not None:
+            if isinstance(solver, PantsSolver):
+                store.attach(solver, exact)
+                print('Store:  {} known states'.format(len(store.remainders(goal))))
+            else:
+                print('(--store only records the solution of {})'.format(args.algorithm))
+
+        stats = None
+        if args.stats or args.progress:
+            if isinstance(solver, PantsSolver):
+                stats = SolverStats(solver, timers=args.stats, progress=args.progress and display_progress,
+                                    every=args.progress or 10000)
+            else:
+                print('(--stats and --progress are not available for {})'.format(args.algorithm))
+
+        trace = None
+        if args.trace:
+            if isinstance(solver, PantsSolver):
+                trace = SearchTrace(solver, args.trace)
+            else:
+                print('(--trace is not available for {})'.format(args.algorithm))
+
+        if args.checkpoint:
+            solve_with_checkpoints(solver, args.checkpoint, args.checkpoint_every)
+        elif isinstance(solver, PantsSolver):
+            solver.solve(time_limit=args.time_limit)
+        else:
+            solver.solve()
+        if trace is not None:
+            trace.close()
+        if args.optimize:
+            optimize(solver, args.optimize)
+        if store is not None and solver.solved:
+            store.record(goal, solver.solution, exact or getattr(solver, 'optimal', False))
         display(solver)
+        if stats is not None and args.stats:
+            display_stats(stats)
+        if args.algorithm == 'hda':
+            for index, stats in enumerate(solver.worker_stats):
+                print('Worker {}:  {} expanded, {} evaluated'.format(index, stats['expanded'], stats['evaluated']))
+            print('Load balance:  {:.2f}'.format(solver.load_balance or 1.0))
+        if args.algorithm == 'bounded':
+            print('Paths evicted:  {}'.format(solver.evictions))
+        if args.algorithm == 'anytime':
+            display_improvements(solver)
     else:
         print('ERROR:  Cannot find heuristic with name "{}"'.format(args.heuristic))
 
@@ -0,0 +1,182 @@
+import time
+
+from pants.astar import AStarSolver
+from pants.frontier import make_frontier, FIFO
+from pants.solver import PantsSolver
+
+# The weights of the successive searches, ending with plain (optimal) A*
+WEIGHTS = (5, 3, 2, 1.5, 1.25, 1)
+
+
+class AnytimeSolver(AStarSolver):
+    """
+    An anytime variant of the AStarSolver, in the style of ARA*.
+
+    A first solution is found quickly by greedy best-first search with the
+    `greedy` heuristic (if given), and then improved by weighted A* searches
+    with each of `weights` in turn, until the time limit.  The best solution
+    so far is always `solution`, and `improvements` records each one as it
+    is found, with the seconds since the search started.
+
+    The weighted searches share one working set and table of costs:  when a
+    search finds a solution the weight is lowered, the working set is
+    reordered, and the search carries on from where it was rather than
+    starting again.  Every path that cannot lead to a shorter solution than
+    the best so far - its moves plus the heuristic score are at least as
+    many as the solution's - is pruned, so the heuristic must be admissible
+    (e.g. `KendallTau`).  If the working set runs out, or the search with a
+    weight of 1 finds its solution, the solution is `optimal`.
+    """
+
+    def __init__(self, initial, goal, heuristic, greedy=None, weights=WEIGHTS, max_iterations=1000000,
+                 frontier='auto', tie_break=FIFO, symmetry=False):
+        """
+        Initialization method for AnytimeSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            heuristic (object):   An admissible heuristic, for the weighted searches and pruning
+            greedy (object):      A heuristic for finding the first solution by best-first search, or None
+            weights (list):       The decreasing weights of the heuristic score in each search
+            max_iterations (int): The maximum number of iterations of all the searches together
+            frontier (str):       The working set's priority queue - 'heap', 'bucket', or 'auto'
+            tie_break (str):      The order of paths with equal priorities - 'fifo', 'lifo' or 'deepest'
+            symmetry (bool):      Treat mirror image states as duplicates (see pants.symmetry.Mirror)
+        """
+        self.weights = list(weights)
+        self.greedy = greedy
+        self.improvements = []
+        self.optimal = False
+        self.finished = False
+        self.started = None
+
+        # The number of moves a path must beat to be worth searching
+        self.bound = None
+
+        if frontier == 'auto' and any(weight != int(weight) for weight in self.weights):
+            frontier = 'heap'
+        self.frontier = frontier
+        self.tie_break = tie_break
+
+        super().__init__(initial, goal, heuristic, self.weights[0], max_iterations, frontier, tie_break, symmetry)
+
+    def add_path(self, path):
+        """
+        Add a new PantsPath to the working set, unless its last state has
+        already been reached in as few moves, or it cannot beat the best
+        solution so far.
+        """
+        key = self.key(path)
+        cost = self.costs.get(key)
+        if cost is not None and cost <= path.depth:
+            return
+
+        path.score = self.score(path)
+        self.evaluated += 1
+        if self.bound is not None and path.depth + path.score >= self.bound:
+            return
+
+        self.costs[key] = path.depth
+        self.working_set.push(self.priority(path), path)
+
+    def close(self, path):
+        """
+        Expand a popped PantsPath only if it is still the cheapest path to
+        its state, and can still beat the best solution so far.
+        """
+        if self.bound is not None and path.depth + path.score >= self.bound:
+            return False
+        return super().close(path)
+
+    def iterate(self):
+        """
+        Performs a single cycle of the current weighted search.
+
+        When the goal is expanded it becomes the best solution, and the
+        search moves on to the next weight.
+        """
+        best = self.pop_best()
+
+        if not self.close(best):
+            return
+        self.expanded += 1
+
+        if self.is_goal(best):
+            self.improve(best)
+            self.next_weight()
+        else:
+            for path in self.expand(best):
+                self.add_path(path)
+
+    def improve(self, solution, weight=None):
+        """
+        Record a new best solution.
+        """
+        self.solution = solution
+        self.bound = solution.depth
+        self.improvements.append({
+            'seconds': time.monotonic() - self.started,
+            'moves': solution.depth,
+            'weight': self.weight if weight is None else weight,
+            'evaluated': self.evaluated,
+        })
+
+    def next_weight(self):
+        """
+        Move on to the next (lower) weight, reordering the working set, or
+        finish if this was the last.
+        """
+        if self.weight == self.weights[-1]:
+            self.finished = True
+            self.optimal = self.weight <= 1
+            return
+
+        weight = self.weights[self.weights.index(self.weight) + 1]
+        self.weight = int(weight) if weight == int(weight) else weight
+
+        # Keep only the paths that are still the cheapest to their state and
+        # can beat the new solution
+        entries = self.working_set.ordered()
+        self.working_set = make_frontier(self.frontier, self.tie_break, self.heuristic)
+        for _, path in entries:
+            if path.depth == self.costs[self.key(path)] and path.depth + path.score < self.bound:
+                self.working_set.push(self.priority(path), path)
+
+    def solve(self, time_limit=None):
+        """
+        Search for ever shorter solutions.
+
+        This carries on until one of these conditions occur:
+        1) The search with the last weight finds its solution
+        2) The working set is exhausted (the best solution is optimal)
+        3) The searches have run `max_iterations` iterations
+        4) More than `time_limit` seconds have passed (checked every 256 iterations)
+
+        Args:
+            time_limit (float):  The maximum number of seconds to search for, or None for no limit
+        """
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        stop_at = None if time_limit is None else now + time_limit
+
+        if self.greedy is not None and not self.solved:
+            solver = PantsSolver(self.initial, self.goal, self.greedy, self.max_iterations)
+            solver.solve(time_limit=time_limit)
+            self.evaluated += solver.evaluated
+            self.expanded += solver.expanded
+            if solver.solved:
+                self.improve(solver.solution, weight=float('inf'))
+
+        iteration = 0
+        while not self.finished and self.iterations < self.max_iterations:
+            if not self.working_set:
+                self.finished = True
+                self.optimal = self.solved
+            elif stop_at is not None and not iteration % 256 and time.monotonic() >= stop_at:
+                return
+            else:
+                self.iterate()
+                self.iterations += 1
+                iteration += 1
@@ -0,0 +1,69 @@
+from pants.solver import PantsSolver
+from pants.frontier import FIFO
+
+
+class AStarSolver(PantsSolver):
+    """
+    A (weighted) A* variant of the PantsSolver.
+
+    Rather than ranking PantsPaths by the heuristic score alone, the working
+    set is ordered by `g + weight * h`, where `g` is the number of moves made
+    so far and `h` the heuristic score.  With a weight of 1 and an admissible
+    heuristic (e.g. `KendallTau`) the solution is optimal; larger weights trade
+    solution length for speed, up to plain best-first search.
+
+    A state is re-opened whenever a cheaper path to it is found, so the
+    closed set maps each state to the cheapest number of moves seen so far.
+    """
+
+    def __init__(self, initial, goal, heuristic, weight=1.0, max_iterations=100000, frontier='auto', tie_break=FIFO,
+                 symmetry=False):
+        """
+        Initialization method for AStarSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths
+            weight (float):       The weight given to the heuristic score relative to the path length
+            max_iterations (int): The maximum number of iterations to evaluate when solving the problem
+            frontier (str):       The working set's priority queue - 'heap', 'bucket', or 'auto'
+            tie_break (str):      The order of paths with equal priorities - 'fifo', 'lifo' or 'deepest'
+            symmetry (bool):      Treat mirror image states as duplicates (see pants.symmetry.Mirror)
+        """
+        # Keep priorities integral for integer heuristics (and bucket frontiers),
+        # while a fractional weight makes every priority a float
+        self.weight = int(weight) if weight == int(weight) else weight
+        self.costs = {}
+        if frontier == 'auto' and isinstance(self.weight, float):
+            frontier = 'heap'
+
+        super().__init__(initial, goal, heuristic, max_iterations, frontier, tie_break, symmetry)
+
+    def priority(self, path):
+        return path.depth + self.weight * path.score
+
+    def add_path(self, path):
+        """
+        Add a new PantsPath to the working set, unless its last state has
+        already been reached in as few moves.
+        """
+        key = self.key(path)
+        cost = self.costs.get(key)
+        if cost is not None and cost <= path.depth:
+            return
+        self.costs[key] = path.depth
+
+        path.score = self.score(path)
+        self.working_set.push(self.priority(path), path)
+        self.evaluated += 1
+
+    def close(self, path):
+        """
+        Expand a popped PantsPath only if it is still the cheapest path to its state.
+        """
+        key = self.key(path)
+        if path.depth > self.costs[key]:
+            return False
+        self.closed.add(key)
+        return True
@@ -0,0 +1,249 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from pants import heuristics
+from pants.runner import parse_sizes
+from pants.solver import PantsSolver
+from pants.trace import SearchTrace
+
+SIZES = [5, 6, 10, 13, 15, 19]
+
+# The metrics that are worse when larger, compared against a baseline
+COUNTED = ('moves', 'evaluated', 'expanded')
+TIMED = ('seconds',)
+
+
+def heuristic_names():
+    """
+    The names of every heuristic class, in the order they are defined.
+    """
+    return [name for name, value in vars(heuristics).items()
+            if type(value) is type and value.__module__ == heuristics.__name__ and hasattr(value, 'score')]
+
+
+def _case(connection, name, size, max_iterations, time_limit, trace):
+    """
+    Worker process:  solve one size with one heuristic and send back the measurements.
+
+    Every case runs in a fresh process, so that its peak resident set size is its own.
+    With `trace`, the search is recorded to a temporary file, and writing it
+    out is timed with the search.
+    """
+    initial = list(range(1, size + 1))
+    goal = list(reversed(initial))
+
+    started = time.perf_counter()
+    solver = PantsSolver(initial, goal, getattr(heuristics, name)(goal), max_iterations)
+    setup = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = SearchTrace(solver, os.path.join(directory, 'search.trace')) if trace else None
+        started = time.perf_counter()
+        solver.solve(time_limit=time_limit)
+        if recorder is not None:
+            recorder.close()
+        seconds = time.perf_counter() - started
+
+    connection.send({
+        'heuristic': name,
+        'size': size,
+        'solved': solver.solved,
+        'moves': solver.solution.depth if solver.solved else None,
+        'evaluated': solver.evaluated,
+        'expanded': solver.expanded,
+        'setup_seconds': round(setup, 6),
+        'seconds': round(seconds, 6),
+        'nodes_per_second': round(solver.evaluated / seconds) if seconds else None,
+        # kilobytes on Linux, bytes on macOS
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == 'darwin' else 1),
+    })
+    connection.close()
+
+
+def run_case(name, size, max_iterations=100000, time_limit=60, trace=False):
+    """
+    Run one benchmark case in a new process.
+
+    The case is stopped after `max_iterations`, or `time_limit` seconds of
+    searching.  A case that doesn't report back within twice the time limit
+    (plus a minute for building tables) is terminated.  With `trace`, the
+    search is recorded with a pants.trace.SearchTrace, to measure its cost.
+
+    Returns:
+        The measurements, as a dict.
+    """
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_case, args=(sender, name, size, max_iterations, time_limit, trace), daemon=True)
+    process.start()
+    sender.close()
+
+    try:
+        if receiver.poll(None if time_limit is None else 2 * time_limit + 60):
+            return receiver.recv()
+        return {'heuristic': name, 'size': size, 'solved': False, 'error': 'killed'}
+    except EOFError:
+        return {'heuristic': name, 'size': size, 'solved': False, 'error': 'crashed'}
+    finally:
+        process.terminate()
+        process.join()
+        receiver.close()
+
+
+def benchmark(names=None, sizes=SIZES, max_iterations=100000, time_limit=60, trace=False):
+    """
+    Run every heuristic over a grid of sizes.
+
+    Sizes are run smallest first, and a heuristic that fails to solve a size
+    within its budget is not run on the larger ones.
+
+    Yields:
+        The measurements of each case (see `run_case`).
+    """
+    for name in names or heuristic_names():
+        for size in sorted(sizes):
+            result = run_case(name, size, max_iterations, time_limit, trace)
+            yield result
+            if not result['solved']:
+                break
+
+
+def environment(max_iterations, time_limit, trace=False):
+    """
+    A description of how the benchmark was run, saved with its results.
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'max_iterations': max_iterations,
+        'time_limit': time_limit,
+        'trace': trace,
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def compare(results, baseline, tolerance=0.1, time_tolerance=0.5):
+    """
+    Compare benchmark results with a baseline.
+
+    A case regresses if it is no longer solved, or if its moves, nodes
+    evaluated or nodes expanded grow by more than `tolerance`, or its time
+    by more than `time_tolerance` (as fractions of the baseline).  Cases
+    missing from either side are ignored.
+
+    Returns:
+        The regressions, as a list of dicts of the heuristic, size, metric
+        and the baseline and current values.
+    """
+    before = {(result['heuristic'], result['size']): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        old = before.get((result['heuristic'], result['size']))
+        if old is None or not old['solved']:
+            continue
+
+        case = {'heuristic': result['heuristic'], 'size': result['size']}
+        if not result['solved']:
+            regressions.append(dict(case, metric='solved', baseline=True, current=False))
+            continue
+
+        for metric in COUNTED + TIMED:
+            limit = 1 + (time_tolerance if metric in TIMED else tolerance)
+            if old.get(metric) is not None and result.get(metric, 0) > old[metric] * limit:
+                regressions.append(dict(case, metric=metric, baseline=old[metric], current=result[metric]))
+
+    return regressions
+
+
+def results_table(results, name):
+    """
+    Format the solved cases of one heuristic as the RESULTS block used in the
+    docstrings of `pants/heuristics.py`.
+    """
+    solved = sorted((result for result in results if result['heuristic'] == name and result['solved']),
+                    key=lambda result: result['size'])
+    if not solved:
+        return 'RESULTS:\n------------\nMax Size: None\n'
+
+    columns = [[str(result['size']), str(result['moves']), str(result['evaluated'])] for result in solved]
+    widths = [max(len(cell) for cell in column) + 2 for column in columns]
+    rows = ['Size :', 'Moves:', 'Nodes Evaluated :']
+
+    lines = ['RESULTS:', '------------', 'Max Size: {}'.format(solved[-1]['size'])]
+    for index, row in enumerate(rows):
+        cells = ''.join(column[index].ljust(width) for column, width in zip(columns, widths))
+        lines.append((row.ljust(20) + cells).rstrip())
+    return '\n'.join(lines) + '\n'
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Benchmark the heuristics of the Pants Problem.')
+    parser.add_argument('command', choices=['run', 'compare', 'table'],
+                        help='Run the benchmark, compare saved results with a baseline, or print RESULTS tables')
+    parser.add_argument('results', nargs='?', help='The saved results, for compare and table')
+    parser.add_argument('--heuristic', action='append',
+                        help='A heuristic class to benchmark (may be repeated, defaults to all)')
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help='The sizes to run, such as 5,6,10-13 (defaults to {})'.format(','.join(map(str, SIZES))))
+    parser.add_argument('--max-iterations', type=int, default=100000,
+                        help='The node budget of each case (defaults to 100000)')
+    parser.add_argument('--time-limit', type=float, default=60,
+                        help='The number of seconds each case may search for (defaults to 60)')
+    parser.add_argument('--trace', action='store_true',
+                        help='Record each search with --trace, to measure what tracing costs against a baseline')
+    parser.add_argument('--output', help='The JSON file to save the results of run to')
+    parser.add_argument('--baseline', help='A JSON file of saved results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='The growth in moves or nodes that counts as a regression (defaults to 0.1)')
+    parser.add_argument('--time-tolerance', type=float, default=0.5,
+                        help='The growth in time that counts as a regression (defaults to 0.5)')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = []
+        for result in benchmark(args.heuristic, parse_sizes(args.sizes), args.max_iterations, args.time_limit,
+                                args.trace):
+            print(json.dumps(result), file=sys.stderr)
+            results.append(result)
+
+        report = {'environment': environment(args.max_iterations, args.time_limit, args.trace), 'results': results}
+        if args.output:
+            with open(args.output, 'w') as output:
+                json.dump(report, output, indent=1)
+        else:
+            json.dump(report, sys.stdout, indent=1)
+            print()
+    else:
+        if not args.results:
+            parser.error('{} needs a results file'.format(args.command))
+        with open(args.results) as saved:
+            results = json.load(saved)['results']
+
+    if args.command == 'table':
+        for name in args.heuristic or sorted({result['heuristic'] for result in results}, key=heuristic_names().index):
+            print('{}:\n{}'.format(name, results_table(results, name)))
+
+    if args.command == 'compare' and not args.baseline:
+        parser.error('compare needs --baseline')
+
+    if args.baseline:
+        with open(args.baseline) as saved:
+            regressions = compare(results, json.load(saved)['results'], args.tolerance, args.time_tolerance)
+        for regression in regressions:
+            print('REGRESSION:  {heuristic} size {size} {metric}:  {baseline} -> {current}'.format(**regression),
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,167 @@
+from pants.state import PantsState, INVERSE
+from pants.path import PantsPath
+from pants.symmetry import mirror, parity, MIRRORED
+
+
+class BidirectionalSolver:
+    """
+    A bidirectional breadth-first solver for the Pants Problem.
+
+    Every move has an inverse (`swap_left` undoes `swap_right`, and moving the
+    pointer left undoes moving it right), so the problem can be searched from
+    both ends at once:  forwards from the initial state, and backwards from the
+    goal - seeded with every pointer position, since the goal's pointer is free.
+    (Only the positions of the right parity can be reached from the initial
+    state, see pants.symmetry.parity, so only those are seeded.)
+
+    The side with the smaller frontier is expanded a whole layer at a time.
+    Each new state is looked up in the other side's hashed set of reached
+    states, and the two half-paths meeting there are spliced into a single
+    PantsPath.  The solution is as short as a breadth-first search would find,
+    at roughly the square root of the number of nodes.
+
+    With `symmetry`, both sides treat a state and its mirror image as the
+    same (see pants.symmetry.Mirror).  When the half-paths meet in mirrored
+    states, the backward half is mirrored before it is spliced on.
+    """
+
+    def __init__(self, initial, goal, max_iterations=100000, symmetry=False):
+        """
+        Initialization method for BidirectionalSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            max_iterations (int): The maximum number of nodes to expand when solving the problem
+            symmetry (bool):      Treat mirror image states as duplicates
+        """
+        self.goal = goal
+        self.symmetry = mirror(goal) if symmetry else None
+        self.max_iterations = max_iterations
+        self.evaluated = 0
+        self.expanded = 0
+        self.solution = None
+
+        start = PantsPath([PantsState(0, initial)])
+        self.forward = {self.key(start): start}
+        self.forward_frontier = [start]
+
+        self.backward = {}
+        reachable = parity(initial, goal)
+        for pointer in range(len(goal)):
+            if reachable is not None and pointer % 2 != reachable:
+                continue
+            path = PantsPath([PantsState(pointer, goal)])
+            self.backward.setdefault(self.key(path), path)
+        self.backward_frontier = list(self.backward.values())
+
+        self.evaluated = len(self.forward) + len(self.backward)
+
+        # The initial state may already be the goal
+        if start.last_state.state == goal:
+            self.solution = start
+
+    def key(self, path):
+        """
+        The key of a PantsPath's last state - shared by mirror images with `symmetry`.
+        """
+        if self.symmetry is None:
+            return path.last_state.key
+        return self.symmetry.key(path.last_state)
+
+    @property
+    def solved(self):
+        """
+        Is there a solution for the current problem?
+
+        Returns:
+            True if a solution has been found, False otherwise
+        """
+        return self.solution is not None
+
+    def iterate(self):
+        """
+        Expand the smaller of the two frontiers by one whole layer.
+
+        Of all the meetings found in the layer, the one giving the shortest
+        spliced path becomes the solution.
+        """
+        if len(self.forward_frontier) <= len(self.backward_frontier):
+            reached, other = self.forward, self.backward
+            frontier = self.forward_frontier
+            forwards = True
+        else:
+            reached, other = self.backward, self.forward
+            frontier = self.backward_frontier
+            forwards = False
+
+        layer = []
+        best = None
+        for path in frontier:
+            self.expanded += 1
+            for child in path.successors:
+                key = self.key(child)
+                if key in reached:
+                    continue
+                reached[key] = child
+                layer.append(child)
+                self.evaluated += 1
+
+                meeting = other.get(key)
+                if meeting is not None and (best is None or child.depth + meeting.depth < best[0]):
+                    best = (child.depth + meeting.depth, child, meeting)
+
+        if forwards:
+            self.forward_frontier = layer
+        else:
+            self.backward_frontier = layer
+
+        if best is not None:
+            _, child, meeting = best
+            if forwards:
+                self.solution = self.splice(child, meeting)
+            else:
+                self.solution = self.splice(meeting, child)
+
+    @staticmethod
+    def splice(forward, backward):
+        """
+        Join a forward half-path and a backward half-path ending in the same
+        state, or in mirror images of each other.
+
+        Args:
+            forward (PantsPath):   A path from the initial state to the meeting state
+            backward (PantsPath):  A path from a goal state to the meeting state (or its mirror image)
+
+        Returns:
+            A PantsPath from the initial state to the goal state.
+        """
+        path = forward
+        node = backward
+        if node.last_state == forward.last_state:
+            while node.parent is not None:
+                path = PantsPath([node.parent.last_state], path, INVERSE[node.move])
+                node = node.parent
+        else:
+            # The mirror image of the backward half leads from the meeting state
+            # to the mirror image of its goal state, which is a goal state too
+            while node.parent is not None:
+                move = MIRRORED[INVERSE[node.move]]
+                path = PantsPath([path.last_state.apply(move)], path, move)
+                node = node.parent
+
+        return path
+
+    def solve(self):
+        """
+        Attempt to solve the pants problem.
+
+        This simply calls `iterate()` until one of three conditions occur:
+        1) A solution is found
+        2) The number of nodes expanded exceeds `max_iterations`
+        3) Either frontier is exhausted (there is no solution)
+        """
+        while not self.solved and self.expanded < self.max_iterations:
+            if not self.forward_frontier or not self.backward_frontier:
+                return
+            self.iterate()
@@ -0,0 +1,243 @@
+import sys
+from heapq import nsmallest
+from itertools import islice
+
+from pants.frontier import FIFO
+from pants.heuristics import companion
+from pants.path import PantsPath
+from pants.solver import PantsSolver
+from pants.state import PantsState
+
+
+def node_bytes(size):
+    """
+    An estimate of the memory held by one search node of a problem size:  the
+    PantsPath, its PantsState and state list, its key, and its entries in the
+    working set and the closed set.
+    """
+    state = PantsState(0, list(range(size)))
+    path = PantsPath([state])
+    return (sys.getsizeof(path) + sys.getsizeof(state) + sys.getsizeof(state.state)
+            + sys.getsizeof(state.key) + 2 * sys.getsizeof((0, 0, path)))
+
+
+class BeamSolver:
+    """
+    Beam search:  a breadth-first search that only keeps the `width` best
+    scored PantsPaths of each layer.
+
+    Memory is bounded by the width times the depth of the search (the parent
+    links of the paths in the beam), rather than growing with every path ever
+    scored.  The price is completeness - the beam may drop every path to the
+    goal, and then the search fails.
+
+    Duplicates are only detected against the last two layers, which catches a
+    move immediately followed by its inverse without keeping every state seen.
+    """
+
+    def __init__(self, initial, goal, heuristic, width=100, max_iterations=100000):
+        """
+        Initialization method for BeamSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths,
+                                  and optionally a 'score_child' method for scoring incrementally
+            width (int):          The number of PantsPaths kept from each layer
+            max_iterations (int): The maximum number of PantsPaths to expand
+        """
+        self.initial = initial
+        self.goal = goal
+        self.heuristic = heuristic
+        self.score_child = companion(heuristic, 'score_child')
+        self.width = width
+        self.max_iterations = max_iterations
+
+        self.evaluated = 0
+        self.expanded = 0
+        self.solution = None
+
+    @property
+    def solved(self):
+        """
+        Is there a solution for the current problem?
+
+        Returns:
+            True if a solution has been found, False otherwise
+        """
+        return self.solution is not None
+
+    def score(self, path):
+        """
+        Score a PantsPath with the heuristic, incrementally if possible (see PantsSolver.score).
+        """
+        self.evaluated += 1
+        parent = path.parent
+        if self.score_child is not None and parent is not None:
+            return self.score_child(parent.score, parent, path.move)
+        return self.heuristic.score(path)
+
+    def solve(self):
+        """
+        Search layer by layer until the goal is generated, the beam is empty,
+        or `max_iterations` PantsPaths have been expanded.
+        """
+        start = PantsPath([PantsState(0, self.initial)])
+        start.score = self.score(start)
+        if start.last_state.state == self.goal:
+            self.solution = start
+            return
+
+        layer = [start]
+        previous, current = set(), {start.last_state.key}
+
+        while layer and self.expanded < self.max_iterations:
+            children = []
+            following = set()
+            for path in layer:
+                self.expanded += 1
+                for child in path.successors:
+                    key = child.last_state.key
+                    if key in current or key in previous or key in following:
+                        continue
+                    following.add(key)
+
+                    child.score = self.score(child)
+                    if child.last_state.state == self.goal:
+                        self.solution = child
+                        return
+                    children.append(child)
+
+            # nsmallest is stable, so equally scored paths keep their order of generation
+            layer = nsmallest(self.width, children, key=lambda child: child.score)
+            previous, current = current, {path.last_state.key for path in layer}
+
+
+class BoundedSolver(PantsSolver):
+    """
+    A memory-bounded best-first solver, in the style of SMA*.
+
+    The working set and the closed set are both limited to `max_nodes`
+    entries (or as many as fit in `max_bytes`, estimated by `node_bytes`).
+
+    When the working set is full, its worst quarter is evicted.  Each evicted
+    path's priority is backed up to its parent:  a parent with evicted
+    children is put back in the working set with the best of their
+    priorities (and taken out of the closed set), so that it is expanded
+    again - regenerating the forgotten children - if that part of the search
+    becomes the most promising again.  If that would put back more than half
+    as many paths as were evicted, the priorities are backed up further, to
+    common ancestors, so the working set always shrinks.  When the closed
+    set is full its oldest quarter is forgotten, which may cost some repeated
+    work but never loses a solution.
+
+    The paths in the working set share their parent links, so the memory
+    used is mostly the entries of the working set and the closed set.
+    """
+
+    def __init__(self, initial, goal, heuristic, max_nodes=None, max_bytes=None, max_iterations=100000,
+                 frontier='auto', tie_break=FIFO, symmetry=False):
+        """
+        Initialization method for BoundedSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths
+            max_nodes (int):      The most entries kept in each of the working set and the closed set
+            max_bytes (int):      The memory budget, used to set `max_nodes` when that is not given
+            max_iterations (int): The maximum number of iterations to evaluate when solving the problem
+            frontier (str):       The working set's priority queue - 'heap', 'bucket', or 'auto'
+            tie_break (str):      The order of paths with equal scores - 'fifo', 'lifo' or 'deepest'
+            symmetry (bool):      Treat mirror image states as duplicates (see pants.symmetry.Mirror)
+        """
+        if max_nodes is None:
+            if max_bytes is None:
+                raise ValueError('BoundedSolver needs max_nodes or max_bytes')
+            max_nodes = max_bytes // node_bytes(len(initial))
+        if max_nodes < 4:
+            raise ValueError('BoundedSolver needs room for at least 4 nodes')
+
+        self.max_nodes = max_nodes
+        self.evictions = 0
+
+        super().__init__(initial, goal, heuristic, max_iterations, frontier, tie_break, symmetry)
+        # A dict rather than a set, to forget the oldest keys first
+        self.closed = {}
+
+    @classmethod
+    def resume(cls, filename, heuristic, **kwargs):
+        solver = super().resume(filename, heuristic, **kwargs)
+        solver.closed = dict.fromkeys(solver.closed)
+        return solver
+
+    def add_path(self, path):
+        super().add_path(path)
+        if len(self.working_set) > self.max_nodes:
+            self.evict()
+
+    def close(self, path):
+        key = self.key(path)
+        if key in self.closed:
+            return False
+
+        self.closed[key] = None
+        if len(self.closed) > self.max_nodes:
+            for key in list(islice(self.closed, self.max_nodes // 4)):
+                del self.closed[key]
+        return True
+
+    def evict(self):
+        """
+        Evict the worst quarter of the working set, backing up their priorities to their ancestors.
+        """
+        entries = self.working_set.ordered()
+        keep = len(entries) - len(entries) // 4
+        kept, evicted = entries[:keep], entries[keep:]
+        self.evictions += len(evicted)
+
+        # Back the priorities up to the parents - and on up the tree, until
+        # there are at most half as many ancestors to put back as paths
+        # evicted, so that the working set always shrinks
+        backed_up = {}
+        for priority, path in evicted:
+            if path.parent is not None:
+                self.back_up(backed_up, path.parent, priority)
+
+        reopened = []
+        while len(backed_up) > len(evicted) // 2:
+            higher = {}
+            for priority, node in backed_up.values():
+                if node.parent is None:
+                    self.back_up(higher, node, priority)
+                else:
+                    reopened.append(node)
+                    self.back_up(higher, node.parent, priority)
+            backed_up = higher
+
+        # The ancestors are expanded again, so they (and the nodes between
+        # them and the evicted paths) must be forgotten by the closed set
+        for node in reopened:
+            self.closed.pop(self.key(node), None)
+
+        # Empty the working set in place, and refill it with the paths kept
+        for _ in range(len(entries)):
+            self.working_set.pop()
+        for priority, path in kept:
+            self.working_set.push(priority, path)
+
+        kept_ids = {id(path) for _, path in kept}
+        for priority, node in backed_up.values():
+            if id(node) not in kept_ids:
+                self.closed.pop(self.key(node), None)
+                self.working_set.push(priority, node)
+
+    @staticmethod
+    def back_up(backed_up, node, priority):
+        """
+        Record a priority backed up to a node, keeping the best for each node.
+        """
+        best = backed_up.get(id(node))
+        if best is None or priority < best[0]:
+            backed_up[id(node)] = (priority, node)
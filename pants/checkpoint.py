@@ -0,0 +1,213 @@
+import json
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from numbers import Integral
+
+from pants.path import PantsPath
+from pants.state import PantsState
+
+
+MAGIC = b'PCK1'
+HEADER = struct.Struct('<4sI')
+COUNT = struct.Struct('<I')
+ROOT = 0xffffffff
+# Integer scores outside this range (e.g. the n**n of the Trimmed heuristics) are written as JSON
+INT64 = (-1 << 63, (1 << 63) - 1)
+
+
+def save(solver, filename):
+    """
+    Write a checkpoint of a PantsSolver's search, atomically replacing any
+    existing one.
+
+    The file holds a JSON description of the problem and the solver's
+    counters, followed by a zlib compressed body of:
+
+    1) The search tree:  every PantsPath in the working set and its
+       ancestors, numbered so that parents come first, as an array of parent
+       numbers and a string of moves - each PantsPath is 5 bytes
+    2) The working set:  the number of each PantsPath in it and its score,
+       in the order that recreates the working set exactly.  Scores are
+       64-bit integers or doubles, or a JSON list when some integer score
+       does not fit in 64 bits
+    3) The closed set of state keys (and the costs of A*), grouped by key length
+    """
+    entries = solver.working_set.ordered()
+    nodes, numbers = [], {}
+    for _, path in entries:
+        chain = []
+        node = path
+        while node is not None and id(node) not in numbers:
+            chain.append(node)
+            node = node.parent
+        for node in reversed(chain):
+            numbers[id(node)] = len(nodes)
+            nodes.append(node)
+
+    if any(node.parent is None and node.last_state != PantsState(0, solver.initial) for node in nodes):
+        raise ValueError('The working set has paths that do not start at the initial state')
+
+    # Integer scores may also be NumPy integers (e.g. from score_batch)
+    scores = [path.score for _, path in entries]
+    if not all(isinstance(score, Integral) for score in scores):
+        score_format = 'd'
+    elif all(INT64[0] <= score <= INT64[1] for score in scores):
+        score_format = 'q'
+    else:
+        score_format = 'json'
+    costs = getattr(solver, 'costs', None)
+
+    metadata = {
+        'solver': type(solver).__name__,
+        'initial': solver.initial,
+        'goal': solver.goal,
+        'solution': solver.solution.moves if solver.solved else None,
+        'tie_break': solver.working_set.tie_break,
+        'symmetry': solver.symmetry is not None,
+        'frontier': 'bucket' if hasattr(solver.working_set, 'buckets') else 'heap',
+        'evaluated': solver.evaluated,
+        'expanded': solver.expanded,
+        'iterations': solver.iterations,
+        'scores': score_format,
+        'costs': costs is not None,
+    }
+
+    parents = array('I', [ROOT if node.parent is None else numbers[id(node.parent)] for node in nodes])
+    moves = bytes([0 if node.move is None else node.move for node in nodes])
+    body = [
+        COUNT.pack(len(nodes)), parents.tobytes(), moves,
+        COUNT.pack(len(entries)), array('I', [numbers[id(path)] for _, path in entries]).tobytes(),
+    ]
+    if score_format == 'json':
+        encoded_scores = json.dumps([int(score) for score in scores]).encode()
+        body.extend([COUNT.pack(len(encoded_scores)), encoded_scores])
+    else:
+        body.append(array(score_format, scores).tobytes())
+    body.extend(_pack_keys(solver.closed))
+    if costs is not None:
+        keys = list(costs)
+        body.extend(_pack_keys(keys))
+        body.append(array('I', [costs[key] for key in _grouped(keys)]).tobytes())
+
+    encoded = json.dumps(metadata).encode()
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            output.write(HEADER.pack(MAGIC, len(encoded)))
+            output.write(encoded)
+            output.write(zlib.compress(b''.join(body)))
+        os.replace(temporary, filename)
+    except BaseException:
+        # Interrupted (or failed) - keep the previous checkpoint, and no half written one
+        os.unlink(temporary)
+        raise
+
+
+def load(filename):
+    """
+    Read a checkpoint written by `save`.
+
+    Returns:
+        A (metadata, entries, closed, costs) tuple:  the JSON description,
+        the working set as a list of (score, PantsPath) pairs in order, the
+        closed set of keys, and a dict of the costs (or None).
+    """
+    with open(filename, 'rb') as source:
+        magic, length = HEADER.unpack(source.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('{} is not a checkpoint'.format(filename))
+        metadata = json.loads(source.read(length))
+        body = memoryview(zlib.decompress(source.read()))
+
+    offset = 0
+
+    def read_array(typecode, count):
+        nonlocal offset
+        values = array(typecode)
+        end = offset + count * values.itemsize
+        values.frombytes(body[offset:end])
+        offset = end
+        return values
+
+    def read_count():
+        nonlocal offset
+        offset += COUNT.size
+        return COUNT.unpack_from(body, offset - COUNT.size)[0]
+
+    count = read_count()
+    parents = read_array('I', count)
+    moves = bytes(body[offset:offset + count])
+    offset += count
+
+    nodes = []
+    for parent, move in zip(parents, moves):
+        if parent == ROOT:
+            nodes.append(PantsPath([PantsState(0, metadata['initial'])]))
+        else:
+            parent = nodes[parent]
+            nodes.append(PantsPath([parent.last_state.apply(move)], parent, move))
+
+    count = read_count()
+    numbers = read_array('I', count)
+    score_format = metadata['scores']
+    if score_format == 'json':
+        length = read_count()
+        scores = json.loads(bytes(body[offset:offset + length]))
+        offset += length
+    else:
+        scores = read_array(score_format, count)
+    entries = [(score, nodes[number]) for number, score in zip(numbers, scores)]
+
+    closed, offset = _unpack_keys(body, offset)
+    costs = None
+    if metadata['costs']:
+        keys, offset = _unpack_keys(body, offset)
+        costs = dict(zip(keys, read_array('I', len(keys))))
+
+    return metadata, entries, set(closed), costs
+
+
+def _grouped(keys):
+    """
+    Keys ordered by their length, the order `_pack_keys` writes them in.
+    """
+    return sorted(keys, key=len)
+
+
+def _pack_keys(keys):
+    """
+    Pack a collection of keys as the number of distinct lengths, then the
+    length, count and concatenated keys of each.
+    """
+    groups = {}
+    for key in _grouped(keys):
+        groups.setdefault(len(key), []).append(key)
+
+    packed = [COUNT.pack(len(groups))]
+    for length, group in groups.items():
+        packed.append(COUNT.pack(length) + COUNT.pack(len(group)))
+        packed.append(b''.join(group))
+    return packed
+
+
+def _unpack_keys(body, offset):
+    """
+    Unpack keys written by `_pack_keys`.
+
+    Returns:
+        A (keys, offset) tuple of the keys as a list, and the offset after them.
+    """
+    keys = []
+    groups, = COUNT.unpack_from(body, offset)
+    offset += COUNT.size
+    for _ in range(groups):
+        length, count = struct.unpack_from('<II', body, offset)
+        offset += 8
+        blob = bytes(body[offset:offset + length * count])
+        keys.extend(blob[index:index + length] for index in range(0, len(blob), length))
+        offset += length * count
+    return keys, offset
@@ -0,0 +1,177 @@
+from itertools import repeat
+
+from pants.path import PantsPath
+from pants.state import PantsState, MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+
+
+class ConstructiveSolver:
+    """
+    Solves Pants Problems of any size directly, without searching.
+
+    The goal is built from both ends inwards.  Each step picks the value that
+    belongs at the leftmost or the rightmost unfinished position, jumps the
+    pointer onto it, and carries it there with a run of swaps - the pointer
+    moves with the value it swaps, so a run of `swap_left` (or `swap_right`)
+    moves one value any distance.  Each carry only passes values that are
+    out of order with it, so the swaps are close to the number of inversions
+    (the fewest swaps possible), and the pointer jumps between carries add
+    about half as much again at worst.
+
+    Pointer jumps keep the pointer's parity, so it can only land on a value
+    at a position of the same parity.  Otherwise one extra swap of two other
+    unfinished values on the way changes the parity first (or, when there
+    are none, the value is pushed along from behind).
+
+    The moves are generated as runs rather than stored:  `runs()` yields
+    (move, count) pairs and `moves()` single moves, so memory stays O(n) and
+    the work is O(n) per value placed, for O(n^2) moves in all.
+    """
+
+    def __init__(self, initial, goal):
+        """
+        Initialization method for ConstructiveSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+        """
+        if sorted(initial) != sorted(goal):
+            raise ValueError('The goal is not a permutation of the initial state')
+
+        self.initial = initial
+        self.goal = goal
+        self.length = None
+        self.evaluated = 0
+
+    @property
+    def solved(self):
+        """
+        Is there a solution for the current problem?
+
+        Returns:
+            True if a solution has been found, False otherwise
+        """
+        return self.length is not None
+
+    def solve(self):
+        """
+        Count the moves of the solution, without keeping them (see `runs()` and `path()`).
+        """
+        self.length = sum(count for _, count in self.runs())
+
+    def moves(self):
+        """
+        Generate the moves of the solution one at a time (see pants.state.MOVES).
+        """
+        for move, count in self.runs():
+            yield from repeat(move, count)
+
+    def path(self):
+        """
+        The solution as a PantsPath - only sensible for small problems.
+        """
+        path = PantsPath.from_moves(PantsState(0, self.initial), self.moves())
+        self.length = path.depth
+        return path
+
+    def runs(self):
+        """
+        Generate the solution as runs of the same move.
+
+        Yields:
+            (move, count) pairs, which together take the initial state to the goal.
+        """
+        state = list(self.initial)
+        goal = self.goal
+        pointer = 0
+        lo, hi = 0, len(state) - 1
+
+        while lo < hi:
+            if state[lo] == goal[lo]:
+                lo += 1
+                continue
+            if state[hi] == goal[hi]:
+                hi -= 1
+                continue
+
+            # Rank the two by their extra moves plus half the carry:  a long
+            # carry leaves the pointer far from the rest of the values
+            left = self._plan(pointer, state.index(goal[lo], lo, hi + 1), lo, lo, hi)
+            right = self._plan(pointer, state.index(goal[hi], lo, hi + 1), hi, lo, hi)
+            _, steps = min(left, right, key=lambda plan: plan[0])
+
+            for step, argument in steps:
+                if step == 'jump':
+                    if argument != pointer:
+                        move = MOVE_POINTER_RIGHT if argument > pointer else MOVE_POINTER_LEFT
+                        yield move, abs(argument - pointer) // 2
+                        pointer = argument
+                elif step == 'swap':
+                    other = pointer + argument
+                    state[pointer], state[other] = state[other], state[pointer]
+                    yield (SWAP_RIGHT if argument > 0 else SWAP_LEFT), 1
+                    pointer = other
+                elif step == 'push':
+                    # Swap the value from behind, and jump back behind it
+                    direction, count = argument
+                    for pushed in range(count):
+                        if pushed:
+                            yield (MOVE_POINTER_LEFT if direction > 0 else MOVE_POINTER_RIGHT), 1
+                            pointer -= 2 * direction
+                        other = pointer + direction
+                        state[pointer], state[other] = state[other], state[pointer]
+                        yield (SWAP_RIGHT if direction > 0 else SWAP_LEFT), 1
+                        pointer = other
+                else:
+                    # Carry the value under the pointer to `argument`
+                    value = state[pointer]
+                    if argument < pointer:
+                        state[argument + 1:pointer + 1] = state[argument:pointer]
+                        yield SWAP_LEFT, pointer - argument
+                    else:
+                        state[pointer:argument] = state[pointer + 1:argument + 1]
+                        yield SWAP_RIGHT, argument - pointer
+                    state[argument] = value
+                    pointer = argument
+
+    @staticmethod
+    def _plan(pointer, position, target, lo, hi):
+        """
+        The cheapest way to take the value at `position` to `target`, with
+        the values outside lo..hi already in place.
+
+        Returns:
+            A (cost, steps) tuple.  The cost is the number of moves besides
+            the carry itself, plus half the carry, and the steps are
+            ('jump', position), ('swap', direction), ('carry', position) and
+            ('push', (direction, count)) pairs.
+        """
+        distance = abs(target - position)
+        if not (pointer - position) % 2:
+            return abs(pointer - position) // 2 + distance / 2, [('jump', position), ('carry', target)]
+
+        plans = []
+
+        # Swap two other values, between the pointer and the value if
+        # possible, so the pointer lands on a position of the value's parity
+        toward = 1 if position > pointer else -1
+        nearest = min(max(pointer, lo), hi)
+        if (nearest - pointer) % 2:
+            nearest += 1 if nearest < hi else -1
+        for swap_at in (nearest, position - 1, position + 1):
+            for direction in (toward, -toward):
+                other = swap_at + direction
+                if lo <= swap_at <= hi and lo <= other <= hi and position not in (swap_at, other):
+                    cost = abs(swap_at - pointer) // 2 + 1 + abs(other - position) // 2
+                    plans.append((cost, [('jump', swap_at), ('swap', direction), ('jump', position),
+                                         ('carry', target)]))
+
+        # Or push the value along from behind:  swap it from the neighbouring
+        # cell, which leaves the pointer behind it again, one jump back
+        behind = -1 if target < position else 1
+        start = position + behind
+        if lo <= start <= hi:
+            plans.append((abs(start - pointer) // 2 + distance - 1, [('jump', start), ('push', (-behind, distance))]))
+
+        cost, steps = min(plans, key=lambda plan: plan[0])
+        return cost + distance / 2, steps
@@ -0,0 +1,190 @@
+from collections import deque
+from heapq import heappush, heappop
+
+
+# How PantsPaths with equal priorities are ordered.  FIFO is the default;
+# none of them is the order of the original working set, a heap of (score,
+# path) pairs that took the shallowest path first (see PantsPath.__lt__).
+FIFO = 'fifo'
+LIFO = 'lifo'
+DEEPEST = 'deepest'
+TIE_BREAKS = (FIFO, LIFO, DEEPEST)
+
+
+class HeapFrontier:
+    """
+    A priority queue of PantsPaths backed by a binary heap.
+
+    This works for any priorities that can be compared, including the floats
+    of heuristics such as EuclideanDistance.  Every entry carries an insertion
+    counter, so PantsPaths themselves are never compared.
+    """
+
+    def __init__(self, tie_break=FIFO):
+        """
+        Initialization method for HeapFrontier
+
+        Args:
+            tie_break (str):  The order of paths with equal priorities - first in first
+                              out, last in first out, or the deepest path first
+        """
+        if tie_break not in TIE_BREAKS:
+            raise ValueError('Unknown tie break "{}"'.format(tie_break))
+
+        self.tie_break = tie_break
+        self.heap = []
+        self.count = 0
+
+    def push(self, priority, path):
+        """
+        Add a PantsPath with a priority (lower == better).
+        """
+        self.count += 1
+        if self.tie_break == FIFO:
+            heappush(self.heap, (priority, self.count, path))
+        elif self.tie_break == LIFO:
+            heappush(self.heap, (priority, -self.count, path))
+        else:
+            heappush(self.heap, (priority, -path.depth, self.count, path))
+
+    def pop(self):
+        """
+        Remove the PantsPath with the lowest priority.
+
+        Returns:
+            A (priority, PantsPath) tuple.
+        """
+        entry = heappop(self.heap)
+        return entry[0], entry[-1]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        """
+        Iterate over the (priority, PantsPath) pairs, in no particular order.
+        """
+        for entry in self.heap:
+            yield entry[0], entry[-1]
+
+    def ordered(self):
+        """
+        The (priority, PantsPath) pairs, in the order that recreates this
+        frontier when pushed into an empty one with the same tie break.
+        """
+        # The counters are unique, so sorting never compares PantsPaths
+        entries = [(entry[0], entry[-1]) for entry in sorted(self.heap, key=lambda entry: entry[:-1])]
+        return entries[::-1] if self.tie_break == LIFO else entries
+
+
+class BucketFrontier:
+    """
+    A priority queue of PantsPaths with a bucket per distinct priority.
+
+    Most heuristics score with small integers, so many paths share a priority.
+    Pushing appends to the bucket for the priority, and popping takes from the
+    lowest bucket - both O(1), with a small heap of the distinct priorities in
+    use to find the lowest bucket when one empties.
+    """
+
+    def __init__(self, tie_break=FIFO):
+        """
+        Initialization method for BucketFrontier
+
+        Args:
+            tie_break (str):  The order of paths with equal priorities - first in first
+                              out, last in first out, or the deepest path first
+        """
+        if tie_break not in TIE_BREAKS:
+            raise ValueError('Unknown tie break "{}"'.format(tie_break))
+
+        self.tie_break = tie_break
+        self.buckets = {}
+        self.priorities = []
+        self.size = 0
+        self.count = 0
+
+    def push(self, priority, path):
+        """
+        Add a PantsPath with a priority (lower == better).
+        """
+        bucket = self.buckets.get(priority)
+        if bucket is None:
+            bucket = self.buckets[priority] = [] if self.tie_break != FIFO else deque()
+            heappush(self.priorities, priority)
+
+        if self.tie_break == DEEPEST:
+            self.count += 1
+            heappush(bucket, (-path.depth, self.count, path))
+        else:
+            bucket.append(path)
+        self.size += 1
+
+    def pop(self):
+        """
+        Remove the PantsPath with the lowest priority.
+
+        Returns:
+            A (priority, PantsPath) tuple.
+        """
+        priority = self.priorities[0]
+        bucket = self.buckets[priority]
+
+        if self.tie_break == FIFO:
+            path = bucket.popleft()
+        elif self.tie_break == LIFO:
+            path = bucket.pop()
+        else:
+            path = heappop(bucket)[-1]
+
+        if not bucket:
+            del self.buckets[priority]
+            heappop(self.priorities)
+        self.size -= 1
+
+        return priority, path
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterate over the (priority, PantsPath) pairs, in no particular order.
+        """
+        for priority, bucket in self.buckets.items():
+            for entry in bucket:
+                yield priority, entry[-1] if self.tie_break == DEEPEST else entry
+
+    def ordered(self):
+        """
+        The (priority, PantsPath) pairs, in the order that recreates this
+        frontier when pushed into an empty one with the same tie break.
+        """
+        entries = []
+        for priority in sorted(self.buckets):
+            bucket = self.buckets[priority]
+            if self.tie_break == DEEPEST:
+                entries.extend((priority, entry[-1]) for entry in sorted(bucket, key=lambda entry: entry[:-1]))
+            else:
+                entries.extend((priority, path) for path in bucket)
+        return entries
+
+
+def make_frontier(kind, tie_break, heuristic):
+    """
+    Create the frontier for a solver.
+
+    Args:
+        kind (str):          'heap', 'bucket', or 'auto' to use buckets only for
+                             heuristics declaring `integer_scores`
+        tie_break (str):     The order of paths with equal priorities
+        heuristic (object):  The solver's heuristic
+    """
+    if kind == 'auto':
+        kind = 'bucket' if getattr(heuristic, 'integer_scores', False) else 'heap'
+
+    if kind == 'bucket':
+        return BucketFrontier(tie_break)
+    elif kind == 'heap':
+        return HeapFrontier(tie_break)
+    raise ValueError('Unknown frontier "{}"'.format(kind))
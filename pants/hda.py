@@ -0,0 +1,370 @@
+import multiprocessing
+import queue
+from zlib import crc32
+
+from pants.frontier import make_frontier, FIFO
+from pants.heuristics import companion
+from pants.path import PantsPath
+from pants.state import PantsState, unpack
+
+
+def owner(key, workers):
+    """
+    The worker that owns a state, by a hash of its key that is the same in
+    every process.
+    """
+    return crc32(key) % workers
+
+
+class _Worker:
+    """
+    One process of an HDASolver.
+
+    The worker keeps its own working set and closed list, for the states it
+    owns.  Children owned by other workers are collected in an outbox per
+    worker and sent in batches of (key, moves, score, parent key, move)
+    entries - scored by the sender, who still has the parent to hand.
+    """
+
+    def __init__(self, index, solver):
+        self.index = index
+        self.workers = solver.workers
+        self.goal = solver.goal
+        self.weight = solver.weight
+        self.batch_size = solver.batch_size
+        self.budget = solver.budget
+        self.inboxes = solver.inboxes
+        self.results = solver.results
+        self.stop = solver.stop
+        self.idle = solver.idle
+        self.sent = solver.sent
+        self.received = solver.received
+        self.incumbent = solver.incumbent
+
+        self.heuristic = solver.heuristic_class(solver.goal)
+        self.score_child = companion(self.heuristic, 'score_child')
+        kind = 'heap' if isinstance(self.weight, float) else 'auto'
+        self.working_set = make_frontier(kind, FIFO, self.heuristic)
+
+        # key -> (moves, parent key, move), for the cheapest path seen
+        self.best = {}
+        self.outboxes = [[] for _ in range(self.workers)]
+        self.stats = {'expanded': 0, 'evaluated': 0, 'sent': 0, 'received': 0}
+        self.done = False
+
+    def run(self):
+        """
+        Search until told to stop, then answer questions about the paths found.
+        """
+        while not self.stop.is_set() and not self.done:
+            self.receive(block=not self.working_set or self.stats['expanded'] >= self.budget)
+
+            if self.stats['expanded'] >= self.budget:
+                continue
+            if self.working_set:
+                self.expand()
+                if self.stats['expanded'] == self.budget:
+                    self.flush()
+                    self.results.put(('exhausted', self.index))
+
+        self.serve()
+
+    def receive(self, block):
+        """
+        Handle the messages waiting in the inbox.  When there is nothing else
+        to do, the outboxes are flushed and the worker waits for a message.
+        """
+        inbox = self.inboxes[self.index]
+        if block:
+            self.flush()
+            self.idle[self.index] = 1
+            try:
+                message = inbox.get(timeout=0.05)
+            except queue.Empty:
+                return
+            self.idle[self.index] = 0
+            self.handle(message)
+
+        while True:
+            try:
+                message = inbox.get_nowait()
+            except queue.Empty:
+                return
+            self.handle(message)
+
+    def handle(self, message):
+        """
+        Handle one message:  a batch of children, a question about the parent
+        of an owned state, or the signal to exit.
+        """
+        if message[0] == 'batch':
+            if not self.stop.is_set():
+                for entry in message[1]:
+                    self.add(*entry)
+            self.stats['received'] += 1
+            with self.received.get_lock():
+                self.received.value += 1
+        elif message[0] == 'parent':
+            key = message[1]
+            _, parent, move = self.best[key]
+            self.results.put(('parent', key, parent, move))
+        elif message[0] == 'exit':
+            self.results.put(('stats', self.index, self.stats))
+            self.done = True
+
+    def add(self, key, moves, score, parent, move):
+        """
+        Add an owned state to the working set, unless it was already reached in as few moves.
+        """
+        known = self.best.get(key)
+        if known is not None and known[0] <= moves:
+            return
+        self.best[key] = (moves, parent, move)
+
+        priority = score if self.weight is None else moves + self.weight * score
+        if priority >= self.incumbent.value:
+            return
+        self.working_set.push(priority, (key, moves, score))
+        self.stats['evaluated'] += 1
+
+    def expand(self):
+        """
+        Expand the best state of the working set.
+        """
+        priority, (key, moves, score) = self.working_set.pop()
+        if self.best[key][0] < moves or priority >= self.incumbent.value:
+            return
+        self.stats['expanded'] += 1
+
+        pointer, state = unpack(key)
+        if state == self.goal:
+            with self.incumbent.get_lock():
+                if moves < self.incumbent.value:
+                    self.incumbent.value = moves
+                    self.results.put(('solution', key, moves))
+            return
+
+        node = PantsPath([PantsState(pointer, state)])
+        node.depth = moves
+        node.score = score
+        for child in node.successors:
+            if self.score_child is not None:
+                child_score = self.score_child(score, node, child.move)
+            else:
+                child_score = self.heuristic.score(child)
+
+            child_key = child.last_state.key
+            entry = (child_key, moves + 1, child_score, key, child.move)
+            destination = owner(child_key, self.workers)
+            if destination == self.index:
+                self.add(*entry)
+            else:
+                self.outboxes[destination].append(entry)
+                if len(self.outboxes[destination]) >= self.batch_size:
+                    self.send(destination)
+
+    def send(self, destination):
+        with self.sent.get_lock():
+            self.sent.value += 1
+        self.stats['sent'] += 1
+        self.inboxes[destination].put(('batch', self.outboxes[destination]))
+        self.outboxes[destination] = []
+
+    def flush(self):
+        for destination, outbox in enumerate(self.outboxes):
+            if outbox:
+                self.send(destination)
+
+    def serve(self):
+        """
+        After the search:  answer questions about the paths found until told to exit.
+        """
+        inbox = self.inboxes[self.index]
+        while not self.done:
+            self.handle(inbox.get())
+
+        # batches still queued for workers that have left must not hold up the exit
+        for other in self.inboxes:
+            other.cancel_join_thread()
+
+
+def _work(index, solver):
+    _Worker(index, solver).run()
+
+
+class HDASolver:
+    """
+    A hash-distributed best-first solver (HDA*) using several processes.
+
+    Every state is owned by one worker, chosen by hashing the state.  Each
+    worker runs its own best-first search over the states it owns, and sends
+    the children it generates for other workers to them in batches.  With a
+    weight the search is weighted A* (re-opening states reached more cheaply),
+    without one it is greedy best-first on the heuristic score.
+
+    Without a weight the search stops as soon as any worker reaches the goal.
+    With one, the number of moves of the best solution so far is shared, every
+    worker drops the states whose priority is no better, and the search only
+    stops when every worker is idle with no batches in flight - so with an
+    admissible heuristic and a weight of 1 (or 0) the solution is the
+    shortest.  The search also stops when every worker has used its share of
+    `max_iterations` expansions.  The solution is then rebuilt by asking the
+    owner of each state for its parent.
+    """
+
+    def __init__(self, initial, goal, heuristic_class, workers=None, weight=None, max_iterations=100000,
+                 batch_size=64):
+        """
+        Initialization method for HDASolver
+
+        Args:
+            initial (list[int]):     The initial state of the problem
+            goal (list[int]):        The desired goal state of the problem
+            heuristic_class (type):  The heuristic class, instantiated with the goal in every worker
+            workers (int):           The number of worker processes (defaults to the CPU count)
+            weight (float):          The weight of the heuristic score for weighted A*, or None for best-first
+            max_iterations (int):    The maximum number of expansions, shared between the workers
+            batch_size (int):        The number of children sent to another worker at once
+        """
+        self.initial = initial
+        self.goal = goal
+        self.heuristic_class = heuristic_class
+        self.workers = workers or multiprocessing.cpu_count()
+        self.weight = int(weight) if weight is not None and weight == int(weight) else weight
+        self.max_iterations = max_iterations
+        self.batch_size = batch_size
+        self.budget = -(-max_iterations // self.workers)
+
+        self.worker_stats = []
+        self.evaluated = 0
+        self.expanded = 0
+        self.solution = None
+
+    @property
+    def solved(self):
+        """
+        Is there a solution for the current problem?
+
+        Returns:
+            True if a solution has been found, False otherwise
+        """
+        return self.solution is not None
+
+    @property
+    def load_balance(self):
+        """
+        The most nodes expanded by one worker, relative to the mean (1.0 is perfectly balanced).
+        """
+        expanded = [stats['expanded'] for stats in self.worker_stats]
+        if not expanded or not sum(expanded):
+            return None
+        return max(expanded) * len(expanded) / sum(expanded)
+
+    def solve(self):
+        """
+        Start the workers, wait for the search to finish and collect the
+        solution and the workers' statistics.
+        """
+        self.inboxes = [multiprocessing.Queue() for _ in range(self.workers)]
+        self.results = multiprocessing.Queue()
+        self.stop = multiprocessing.Event()
+        self.idle = multiprocessing.Array('b', self.workers)
+        self.sent = multiprocessing.Value('q', 0)
+        self.received = multiprocessing.Value('q', 0)
+        self.incumbent = multiprocessing.Value('q', 2 ** 62)
+
+        processes = [multiprocessing.Process(target=_work, args=(index, self), daemon=True)
+                     for index in range(self.workers)]
+        for process in processes:
+            process.start()
+
+        try:
+            heuristic = self.heuristic_class(self.goal)
+            start = PantsPath([PantsState(0, self.initial)])
+            key = start.last_state.key
+            with self.sent.get_lock():
+                self.sent.value += 1
+            self.inboxes[owner(key, self.workers)].put(('batch', [(key, 0, heuristic.score(start), None, None)]))
+
+            goal_key = self.wait()
+            self.stop.set()
+
+            if goal_key is not None:
+                self.solution = PantsPath.from_moves(PantsState(0, self.initial), self.trace(goal_key))
+
+            for inbox in self.inboxes:
+                inbox.put(('exit',))
+            self.worker_stats = [None] * self.workers
+            while None in self.worker_stats:
+                message = self.results.get()
+                if message[0] == 'stats':
+                    self.worker_stats[message[1]] = message[2]
+        finally:
+            self.stop.set()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        self.evaluated = sum(stats['evaluated'] for stats in self.worker_stats)
+        self.expanded = sum(stats['expanded'] for stats in self.worker_stats)
+
+    def wait(self):
+        """
+        Wait for the search to finish.
+
+        The search is over when every worker is idle and as many batches have
+        been received as sent, twice in a row.
+
+        Returns:
+            The key of the best goal state reached, or None.
+        """
+        best, fewest = None, None
+        exhausted = set()
+        previous = None
+        while True:
+            try:
+                message = self.results.get(timeout=0.05)
+            except queue.Empty:
+                message = None
+
+            if message is not None:
+                if message[0] == 'solution':
+                    if fewest is None or message[2] < fewest:
+                        best, fewest = message[1], message[2]
+                    if self.weight is None:
+                        return best
+                elif message[0] == 'exhausted':
+                    exhausted.add(message[1])
+                    if len(exhausted) == self.workers:
+                        return best
+                continue
+
+            snapshot = (all(self.idle), self.sent.value, self.received.value)
+            if snapshot[0] and snapshot[1] == snapshot[2] and snapshot == previous:
+                return best
+            previous = snapshot
+
+    def trace(self, key):
+        """
+        Follow the parents of a state back to the initial state.
+
+        Returns:
+            The list of moves from the initial state to the state.
+        """
+        moves = []
+        while True:
+            self.inboxes[owner(key, self.workers)].put(('parent', key))
+            while True:
+                message = self.results.get()
+                if message[0] == 'parent' and message[1] == key:
+                    break
+
+            _, _, parent, move = message
+            if parent is None:
+                break
+            moves.append(move)
+            key = parent
+
+        moves.reverse()
+        return moves
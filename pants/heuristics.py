@@ -1,29 +1,116 @@
 from math import sqrt
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pants.oracle import DistanceOracle
+from pants.pdb import PatternDatabase
+from pants.state import MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT
+
+
+# Heuristics may optionally implement
+#
+#     score_child(parent_score, parent_path, move)
+#
+# which returns the score of the path made by applying `move` to the last state
+# of `parent_path`, given that path's own score.  A move only ever changes the
+# pointer or two neighbouring cells, so this can usually be done in O(1).  The
+# solver uses it whenever it is available, and falls back to `score` otherwise.
+# A subclass that overrides `score` alone would inherit a `score_child` (and a
+# `score_batch`) that still score its base class's way, so the solvers only
+# use them when they come from the class of `score` or a subclass of it (see
+# `companion`).  Pauls, for example, overrides both.
+#
+# Heuristics that only ever score with integers set `integer_scores = True`,
+# which lets the solver use a bucket queue for its working set.  Heuristics
+# that never overestimate the number of moves left set `admissible = True`,
+# which the anytime solver needs to prune safely.
+#
+# With NumPy installed, heuristics may also implement
+#
+#     score_batch(states, pointers)
+#
+# which scores many states at once:  `states` is a 2-D array with one state
+# per row, and `pointers` the matching array of pointer positions.  It returns
+# an array of scores, equal to what `score` would give for each row.
+#
+# The RESULTS blocks are generated by the benchmark (see pants.benchmark):
+#
+#     python -m pants.benchmark run --output results.json
+#     python -m pants.benchmark table results.json
+#
+# which solves the reversal of sizes 5 to 19 with best-first search, up to a
+# budget of 100000 iterations, stopping at the first size that is not solved
+# (EuclideanDistance was also run with `--sizes=100`).
+
+
+def swapped_cells(pants_state, move):
+    """
+    The two cells exchanged by a swap move, as (pointer, other), or None for pointer moves.
+    """
+    if move == SWAP_LEFT:
+        return pants_state.pointer, pants_state.pointer - 1
+    elif move > SWAP_LEFT:
+        return pants_state.pointer, pants_state.pointer + 1
+    return None
+
+
+def companion(heuristic, name):
+    """
+    A heuristic's optional companion of `score` - `score_child` or `score_batch`.
+
+    Returns:
+        The bound method, or None if the heuristic has none or if it is
+        inherited from a class above the one that defines `score`.
+    """
+    method = getattr(heuristic, name, None)
+    if method is None:
+        return None
+
+    def owner(attribute):
+        return next((cls for cls in type(heuristic).__mro__ if attribute in vars(cls)), None)
+
+    score_owner, method_owner = owner('score'), owner(name)
+    if score_owner is None or method_owner is None or issubclass(method_owner, score_owner):
+        return method
+    return None
 
 class BreadthFirst:
     """
     RESULTS:
     ------------
-    Max Size : 5
-    Moves: 13
-    Nodes Evaluated : 14927
+    Max Size: 6
+    Size :              5    6
+    Moves:              13   19
+    Nodes Evaluated :   416  3236
     """
 
+    integer_scores = True
+
     def __init__(self, goal):
         pass
 
     def score(self, pants_path):
-        return len(pants_path.states)
+        return pants_path.depth + 1
+
+    def score_child(self, parent_score, parent_path, move):
+        return parent_score + 1
 
 
 class Nada:
+    integer_scores = True
+
     def __init__(self, goal):
         pass
 
     def score(self, parg):
         return 1
 
+    def score_child(self, parent_score, parent_path, move):
+        return parent_score
+
 
 class TrimmedBF:
     """
@@ -31,22 +118,26 @@ class TrimmedBF:
 
     RESULTS:
     ------------
-    Max Size: 5
-    Size :              5
-    Moves:              13
-    Nodes Evaluated :   1941
+    Max Size: 6
+    Size :              5    6
+    Moves:              13   19
+    Nodes Evaluated :   353  2830
     """
 
+    integer_scores = True
+
     def __init__(self, goal):
         self.goal = goal
         self.max = len(goal)**len(goal)
 
     def score(self, pants_path):
         state = pants_path.last_state.state
-        for each in pants_path.states[:-1]:
-            if state == each.state:
+        node = pants_path.parent
+        while node is not None:
+            if state == node.last_state.state:
                 return self.max
-        return len(pants_path.states)
+            node = node.parent
+        return pants_path.depth + 1
 
 
 class Distance:
@@ -54,11 +145,13 @@ class Distance:
     RESULTS:
     ------------
     Max Size: 19
-    Size :              5   6   10   13     15      19
-    Moves:              13  24  71   122    163     264
-    Nodes Evaluated :   44  94  759  7259   11147   170231
+    Size :              5   6    10   13    15    19
+    Moves:              14  24   71   122   163   264
+    Nodes Evaluated :   47  100  844  5067  8372  50553
     """
 
+    integer_scores = True
+
     def __init__(self, goal):
         self.goal = goal
 
@@ -68,6 +161,20 @@ class Distance:
 
         return goal_distance
 
+    def score_batch(self, states, pointers):
+        return numpy.abs(numpy.asarray(self.goal) - states).sum(axis=1)
+
+    def score_child(self, parent_score, parent_path, move):
+        cells = swapped_cells(parent_path.last_state, move)
+        if cells is None:
+            return parent_score
+
+        state, goal = parent_path.last_state.state, self.goal
+        i, j = cells
+        return (parent_score
+                - abs(goal[i] - state[i]) - abs(goal[j] - state[j])
+                + abs(goal[i] - state[j]) + abs(goal[j] - state[i]))
+
 
 class TrimmedDistance:
     """
@@ -75,20 +182,24 @@ class TrimmedDistance:
 
     RESULTS:
     ------------
-    Max Size: 5
-    Size :              5
-    Moves:              13
-    Nodes Evaluated :   2345
+    Max Size: 6
+    Size :              5    6
+    Moves:              13   19
+    Nodes Evaluated :   353  2830
     """
+    integer_scores = True
+
     def __init__(self, goal):
         self.goal = goal
         self.max = len(goal)**len(goal)
 
     def score(self, pants_path):
         state = pants_path.last_state.state
-        for each in pants_path.states[:-1]:
-            if state == each.state:
+        node = pants_path.parent
+        while node is not None:
+            if state == node.last_state.state:
                 return self.max
+            node = node.parent
         return sum([abs(g - s) for g,s in zip(self.goal, state)])
 
 
@@ -99,11 +210,13 @@ class Inversions:
     RESULTS:
     ------------
     Max Size: 10
-    Size :              5    6    10
-    Moves:              17   25   83
-    Nodes Evaluated :   135  144  96864
+    Size :              5   6    10
+    Moves:              15  26   74
+    Nodes Evaluated :   78  193  15509
     """
 
+    integer_scores = True
+
     def __init__(self, goal):
         diff = goal[1] - goal[0]
         if goal[1] > goal[0]:
@@ -112,7 +225,30 @@ class Inversions:
             self.direction = 'decrease'
 
     def score(self, pants_path):
-        state = pants_path.last_state.state
+        return self.count(pants_path.last_state.state)
+
+    def score_batch(self, states, pointers):
+        if self.direction == 'increase':
+            return (states[:, 1:] < states[:, :-1]).sum(axis=1)
+        return (states[:, 1:] > states[:, :-1]).sum(axis=1)
+
+    def score_child(self, parent_score, parent_path, move):
+        cells = swapped_cells(parent_path.last_state, move)
+        if cells is None:
+            return parent_score
+
+        # Only the pairs touching the two swapped cells can change
+        state = parent_path.last_state.state
+        low = min(cells)
+        start = max(low - 1, 0)
+        window = state[start:low + 3]
+        before = self.count(window)
+        index = low - start
+        window[index], window[index + 1] = window[index + 1], window[index]
+
+        return parent_score - before + self.count(window)
+
+    def count(self, state):
         count = 0
         for index in range(len(state) - 1):
             if self.direction == 'increase' and state[index + 1] < state[index]:
@@ -129,10 +265,10 @@ class EuclideanDistance:
 
     RESULTS:
     ------------
-    Max Size: Between 100 and 200
-    Size :              5   6   10   13     15      19      100
-    Moves:              14  21  58   95     125     198     5107
-    Nodes Evaluated :   31  55  170  290    383     617     15587
+    Max Size: 100
+    Size :              5   6   10   13   15   19   100
+    Moves:              14  21  58   95   125  198  5107
+    Nodes Evaluated :   31  55  170  290  383  617  15587
     """ 
 
     def __init__(self, goal):
@@ -144,6 +280,23 @@ class EuclideanDistance:
 
         return distance
 
+    def score_batch(self, states, pointers):
+        return numpy.sqrt(((numpy.asarray(self.goal) - states)**2).sum(axis=1))
+
+    def score_child(self, parent_score, parent_path, move):
+        cells = swapped_cells(parent_path.last_state, move)
+        if cells is None:
+            return parent_score
+
+        # The squared distance is an integer, so it is recovered exactly
+        state, goal = parent_path.last_state.state, self.goal
+        i, j = cells
+        squared = (round(parent_score * parent_score)
+                   - (goal[i] - state[i])**2 - (goal[j] - state[j])**2
+                   + (goal[i] - state[j])**2 + (goal[j] - state[i])**2)
+
+        return sqrt(squared)
+
 
 class TrimmedED:
     """
@@ -151,10 +304,10 @@ class TrimmedED:
 
     RESULTS:
     ------------
-    Max Size: ??
-    Size :              5
-    Moves:              13
-    Nodes Evaluated :   1877
+    Max Size: 6
+    Size :              5    6
+    Moves:              13   19
+    Nodes Evaluated :   353  2830
     """
 
     def __init__(self, goal):
@@ -163,19 +316,26 @@ class TrimmedED:
 
     def score(self, pants_path):
         state = pants_path.last_state.state
-        for each in pants_path.states[:-1]:
-            if state == each.state:
+        node = pants_path.parent
+        while node is not None:
+            if state == node.last_state.state:
                 return self.max
+            node = node.parent
         return sqrt(sum([(g - s)**2 for g,s in zip(self.goal, state)]))
 
 
 class Mishmash:
+    integer_scores = True
+
     def __init__(self, goal):
         self.goal = goal
         size = len(goal) - 1
         half = int(size / 2)
         self.high = half+1
         self.low = half-1
+        # Weight of each cell in the score:  -1 in the first part, +1 in the second
+        cells = range(len(goal))
+        self.weights = [(i in cells[self.high:]) - (i in cells[:self.low]) for i in cells]
 
     def score(self, pants_path):
         state = pants_path.last_state.state
@@ -184,6 +344,15 @@ class Mishmash:
 
         return second_score - first_score
 
+    def score_child(self, parent_score, parent_path, move):
+        cells = swapped_cells(parent_path.last_state, move)
+        if cells is None:
+            return parent_score
+
+        state = parent_path.last_state.state
+        i, j = cells
+        return parent_score + (self.weights[j] - self.weights[i]) * (state[i] - state[j])
+
 
 class Pauls(Distance) :
     def score(self, pants_leg) :
@@ -197,3 +366,146 @@ class Pauls(Distance) :
 
     def pointer_modifier(self, position, goal_scores) :
         return goal_scores[position]
+
+    def score_batch(self, states, pointers) :
+        goal_scores = numpy.abs(numpy.asarray(self.goal) - states)
+        modifier = goal_scores[numpy.arange(len(states)), pointers]
+        return goal_scores.sum(axis=1) - (modifier * 1)
+
+    def score_child(self, parent_score, parent_path, move) :
+        parent = parent_path.last_state
+        state, pointer = parent.state, parent.pointer
+        distance = parent_score + abs(self.goal[pointer] - state[pointer])
+        distance = Distance.score_child(self, distance, parent_path, move)
+
+        # The cell under the new pointer, and the value it will hold
+        if move == MOVE_POINTER_LEFT:
+            position = pointer - 2
+            value = state[position]
+        elif move == MOVE_POINTER_RIGHT:
+            position = pointer + 2
+            value = state[position]
+        else:
+            position = swapped_cells(parent, move)[1]
+            value = state[pointer]
+
+        return distance - abs(self.goal[position] - value)
+
+
+class HalfDisplacement:
+    """
+    An admissible version of Distance, measured in positions rather than values.
+
+    Each value's displacement is how far it sits from its position in the goal.
+    A swap moves two values by one position each, so at least half of the total
+    displacement in moves remains - this never overestimates, and is suitable
+    for A*.  For the reversal of 1..n this is exactly half of Distance.
+
+    (The total displacement of a permutation is always even.)
+    """
+
+    integer_scores = True
+    admissible = True
+
+    def __init__(self, goal):
+        self.position = {value: index for index, value in enumerate(goal)}
+
+    def score(self, pants_path):
+        state = pants_path.last_state.state
+        displacement = sum([abs(self.position[s] - i) for i,s in enumerate(state)])
+
+        return displacement // 2
+
+    def score_child(self, parent_score, parent_path, move):
+        cells = swapped_cells(parent_path.last_state, move)
+        if cells is None:
+            return parent_score
+
+        state, position = parent_path.last_state.state, self.position
+        i, j = cells
+        a, b = position[state[i]], position[state[j]]
+        return parent_score + (abs(a - j) + abs(b - i) - abs(a - i) - abs(b - j)) // 2
+
+
+class KendallTau:
+    """
+    This heuristic counts the pairs of values that are in the opposite order
+    to the goal (the Kendall tau distance).
+
+    Every swap changes the order of exactly one pair and pointer moves change
+    none, so this is an admissible (and consistent) lower bound on the number
+    of moves left, and always at least as large as HalfDisplacement.
+    """
+
+    integer_scores = True
+    admissible = True
+
+    def __init__(self, goal):
+        self.position = {value: index for index, value in enumerate(goal)}
+
+    def score(self, pants_path):
+        ranks = [self.position[s] for s in pants_path.last_state.state]
+        count = 0
+        for index, rank in enumerate(ranks):
+            for other in ranks[index + 1:]:
+                if other < rank:
+                    count += 1
+
+        return count
+
+    def score_child(self, parent_score, parent_path, move):
+        cells = swapped_cells(parent_path.last_state, move)
+        if cells is None:
+            return parent_score
+
+        state = parent_path.last_state.state
+        low, high = sorted(cells)
+        if self.position[state[low]] < self.position[state[high]]:
+            return parent_score + 1
+        return parent_score - 1
+
+
+class PatternDatabases:
+    """
+    This heuristic looks up exact distances in pattern databases.
+
+    The goal values are split into consecutive groups of `pattern_size`, and
+    each group gets a table of the exact number of moves needed to bring just
+    those values home (see pants.pdb).  Each table is admissible, so the
+    largest of them is too.  Tables are built once, saved under $PANTS_PDB_DIR
+    (or the temp directory) and memory-mapped from then on.
+    """
+
+    pattern_size = 4
+
+    integer_scores = True
+    admissible = True
+
+    def __init__(self, goal):
+        self.databases = [
+            PatternDatabase.open(goal, goal[start:start + self.pattern_size])
+            for start in range(0, len(goal), self.pattern_size)
+        ]
+
+    def score(self, pants_path):
+        state = pants_path.last_state.state
+        pointer = pants_path.last_state.pointer
+
+        return max([database.distance(state, pointer) for database in self.databases])
+
+
+class PerfectHeuristic:
+    """
+    This heuristic is the exact number of moves left, looked up in a complete
+    distance table (see pants.oracle), so it is only available up to size 10.
+    Best-first search with it walks straight down an optimal path.
+    """
+
+    integer_scores = True
+    admissible = True
+
+    def __init__(self, goal):
+        self.oracle = DistanceOracle.open(goal)
+
+    def score(self, pants_path):
+        return self.oracle.distance(pants_path.last_state.state, pants_path.last_state.pointer)
@@ -0,0 +1,211 @@
+from pants.state import PantsState, INVERSE, MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+from pants.heuristics import companion
+from pants.path import PantsPath
+
+
+class _Cursor:
+    """
+    A stand-in for a PantsPath whose last state is modified in place.
+
+    Heuristics only look at `last_state` (and `depth`) when scoring, so a
+    single cursor can be handed to `score_child` for every node of the search.
+    """
+
+    __slots__ = ('last_state', 'parent', 'depth')
+
+    def __init__(self, last_state):
+        self.last_state = last_state
+        self.parent = None
+        self.depth = 0
+
+
+class IDAStarSolver:
+    """
+    An iterative-deepening A* solver for the Pants Problem.
+
+    Repeated depth-first searches are made, each bounded by `g + weight * h`
+    and each raising the bound to the smallest value that exceeded it in the
+    previous search.  A single state list and pointer are modified in place -
+    moves are applied and undone rather than creating new PantsStates - so the
+    memory used is proportional to the depth of the search only.
+
+    A move is never followed by its inverse, which would only return to the
+    previous state.  The heuristic should implement `score_child`; otherwise
+    the PantsPaths of the current branch are built alongside the search, so
+    heuristics that look at the depth or the earlier states (e.g. TrimmedBF)
+    score every node as it really is.
+    """
+
+    def __init__(self, initial, goal, heuristic, weight=1.0, max_iterations=1000000):
+        """
+        Initialization method for IDAStarSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths
+            weight (float):       The weight given to the heuristic score relative to the path length
+            max_iterations (int): The maximum number of moves to apply when solving the problem
+        """
+        self.initial = initial
+        self.goal = goal
+        self.heuristic = heuristic
+        self.weight = weight
+        self.max_iterations = max_iterations
+        self.evaluated = 0
+        self.expanded = 0
+        self.bound = None
+        self.solution = None
+
+    @property
+    def solved(self):
+        """
+        Is there a solution for the current problem?
+
+        Returns:
+            True if a solution has been found, False otherwise
+        """
+        return self.solution is not None
+
+    def solve(self):
+        """
+        Attempt to solve the pants problem.
+
+        Bounded depth-first searches are repeated until one of three conditions occur:
+        1) A solution is found
+        2) The number of moves applied exceeds `max_iterations`
+        3) No state exceeds the bound (there is no solution)
+        """
+        cursor = _Cursor(PantsState(0, list(self.initial)))
+        score = self.heuristic.score(cursor)
+        self.evaluated += 1
+        self.bound = self.weight * score
+
+        while not self.solved and self.bound is not None and self.expanded < self.max_iterations:
+            self.bound = self.search(cursor, score)
+
+    def search(self, cursor, score):
+        """
+        A single depth-first search, bounded by `self.bound`.
+
+        Args:
+            cursor (_Cursor):  The cursor holding the initial state (restored on return)
+            score (number):    The heuristic score of the initial state
+
+        Returns:
+            The smallest `g + weight * h` that exceeded the bound, or None if
+            there is none or a solution was found.
+        """
+        state_obj = cursor.last_state
+        state = state_obj.state
+        goal = self.goal
+        last = len(state) - 1
+        weight, bound = self.weight, self.bound
+        score_child = companion(self.heuristic, 'score_child')
+
+        if state == goal:
+            self.solution = PantsPath([PantsState(state_obj.pointer, list(state))])
+            return None
+
+        # The moves applied so far, and for each depth the heuristic score and
+        # the next move to try
+        moves = []
+        scores = [score]
+        next_moves = [0]
+        minimum = None
+        pointer = state_obj.pointer
+
+        # Without score_child, the PantsPath of each depth of the branch
+        paths = None if score_child is not None else [PantsPath([PantsState(pointer, list(state))])]
+
+        while next_moves:
+            move = next_moves[-1]
+
+            if move > SWAP_RIGHT:
+                # Every move has been tried - backtrack
+                next_moves.pop()
+                scores.pop()
+                if moves:
+                    pointer = self._apply(state, pointer, INVERSE[moves.pop()])
+                    state_obj.pointer = pointer
+                    cursor.depth = len(moves)
+                    if paths is not None:
+                        paths.pop()
+                continue
+
+            next_moves[-1] = move + 1
+
+            if moves and move == INVERSE[moves[-1]]:
+                continue
+            if move == MOVE_POINTER_LEFT and pointer < 2:
+                continue
+            if move == MOVE_POINTER_RIGHT and pointer > last - 2:
+                continue
+            if move == SWAP_LEFT and pointer == 0:
+                continue
+            if move == SWAP_RIGHT and pointer == last:
+                continue
+
+            if paths is None:
+                child_score = score_child(scores[-1], cursor, move)
+            else:
+                child = PantsPath([paths[-1].last_state.apply(move)], paths[-1], move)
+                child_score = self.heuristic.score(child)
+            self.evaluated += 1
+
+            total = len(moves) + 1 + weight * child_score
+            if total > bound:
+                if minimum is None or total < minimum:
+                    minimum = total
+                continue
+
+            pointer = self._apply(state, pointer, move)
+            state_obj.pointer = pointer
+            cursor.depth = len(moves) + 1
+            moves.append(move)
+            scores.append(child_score)
+            next_moves.append(0)
+            if paths is not None:
+                paths.append(child)
+            self.expanded += 1
+
+            if state == goal:
+                self.solution = self._build_solution(moves)
+                minimum = None
+                break
+
+            if self.expanded >= self.max_iterations:
+                break
+
+        # Restore the cursor to the initial state
+        while moves:
+            pointer = self._apply(state, pointer, INVERSE[moves.pop()])
+        state_obj.pointer = pointer
+        cursor.depth = 0
+
+        return minimum
+
+    @staticmethod
+    def _apply(state, pointer, move):
+        """
+        Apply a (valid) move to the state list in place.
+
+        Returns:
+            The new pointer position.
+        """
+        if move == MOVE_POINTER_LEFT:
+            return pointer - 2
+        elif move == MOVE_POINTER_RIGHT:
+            return pointer + 2
+        elif move == SWAP_LEFT:
+            state[pointer - 1], state[pointer] = state[pointer], state[pointer - 1]
+            return pointer - 1
+        else:
+            state[pointer + 1], state[pointer] = state[pointer], state[pointer + 1]
+            return pointer + 1
+
+    def _build_solution(self, moves):
+        """
+        Replay the moves from the initial state as a PantsPath.
+        """
+        return PantsPath.from_moves(PantsState(0, list(self.initial)), moves)
@@ -0,0 +1,271 @@
+from collections import Counter
+
+from pants.path import PantsPath
+from pants.solver import PantsSolver
+from pants.astar import AStarSolver
+from pants.state import PantsState, MOVES, INVERSE, MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+from pants.frontier import FIFO
+
+
+class Macro:
+    """
+    A fixed series of moves, compiled into a single transition.
+
+    Every move only touches the cells around the pointer, so the effect of a
+    series of moves relative to the pointer is always the same:  the pointer
+    moves by `offset`, and the cells from `low` to `high` (relative to the
+    starting pointer) are permuted.  The series can be made exactly when the
+    pointer stays on the state the whole way, i.e. when those cells exist.
+    """
+
+    __slots__ = ('moves', 'offset', 'low', 'high', 'order', 'permutes')
+
+    def __init__(self, moves):
+        """
+        Initialization method for Macro
+
+        Args:
+            moves (list[int]):  The moves the macro is made of (see pants.state.MOVES)
+        """
+        self.moves = tuple(moves)
+
+        # Follow the pointer, then replay the swaps on the cells it visited
+        pointer = low = high = 0
+        for move in self.moves:
+            pointer += (-2, 2, -1, 1)[move]
+            low, high = min(low, pointer), max(high, pointer)
+
+        cells = list(range(low, high + 1))
+        pointer = 0
+        for move in self.moves:
+            if move >= SWAP_LEFT:
+                other = pointer + (-1 if move == SWAP_LEFT else 1)
+                cells[pointer - low], cells[other - low] = cells[other - low], cells[pointer - low]
+                pointer = other
+            else:
+                pointer += -2 if move == MOVE_POINTER_LEFT else 2
+
+        self.offset = pointer
+        self.low, self.high = low, high
+        # `order[i]` is the (relative) cell whose value ends up in cell `low + i`
+        self.order = tuple(cells)
+        self.permutes = self.order != tuple(range(low, high + 1))
+
+    @property
+    def effect(self):
+        """
+        What the macro does, regardless of how:  two macros with the same effect are interchangeable.
+        """
+        return self.offset, self.low, self.high, self.order
+
+    def apply(self, pants_state):
+        """
+        Apply the whole macro to a PantsState in one step.
+
+        Returns:
+            The PantsState resulting from the moves, or None if they cannot all be made.
+        """
+        pointer, state = pants_state.pointer, pants_state.state
+        low, high = pointer + self.low, pointer + self.high
+        if low < 0 or high >= len(state):
+            return None
+
+        if self.permutes:
+            new_state = state[:]
+            new_state[low:high + 1] = [state[pointer + cell] for cell in self.order]
+        else:
+            new_state = state
+        return PantsState(pointer + self.offset, new_state)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __str__(self):
+        return '+'.join(MOVES[move] for move in self.moves)
+
+
+def primitive_macros():
+    """
+    The four moves, each as a macro of one move.
+    """
+    return [Macro([move]) for move in range(len(MOVES))]
+
+
+def carry_macros(size, max_distance=None):
+    """
+    The primitive moves, plus the compound moves of walking the pointer and
+    carrying a value.
+
+    A run of `swap_left` (or `swap_right`) carries the value under the
+    pointer any distance, and a run of pointer moves jumps the pointer.
+
+    Args:
+        size (int):          The size of the problem
+        max_distance (int):  The longest carry (defaults to the whole state)
+
+    Returns:
+        A list of Macros.
+    """
+    max_distance = size - 1 if max_distance is None else min(max_distance, size - 1)
+
+    macros = primitive_macros()
+    for distance in range(2, max_distance + 1):
+        macros.append(Macro([SWAP_LEFT] * distance))
+        macros.append(Macro([SWAP_RIGHT] * distance))
+    for distance in range(2, (max_distance + 1) // 2 + 1):
+        macros.append(Macro([MOVE_POINTER_LEFT] * distance))
+        macros.append(Macro([MOVE_POINTER_RIGHT] * distance))
+    return macros
+
+
+def mine_macros(solutions, count=20, max_length=8):
+    """
+    Learn macros from the move sequences of solved problems.
+
+    Every run of 2 to `max_length` moves in the solutions is counted, skipping
+    runs that undo one of their own moves straight away.  The runs that save
+    the most moves (their number of occurrences times their length, less one)
+    become macros, along with the four primitive moves.
+
+    Args:
+        solutions (list[list[int]]):  The moves of each solution
+        count (int):                  The number of macros to learn
+        max_length (int):             The longest macro
+
+    Returns:
+        A list of Macros.
+    """
+    runs = Counter()
+    for moves in solutions:
+        moves = tuple(moves)
+        for start in range(len(moves)):
+            for end in range(start + 2, min(start + max_length, len(moves)) + 1):
+                if moves[end - 1] == INVERSE[moves[end - 2]]:
+                    break
+                runs[moves[start:end]] += 1
+
+    macros = primitive_macros()
+    effects = {macro.effect for macro in macros}
+    ranked = sorted(runs.items(), key=lambda item: (-item[1] * (len(item[0]) - 1), len(item[0]), item[0]))
+    for moves, _ in ranked:
+        if len(macros) == count + len(MOVES):
+            break
+
+        # Several runs can do the same thing, and some do nothing at all
+        macro = Macro(moves)
+        if macro.effect not in effects and (macro.offset or macro.permutes):
+            effects.add(macro.effect)
+            macros.append(macro)
+    return macros
+
+
+class MacroPath(PantsPath):
+    """
+    A PantsPath that steps by macros rather than single moves.
+
+    Each node holds the state at the end of a whole macro, so the search only
+    sees one step per macro, while its `depth` still counts every move made.
+    The `moves` are the primitive moves, and `expand()` rebuilds the path one
+    move at a time.
+    """
+
+    __slots__ = ('macro', 'macros')
+
+    def __init__(self, state, macros, parent=None, macro=None):
+        """
+        Initialization method for MacroPath
+
+        Args:
+            state (PantsState):   The state at the end of the path
+            macros (list[Macro]): The macros to generate successors with
+            parent (MacroPath):   The path this continues from
+            macro (Macro):        The macro leading to the state
+        """
+        # A single move can still be scored incrementally (see PantsSolver.score)
+        super().__init__([state], parent, macro.moves[0] if macro is not None and len(macro) == 1 else None)
+        self.macro = macro
+        self.macros = macros
+        if macro is not None:
+            self.depth = parent.depth + len(macro)
+
+    @property
+    def moves(self):
+        moves = []
+        node = self
+        while node.parent is not None:
+            moves.extend(reversed(node.macro.moves))
+            node = node.parent
+        moves.reverse()
+        return moves
+
+    @property
+    def successors(self):
+        """
+        Generate a MacroPath for every macro that can be applied to the last PantsState.
+        """
+        for macro in self.macros:
+            next_state = macro.apply(self.last_state)
+
+            if next_state is not None:
+                yield MacroPath(next_state, self.macros, self, macro)
+
+    def expand(self):
+        """
+        The same path as a plain PantsPath, with a node for every move.
+        """
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return PantsPath.from_moves(node.last_state, self.moves)
+
+
+class MacroSolver(PantsSolver):
+    """
+    A best-first PantsSolver that searches by macros (see pants.macros.Macro).
+
+    Macros shrink the depth of the search several fold, at the cost of more
+    successors per path.  The solution is expanded back into single moves.
+    """
+
+    def __init__(self, initial, goal, heuristic, macros=None, max_iterations=100000, frontier='auto', tie_break=FIFO,
+                 symmetry=False):
+        """
+        Initialization method for MacroSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths
+            macros (list[Macro]): The macros to search with (defaults to `carry_macros`)
+            max_iterations (int): The maximum number of iterations to evaluate when solving the problem
+            frontier (str):       The working set's priority queue - 'heap', 'bucket', or 'auto'
+            tie_break (str):      The order of paths with equal scores - 'fifo', 'lifo' or 'deepest'
+            symmetry (bool):      Treat mirror image states as duplicates (see pants.symmetry.Mirror)
+        """
+        self.macros = carry_macros(len(initial)) if macros is None else macros
+        super().__init__(initial, goal, heuristic, max_iterations=max_iterations, frontier=frontier,
+                         tie_break=tie_break, symmetry=symmetry)
+
+    def add_path(self, path):
+        # Seed the working set with a MacroPath instead
+        if path.parent is None and not isinstance(path, MacroPath):
+            path = MacroPath(path.last_state, self.macros)
+        super().add_path(path)
+
+    def iterate(self):
+        super().iterate()
+        if isinstance(self.solution, MacroPath):
+            self.solution = self.solution.expand()
+
+
+class MacroAStarSolver(MacroSolver, AStarSolver):
+    """
+    A (weighted) A* MacroSolver.  Each macro costs its number of moves, so
+    with an admissible heuristic and a weight of 1 the solution is the
+    shortest that the macros can make.
+    """
+
+    def __init__(self, initial, goal, heuristic, macros=None, weight=1.0, max_iterations=100000, frontier='auto',
+                 tie_break=FIFO, symmetry=False):
+        self.macros = carry_macros(len(initial)) if macros is None else macros
+        AStarSolver.__init__(self, initial, goal, heuristic, weight, max_iterations, frontier, tie_break, symmetry)
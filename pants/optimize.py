@@ -0,0 +1,241 @@
+from pants.state import PantsState, INVERSE, MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+from pants.path import PantsPath
+
+
+def replay(state, moves):
+    """
+    The PantsStates visited by a series of moves, starting with `state`.
+    """
+    states = [state]
+    for move in moves:
+        state = state.apply(move)
+        states.append(state)
+    return states
+
+
+def cancel_inverses(moves):
+    """
+    Remove every move that is immediately undone, e.g. `swap_left` then `swap_right`.
+
+    Removing a pair can bring another pair together, so the moves are kept on
+    a stack and each one cancels the top of it if they are inverses.
+
+    Returns:
+        The remaining moves, as a new list.
+    """
+    kept = []
+    for move in moves:
+        if kept and kept[-1] == INVERSE[move]:
+            kept.pop()
+        else:
+            kept.append(move)
+    return kept
+
+
+def cut_cycles(states, moves):
+    """
+    Remove every cycle:  whenever a state (and pointer) is reached again, the
+    moves since it was first reached are dropped.
+
+    Args:
+        states (list[PantsState]):  The states visited, one more than the moves
+        moves (list[int]):          The moves made
+
+    Returns:
+        A (states, moves) tuple of new lists.
+    """
+    kept_states, kept_moves = [states[0]], []
+    seen = {states[0].key: 0}
+    for state, move in zip(states[1:], moves):
+        position = seen.get(state.key)
+        if position is None:
+            seen[state.key] = len(kept_states)
+            kept_states.append(state)
+            kept_moves.append(move)
+        else:
+            for dropped in kept_states[position + 1:]:
+                del seen[dropped.key]
+            del kept_states[position + 1:]
+            del kept_moves[position:]
+    return kept_states, kept_moves
+
+
+def shortest_moves(start, targets, max_depth):
+    """
+    The shortest series of at most `max_depth` moves from `start` to any of `targets`.
+
+    A bidirectional breadth-first search, expanding the side with the
+    smaller frontier a layer at a time (see pants.bidirectional).  The
+    states are searched as bytes keys (see `_children`), so the values are
+    relabelled by rank first - the cells of a window are few, even when
+    the values are large.
+
+    Args:
+        start (PantsState):          The first state
+        targets (list[PantsState]):  The states to reach, the same size as `start`
+        max_depth (int):             The most moves to search for
+
+    Returns:
+        A list of moves, or None if every target is more than `max_depth` moves away.
+    """
+    rank = {value: index for index, value in enumerate(sorted(set(start.state)))}
+    if len(start.state) > 255 or any(value not in rank for target in targets for value in target.state):
+        return None
+
+    def key(pants_state):
+        return bytes([pants_state.pointer] + [rank[value] for value in pants_state.state])
+
+    forward = {key(start): (None, None)}
+    backward = {key(target): (None, None) for target in targets}
+    for state in forward:
+        if state in backward:
+            return []
+    forward_frontier, backward_frontier = list(forward), list(backward)
+    depth = 0
+
+    while depth < max_depth and forward_frontier and backward_frontier:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        frontier = forward_frontier if expand_forward else backward_frontier
+        reached, other = (forward, backward) if expand_forward else (backward, forward)
+
+        next_frontier = []
+        for state in frontier:
+            for move, child in _children(state):
+                if child in reached:
+                    continue
+                reached[child] = (state, move)
+                if child in other:
+                    return _splice(forward, backward, child)
+                next_frontier.append(child)
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+        depth += 1
+    return None
+
+
+def _children(key):
+    """
+    Generate the (move, key) pairs of every valid move from a key of the
+    pointer followed by the cells, one byte each.
+    """
+    pointer = key[0]
+    size = len(key) - 1
+    if pointer > 1:
+        yield MOVE_POINTER_LEFT, bytes([pointer - 2]) + key[1:]
+    if pointer < size - 2:
+        yield MOVE_POINTER_RIGHT, bytes([pointer + 2]) + key[1:]
+
+    # The cell under the pointer is at pointer + 1
+    if pointer > 0:
+        child = bytearray(key)
+        child[0] = pointer - 1
+        child[pointer], child[pointer + 1] = key[pointer + 1], key[pointer]
+        yield SWAP_LEFT, bytes(child)
+    if pointer < size - 1:
+        child = bytearray(key)
+        child[0] = pointer + 1
+        child[pointer + 1], child[pointer + 2] = key[pointer + 2], key[pointer + 1]
+        yield SWAP_RIGHT, bytes(child)
+
+
+def _splice(forward, backward, key):
+    """
+    The moves through the state with `key`, reached from both sides.
+    """
+    moves = []
+    node = key
+    while forward[node][0] is not None:
+        node, move = forward[node]
+        moves.append(move)
+    moves.reverse()
+
+    # Each backward move was made from the later state, so it is undone going forwards
+    node = key
+    while backward[node][0] is not None:
+        node, move = backward[node]
+        moves.append(INVERSE[move])
+    return moves
+
+
+def shorten_window(states, moves, start, end, free_pointer=False):
+    """
+    A shortest replacement for the moves from `states[start]` to `states[end]`.
+
+    Every move only touches the cells around the pointer, so a path of `d`
+    moves never strays more than `2 * d` cells from where it starts.  The
+    search is made on just those cells, which makes it independent of the
+    size of the problem.
+
+    Args:
+        states (list[PantsState]):  The states visited
+        moves (list[int]):          The moves made
+        start (int):                The index of the first state of the window
+        end (int):                  The index of the last state of the window
+        free_pointer (bool):        Any pointer position will do at the end of the window
+
+    Returns:
+        A shorter list of moves, or None if there is none.
+    """
+    first, last = states[start], states[end]
+    max_depth = end - start - 1
+    size = len(first.state)
+    low, high = max(0, first.pointer - 2 * max_depth), min(size - 1, first.pointer + 2 * max_depth)
+
+    # The original moves may have changed cells out of reach of a shorter path
+    touched = [state.pointer for state in states[start:end + 1]]
+    for cell in range(max(0, min(touched) - 1), min(size - 1, max(touched) + 1) + 1):
+        if (cell < low or cell > high) and first.state[cell] != last.state[cell]:
+            return None
+
+    target = last.state[low:high + 1]
+    if free_pointer:
+        targets = [PantsState(pointer, target) for pointer in range((last.pointer - low) % 2, high - low + 1, 2)]
+    elif low <= last.pointer <= high:
+        targets = [PantsState(last.pointer - low, target)]
+    else:
+        return None
+
+    return shortest_moves(PantsState(first.pointer - low, first.state[low:high + 1]), targets, max_depth)
+
+
+def shorten(path, window=8, passes=3):
+    """
+    Shorten a solution, keeping where it starts and ends.
+
+    Each pass cuts out cycles (which also cancels moves that are immediately
+    undone), then slides a window of `window` moves along the solution and
+    replaces the moves in it by a shortest series between its two ends.  The
+    last window may end with the pointer anywhere, as the goal's pointer is
+    free.  The passes stop early when one changes nothing.
+
+    Args:
+        path (PantsPath):  A solution, e.g. PantsSolver.solution
+        window (int):      The number of moves replaced at once
+        passes (int):      The most passes to make
+
+    Returns:
+        A new PantsPath, no longer than `path`.
+    """
+    moves = cancel_inverses(path.moves)
+    states = replay(path.states[0], moves)
+
+    for _ in range(passes):
+        length = len(moves)
+        states, moves = cut_cycles(states, moves)
+
+        start = 0
+        while start < len(moves):
+            end = min(start + window, len(moves))
+            shorter = shorten_window(states, moves, start, end, free_pointer=end == len(moves))
+            if shorter is not None:
+                moves[start:end] = shorter
+                states[start:end + 1] = replay(states[start], shorter)
+            start += 1
+
+        if len(moves) == length:
+            break
+
+    return PantsPath.from_moves(states[0], moves)
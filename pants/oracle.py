@@ -0,0 +1,349 @@
+import argparse
+import os
+import random
+from itertools import count as counter
+from math import factorial
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pants.pdb import PatternDatabase, UNREACHED, unrank_positions
+from pants.path import PantsPath
+from pants.state import PantsState, MOVES
+
+
+class DistanceOracle:
+    """
+    The exact goal distance of every state of a small Pants Problem.
+
+    This is a pattern database whose pattern is the whole goal, so nothing is
+    abstracted away:  one byte per (permutation, pointer) pair, indexed by the
+    Lehmer code rank of the permutation times the size, plus the pointer.
+
+    The table is computed by a vectorized breadth-first sweep when NumPy is
+    installed, and by PatternDatabase.build otherwise.
+    """
+
+    max_size = 10
+
+    def __init__(self, database):
+        """
+        Initialization method for DistanceOracle
+
+        Args:
+            database (PatternDatabase):  A pattern database over the whole goal
+        """
+        self.database = database
+        self.goal = database.goal
+        self.size = len(self.goal)
+
+    @classmethod
+    def build(cls, goal):
+        """
+        Compute the distance of every state to the goal.
+
+        Returns:
+            A new DistanceOracle, held in memory.
+        """
+        if len(goal) > cls.max_size:
+            raise ValueError('Cannot build a distance oracle for more than {} values'.format(cls.max_size))
+
+        if numpy is None:
+            return cls(PatternDatabase.build(goal, goal))
+        return cls(PatternDatabase(goal, goal, sweep(goal)))
+
+    @classmethod
+    def open(cls, goal, directory=None):
+        """
+        Memory-map the oracle for a goal, building and saving it first if it
+        does not exist yet.  It shares its directory with pattern databases.
+        """
+        filename = PatternDatabase.filename(goal, goal, directory)
+        if not os.path.exists(filename):
+            cls.build(goal).database.save(filename)
+
+        return cls(PatternDatabase.load(filename))
+
+    def distance(self, state, pointer):
+        """
+        The exact number of moves from a state to the goal, or UNREACHED.
+        """
+        return self.database.distance(state, pointer)
+
+    def path(self, state, pointer):
+        """
+        An optimal solution from a state, found by always moving to a state one
+        move closer to the goal.
+
+        Returns:
+            A PantsPath ending in the goal, or None if the goal can't be reached.
+        """
+        path = PantsPath([PantsState(pointer, state)])
+        distance = self.distance(state, pointer)
+        if distance == UNREACHED:
+            return None
+
+        while distance > 0:
+            for move, transition in enumerate(MOVES):
+                next_state = getattr(path.last_state, transition)()
+                if next_state is not None and self.distance(next_state.state, next_state.pointer) == distance - 1:
+                    path = PantsPath([next_state], path, move)
+                    distance -= 1
+                    break
+
+        return path
+
+    def states(self, samples=None, seed=0):
+        """
+        Generate the reachable states as (state, pointer, distance) triples.
+
+        Args:
+            samples (int):  If given, only this many states chosen at random
+            seed (int):     The random seed for choosing states
+        """
+        size = self.size
+        table = self.database.table
+
+        if samples is None:
+            indices = range(len(table))
+        else:
+            rng = random.Random(seed)
+            indices = (rng.randrange(len(table)) for _ in counter())
+
+        found = 0
+        for index in indices:
+            distance = table[index]
+            if distance == UNREACHED:
+                continue
+
+            rank, pointer = divmod(index, size)
+            state = [None] * size
+            for value, position in zip(self.goal, unrank_positions(rank, size, size)):
+                state[position] = value
+            yield state, pointer, distance
+
+            found += 1
+            if samples is not None and found == samples:
+                return
+
+    def accuracy(self, heuristic, samples=None, seed=0):
+        """
+        Compare a heuristic's scores with the exact distances.
+
+        Args:
+            heuristic (object):  An object that implements a 'score' method for evaluating PantsPaths
+            samples (int):       If given, only compare this many states chosen at random
+
+        Returns:
+            A dict with the number of states compared, how many the heuristic
+            overestimates (admissibility violations), the worst overestimate,
+            and the mean of score / distance away from the goal.
+        """
+        compared = violations = nonzero = 0
+        worst = 0
+        ratio = 0.0
+        for state, pointer, distance in self.states(samples, seed):
+            score = heuristic.score(PantsPath([PantsState(pointer, state)]))
+            compared += 1
+            if score > distance:
+                violations += 1
+                worst = max(worst, score - distance)
+            if distance:
+                nonzero += 1
+                ratio += score / distance
+
+        return {
+            'states': compared,
+            'violations': violations,
+            'worst_overestimate': worst,
+            'mean_ratio': ratio / nonzero if nonzero else None,
+        }
+
+    def waste(self, solver, initial):
+        """
+        Measure how far a solver's run was from the optimum.
+
+        Args:
+            solver (PantsSolver):  A solver that has been run on `initial`
+            initial (list[int]):   The initial state it was run from
+
+        Returns:
+            A dict with the optimal and actual number of moves, and the number
+            of nodes evaluated beyond those on an optimal path.
+        """
+        optimal = self.distance(initial, 0)
+        moves = solver.solution.depth if solver.solved else None
+
+        return {
+            'optimal': optimal,
+            'moves': moves,
+            'excess_moves': moves - optimal if moves is not None else None,
+            'evaluated': solver.evaluated,
+            'wasted': solver.evaluated - optimal - 1,
+        }
+
+
+class OracleSolver:
+    """
+    Solves a small Pants Problem instantly, by looking up an optimal path in a
+    DistanceOracle.
+    """
+
+    def __init__(self, initial, goal, oracle=None):
+        """
+        Initialization method for OracleSolver
+
+        Args:
+            initial (list[int]):     The initial state of the problem
+            goal (list[int]):        The desired goal state of the problem
+            oracle (DistanceOracle): The oracle for the goal, opened on demand if not given
+        """
+        self.initial = initial
+        self.goal = goal
+        self.oracle = oracle
+        self.evaluated = 0
+        self.solution = None
+
+    @property
+    def solved(self):
+        """
+        Is there a solution for the current problem?
+
+        Returns:
+            True if a solution has been found, False otherwise
+        """
+        return self.solution is not None
+
+    def solve(self):
+        """
+        Look up an optimal solution.
+        """
+        if self.oracle is None:
+            self.oracle = DistanceOracle.open(self.goal)
+
+        self.solution = self.oracle.path(self.initial, 0)
+        if self.solution is not None:
+            self.evaluated = self.solution.depth + 1
+
+
+def sweep(goal):
+    """
+    Compute the distance table for the whole goal with NumPy.
+
+    Every permutation is generated in rank order, and for each pair of
+    neighbouring cells the rank of every permutation with those cells swapped
+    is precomputed.  Each layer of the breadth-first sweep is then a handful
+    of array operations over the whole frontier.
+
+    Returns:
+        The table, as a bytearray in the PatternDatabase layout.
+    """
+    size = len(goal)
+    count = factorial(size)
+
+    positions = _permutations(size)
+    swapped = numpy.empty((size - 1, count), dtype=numpy.int64)
+    for cell in range(size - 1):
+        exchanged = positions + (positions == cell) - (positions == cell + 1)
+        swapped[cell] = _ranks(exchanged)
+    del positions
+
+    # The goal's positions are the identity permutation, with rank 0
+    table = numpy.full(count * size, UNREACHED, dtype=numpy.uint8)
+    frontier = numpy.arange(size, dtype=numpy.int64)
+    table[frontier] = 0
+
+    distance = 0
+    while frontier.size and distance + 1 < UNREACHED:
+        distance += 1
+        ranks, pointers = numpy.divmod(frontier, size)
+
+        left = pointers >= 1
+        right = pointers <= size - 2
+        candidates = numpy.concatenate([
+            frontier[pointers >= 2] - 2,
+            frontier[pointers <= size - 3] + 2,
+            swapped[pointers[left] - 1, ranks[left]] * size + pointers[left] - 1,
+            swapped[pointers[right], ranks[right]] * size + pointers[right] + 1,
+        ])
+        # Marking a mask is much cheaper than sorting the candidates to
+        # remove duplicates
+        reached = numpy.zeros(len(table), dtype=bool)
+        reached[candidates] = True
+        reached &= table == UNREACHED
+        frontier = numpy.flatnonzero(reached)
+        table[frontier] = distance
+
+    return bytearray(table.tobytes())
+
+
+def _permutations(size):
+    """
+    Every permutation of range(size) as rows of an array, in lexicographic
+    (that is, rank) order.
+    """
+    rows = numpy.zeros((1, 0), dtype=numpy.int8)
+    for length in range(1, size + 1):
+        blocks = []
+        for first in range(length):
+            rest = rows + (rows >= first)
+            column = numpy.full((len(rows), 1), first, dtype=numpy.int8)
+            blocks.append(numpy.hstack([column, rest.astype(numpy.int8)]))
+        rows = numpy.vstack(blocks)
+
+    return rows
+
+
+def _ranks(rows):
+    """
+    The Lehmer code rank of every row of an array of permutations.
+    """
+    size = rows.shape[1]
+    ranks = numpy.zeros(len(rows), dtype=numpy.int64)
+    for index in range(size):
+        smaller_later = (rows[:, index + 1:] < rows[:, index:index + 1]).sum(axis=1)
+        ranks = ranks * (size - index) + smaller_later
+
+    return ranks
+
+
+def run():
+    from pants import heuristics
+    from pants.solver import PantsSolver
+
+    parser = argparse.ArgumentParser(description='Exact distances for small Pants Problems.')
+    parser.add_argument('command', choices=['build', 'report'],
+                        help='Build the oracle, or report how close heuristics are to it')
+    parser.add_argument('--size', type=int, default=8, help='The size of the problem set (defaults to 8)')
+    parser.add_argument('--heuristic', action='append',
+                        help='A heuristic class to report on (may be repeated, defaults to all)')
+    parser.add_argument('--samples', type=int, default=10000,
+                        help='The number of random states to compare (0 for every state, defaults to 10000)')
+
+    args = parser.parse_args()
+
+    initial = list(range(1, args.size + 1))
+    goal = list(reversed(initial))
+    oracle = DistanceOracle.open(goal)
+    print('Oracle:  {}'.format(PatternDatabase.filename(goal, goal)))
+    print('Optimal moves:  {}'.format(oracle.distance(initial, 0)))
+
+    if args.command == 'report':
+        names = args.heuristic or [name for name, value in vars(heuristics).items()
+                                   if type(value) is type and hasattr(value, 'score')]
+        for name in names:
+            heuristic = getattr(heuristics, name)(goal)
+            accuracy = oracle.accuracy(heuristic, args.samples or None)
+
+            solver = PantsSolver(initial, goal, heuristic)
+            solver.solve()
+            waste = oracle.waste(solver, initial)
+
+            print('{}:  {}'.format(name, ', '.join('{}={}'.format(k, v) for k, v in
+                                                     sorted(dict(accuracy, **waste).items()))))
+
+
+if __name__ == '__main__':
+    run()
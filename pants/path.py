@@ -1,20 +1,117 @@
+from pants.state import MOVES
+
+
 class PantsPath:
     """
     A series of PantsStates representing a progression of moves.
+
+    A PantsPath is a search node:  it only holds its last state, the path it
+    extends, its depth and the move that led to it.  The full series of states
+    is rebuilt from the parent links on demand, so generating a child is O(1)
+    rather than a copy of the whole history.
     """
 
-    def __init__(self, states):
+    __slots__ = ('last_state', 'parent', 'depth', 'move', 'score')
+
+    def __init__(self, states, parent=None, move=None):
         """
         Initialization method for PantsPath
 
         Args:
             states (list[PantsState]):  The ordered list of PantsStates, presenting the movement history
+            parent (PantsPath):         An optional PantsPath that the states continue from
+            move (int):                 The move (see pants.state.MOVES) leading to the last state, if known
+
+        The `score` attribute is filled in by the solver when the path is queued.
         """
-        self.states = states
+        for state in states[:-1]:
+            parent = PantsPath([state], parent)
+
+        self.last_state = states[-1]
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.move = move
+        self.score = None
 
     @property
-    def last_state(self):
-        return self.states[-1]
+    def states(self):
+        """
+        The ordered list of PantsStates from the start of the path to the last state.
+        """
+        states = []
+        node = self
+        while node is not None:
+            states.append(node.last_state)
+            node = node.parent
+        states.reverse()
+        return states
+
+    @classmethod
+    def from_moves(cls, state, moves):
+        """
+        Build the PantsPath made by applying a series of moves to a state.
+
+        Args:
+            state (PantsState):  The first state of the path
+            moves (list[int]):   The moves to apply (see pants.state.MOVES)
+        """
+        return cls([state]).extend(moves)
+
+    def extend(self, moves):
+        """
+        The PantsPath made by applying a series of moves to the last state of this one.
+
+        Args:
+            moves (list[int]):   The moves to apply (see pants.state.MOVES)
+        """
+        path = self
+        for move in moves:
+            path = PantsPath([path.last_state.apply(move)], path, move)
+
+        return path
+
+    @property
+    def moves(self):
+        """
+        The ordered list of moves made along this path.
+        """
+        moves = []
+        node = self
+        while node.parent is not None:
+            moves.append(node.move)
+            node = node.parent
+        moves.reverse()
+        return moves
+
+    @property
+    def revisited(self):
+        """
+        Has the last state of this path been visited earlier in the path?
+        """
+        node = self.parent
+        while node is not None:
+            if node.last_state == self.last_state:
+                return True
+            node = node.parent
+        return False
+
+    @property
+    def successors(self):
+        """
+        Generate the next set of PantsPaths for every valid move from the last PantsState in the series.
+
+        Unlike `children`, this does not filter out states already visited on
+        this path - callers that track visited states themselves (e.g. the
+        solver's closed set) can skip that linear scan.
+
+        Returns:
+            A generator of new PantsPaths, each with one additional PantsState.
+        """
+        for move, transition in enumerate(MOVES):
+            next_state = getattr(self.last_state, transition)()
+
+            if next_state is not None:
+                yield PantsPath([next_state], self, move)
 
     @property
     def children(self):
@@ -24,20 +121,10 @@ class PantsPath:
         Returns:
             A list of new PantsPaths, each with one additional PantsState for each valid move from the most recent PantsState.
         """
-        state_transitions = [
-            self.last_state.move_pointer_left,
-            self.last_state.move_pointer_right,
-            self.last_state.swap_left,
-            self.last_state.swap_right
-        ]
-
-        for transition in state_transitions:
-            next_state = transition()
-
-            # Only if the next state is a valid move AND we have not been in
-            # this position before, make a new path with the transition
-            if next_state is not None and next_state not in self.states:
-                yield PantsPath(self.states + [next_state])
+        # Only if we have not been in this position before on this path
+        for path in self.successors:
+            if not path.revisited:
+                yield path
 
     def __str__(self):
         """
@@ -51,12 +138,22 @@ class PantsPath:
     def __eq__(self, other):
         """
         Determine if two PantsPaths are equal.
+
+        The parent links are walked in step, stopping as soon as the paths
+        differ or share a common tail.
         """
-        if isinstance(other, PantsPath):
-            return self.states == other.states
-        else:
+        if not isinstance(other, PantsPath):
             return False
 
+        mine, theirs = self, other
+        while mine is not theirs:
+            if mine is None or theirs is None:
+                return False
+            if mine.depth != theirs.depth or mine.last_state != theirs.last_state:
+                return False
+            mine, theirs = mine.parent, theirs.parent
+        return True
+
     def __lt__(self, other):
         """
         Define an ordering for two different PantsPaths.
@@ -66,4 +163,4 @@ class PantsPath:
         set, the implementation of python's priority queue needs
         this to be defined.
         """
-        return len(self.states) < len(other.states)
+        return self.depth < other.depth
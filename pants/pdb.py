@@ -0,0 +1,237 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+from pants.state import MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+
+
+MAGIC = b'PDB1'
+HEADER = struct.Struct('<4sHH')
+UNREACHED = 255
+
+
+def rank_positions(positions, size):
+    """
+    Rank a sequence of distinct positions (a partial permutation of range(size)).
+
+    Each position is numbered among the positions not used before it, so the
+    ranks of all k-long sequences are exactly 0 .. size! / (size - k)! - 1.
+    For k == size this is the Lehmer code rank of the permutation.
+
+    Args:
+        positions (list[int]):  The distinct positions
+        size (int):             The number of positions available
+
+    Returns:
+        The rank, as an int.
+    """
+    rank = 0
+    used = 0
+    for index, position in enumerate(positions):
+        below = bin(used & ((1 << position) - 1)).count('1')
+        rank = rank * (size - index) + position - below
+        used |= 1 << position
+
+    return rank
+
+
+def unrank_positions(rank, size, length):
+    """
+    The inverse of `rank_positions`.
+
+    Args:
+        rank (int):    The rank of the positions
+        size (int):    The number of positions available
+        length (int):  The number of positions in the sequence
+
+    Returns:
+        The list of positions with that rank.
+    """
+    numbers = []
+    for index in reversed(range(length)):
+        rank, number = divmod(rank, size - index)
+        numbers.append(number)
+    numbers.reverse()
+
+    unused = list(range(size))
+    return [unused.pop(number) for number in numbers]
+
+
+def count_positions(size, length):
+    """
+    The number of distinct `length`-long sequences of positions in range(size).
+    """
+    count = 1
+    for available in range(size - length + 1, size + 1):
+        count *= available
+
+    return count
+
+
+class PatternDatabase:
+    """
+    An exact distance table for an abstraction of the Pants Problem.
+
+    The abstraction keeps the pointer and the positions of a subset of values
+    (the "pattern"), and treats all the other values as indistinguishable.  The
+    distance from every abstract state to the abstract goal (pattern values in
+    their goal positions, pointer anywhere) is found with a backward sweep from
+    the goal, which is possible since every move can be undone.
+
+    Every move of the real problem is a move of the abstraction, so abstract
+    distances never overestimate:  each table is admissible, and several can
+    be combined by taking the maximum.  (Summing tables over disjoint patterns
+    is not admissible, since pointer moves and swaps would be counted once per
+    table.)
+
+    Distances are stored one byte per abstract state, indexed by the rank of
+    the pattern values' positions times the size, plus the pointer.
+    """
+
+    def __init__(self, goal, pattern, table, source=None):
+        """
+        Initialization method for PatternDatabase
+
+        Args:
+            goal (list[int]):     The goal state the distances lead to
+            pattern (list[int]):  The values distinguished by the abstraction
+            table (buffer):       The distance table (a bytearray, or a memoryview of a mmap)
+            source (mmap):        The memory map the table is read from, if any
+        """
+        self.goal = list(goal)
+        self.pattern = list(pattern)
+        self.table = table
+        self.source = source
+
+    @classmethod
+    def build(cls, goal, pattern):
+        """
+        Compute the distance table with a breadth-first sweep backwards from the
+        abstract goal.
+
+        Returns:
+            A new PatternDatabase, held in memory.
+        """
+        size = len(goal)
+        last = size - 1
+        table = bytearray([UNREACHED]) * (count_positions(size, len(pattern)) * size)
+
+        # Each layer holds (positions, rank of positions, pointer) entries
+        start = tuple(goal.index(value) for value in pattern)
+        start_rank = rank_positions(start, size)
+        layer = []
+        for pointer in range(size):
+            table[start_rank * size + pointer] = 0
+            layer.append((start, start_rank, pointer))
+
+        distance = 0
+        while layer and distance + 1 < UNREACHED:
+            distance += 1
+            next_layer = []
+            for positions, rank, pointer in layer:
+                for move in (MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT):
+                    next_positions, next_rank = positions, rank
+                    if move == MOVE_POINTER_LEFT:
+                        if pointer < 2:
+                            continue
+                        next_pointer = pointer - 2
+                    elif move == MOVE_POINTER_RIGHT:
+                        if pointer > last - 2:
+                            continue
+                        next_pointer = pointer + 2
+                    else:
+                        next_pointer = pointer - 1 if move == SWAP_LEFT else pointer + 1
+                        if next_pointer < 0 or next_pointer > last:
+                            continue
+                        # Swapping two indistinguishable values leaves the positions alone
+                        if pointer in positions or next_pointer in positions:
+                            next_positions = tuple(next_pointer if p == pointer else pointer if p == next_pointer else p
+                                                   for p in positions)
+                            next_rank = rank_positions(next_positions, size)
+
+                    index = next_rank * size + next_pointer
+                    if table[index] == UNREACHED:
+                        table[index] = distance
+                        next_layer.append((next_positions, next_rank, next_pointer))
+            layer = next_layer
+
+        return cls(goal, pattern, table)
+
+    def save(self, filename):
+        """
+        Write the table to a file, atomically replacing any existing one.
+        """
+        size, length = len(self.goal), len(self.pattern)
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as output:
+            output.write(HEADER.pack(MAGIC, size, length))
+            output.write(struct.pack('<{}q'.format(size + length), *(self.goal + self.pattern)))
+            output.write(self.table)
+        os.replace(temporary, filename)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Memory-map a saved table.  The table is shared with every other process
+        that maps the same file, and pages are only read as they are used.
+
+        Returns:
+            A new PatternDatabase, backed by the file.
+        """
+        with open(filename, 'rb') as source:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, size, length = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            raise ValueError('{} is not a pattern database'.format(filename))
+        values = struct.unpack_from('<{}q'.format(size + length), mapped, HEADER.size)
+        offset = HEADER.size + 8 * (size + length)
+
+        return cls(values[:size], values[size:], memoryview(mapped)[offset:], mapped)
+
+    @classmethod
+    def open(cls, goal, pattern, directory=None):
+        """
+        Load the table for a goal and pattern from a directory, building and
+        saving it first if it does not exist yet.
+
+        Returns:
+            A PatternDatabase, backed by the file.
+        """
+        filename = cls.filename(goal, pattern, directory)
+        if not os.path.exists(filename):
+            cls.build(goal, pattern).save(filename)
+
+        return cls.load(filename)
+
+    @staticmethod
+    def filename(goal, pattern, directory=None):
+        """
+        The file a table for a goal and pattern is saved to.
+
+        Args:
+            directory (str):  The directory of tables, by default $PANTS_PDB_DIR
+                              or a 'pants-pdb' folder in the temp directory
+        """
+        if directory is None:
+            directory = os.environ.get('PANTS_PDB_DIR') or os.path.join(tempfile.gettempdir(), 'pants-pdb')
+
+        digest = hashlib.sha1(repr((list(goal), list(pattern))).encode()).hexdigest()
+        return os.path.join(directory, '{}.pdb'.format(digest[:20]))
+
+    def distance(self, state, pointer):
+        """
+        The exact abstract distance of a state to the goal.
+
+        Args:
+            state (list[int]):  The state list
+            pointer (int):      The pointer position
+        """
+        size = len(state)
+        positions = [state.index(value) for value in self.pattern]
+        return self.table[rank_positions(positions, size) * size + pointer]
@@ -0,0 +1,140 @@
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+
+from pants.solver import PantsSolver
+from pants.path import PantsPath
+from pants.state import PantsState
+from pants import heuristics
+
+
+def _solve(connection, initial, goal, name, max_iterations):
+    """
+    Worker process:  solve with one heuristic and send back the result.
+
+    Only the moves of the solution are sent, since a PantsPath's parent links
+    would be pickled one level of recursion per move.
+    """
+    started = time.time()
+    solver = PantsSolver(initial, goal, getattr(heuristics, name)(goal), max_iterations)
+    solver.solve()
+
+    moves = solver.solution.moves if solver.solved else None
+    connection.send((name, moves, solver.evaluated, time.time() - started))
+    connection.close()
+
+
+class PortfolioSolver:
+    """
+    Races several heuristics against each other, each in its own process.
+
+    No single heuristic is best at every size, so rather than guessing, a
+    PantsSolver is run for every heuristic in the portfolio, `jobs` at a time.
+    Either the first solution found wins and the other workers are stopped, or
+    (with `shortest`) the shortest solution found before the deadline wins.
+    """
+
+    def __init__(self, initial, goal, heuristic_names, jobs=None, deadline=None, shortest=False,
+                 max_iterations=100000):
+        """
+        Initialization method for PortfolioSolver
+
+        Args:
+            initial (list[int]):          The initial state of the problem
+            goal (list[int]):             The desired goal state of the problem
+            heuristic_names (list[str]):  The names of the heuristic classes to race
+            jobs (int):                   The number of worker processes (defaults to the CPU count)
+            deadline (float):             The number of seconds to wait for solutions, or None to wait for all
+            shortest (bool):              Keep the shortest solution rather than the first one
+            max_iterations (int):         The maximum number of iterations for each worker
+        """
+        for name in heuristic_names:
+            if type(getattr(heuristics, name, None)) is not type:
+                raise ValueError('Cannot find heuristic with name "{}"'.format(name))
+
+        self.initial = initial
+        self.goal = goal
+        self.heuristic_names = list(heuristic_names)
+        self.jobs = jobs or multiprocessing.cpu_count()
+        self.deadline = deadline
+        self.shortest = shortest
+        self.max_iterations = max_iterations
+
+        self.results = {}
+        self.winner = None
+        self.evaluated = 0
+        self.solution = None
+
+    @property
+    def solved(self):
+        """
+        Is there a solution for the current problem?
+
+        Returns:
+            True if a solution has been found, False otherwise
+        """
+        return self.solution is not None
+
+    def solve(self):
+        """
+        Run the portfolio until a winner is decided, then stop every worker
+        that is still running.
+
+        Each heuristic's result is recorded in `results`, by name, as a dict of
+        its number of moves (None if unsolved), nodes evaluated and seconds taken.
+        """
+        pending = list(self.heuristic_names)
+        running = {}
+        stop_at = None if self.deadline is None else time.time() + self.deadline
+
+        try:
+            while pending or running:
+                while pending and len(running) < self.jobs:
+                    name = pending.pop(0)
+                    receiver, sender = multiprocessing.Pipe(duplex=False)
+                    process = multiprocessing.Process(
+                        target=_solve,
+                        args=(sender, self.initial, self.goal, name, self.max_iterations),
+                        daemon=True
+                    )
+                    process.start()
+                    sender.close()
+                    running[receiver] = (name, process)
+
+                timeout = None if stop_at is None else max(stop_at - time.time(), 0)
+                ready = wait(list(running), timeout)
+                if not ready:
+                    break
+
+                for receiver in ready:
+                    name, process = running.pop(receiver)
+                    try:
+                        self.record(*receiver.recv())
+                    except EOFError:
+                        # The worker died without a result
+                        self.results[name] = {'moves': None, 'evaluated': None, 'seconds': None}
+                    receiver.close()
+                    process.join()
+
+                if self.solved and not self.shortest:
+                    break
+        finally:
+            for receiver, (name, process) in running.items():
+                process.terminate()
+                process.join()
+                receiver.close()
+
+    def record(self, name, moves, evaluated, seconds):
+        """
+        Record a worker's result, keeping it as the solution if it wins.
+        """
+        self.results[name] = {
+            'moves': None if moves is None else len(moves),
+            'evaluated': evaluated,
+            'seconds': seconds,
+        }
+        self.evaluated += evaluated
+
+        if moves is not None and (self.solution is None or len(moves) < self.solution.depth):
+            self.solution = PantsPath.from_moves(PantsState(0, self.initial), moves)
+            self.winner = name
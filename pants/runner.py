@@ -0,0 +1,212 @@
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from pants import heuristics
+from pants.solver import PantsSolver
+
+
+def parse_sizes(text):
+    """
+    Parse a list of problem sizes, such as '8', '5-20' or '5,7,9-11'.
+
+    Returns:
+        The sizes, as a list of ints.
+    """
+    sizes = []
+    for part in text.split(','):
+        first, _, last = part.partition('-')
+        sizes.extend(range(int(first), int(last or first) + 1))
+    return sizes
+
+
+def generate(sizes, count=None, seed=None):
+    """
+    Generate problem instances.
+
+    Without a count this is the usual problem for each size - sorted to
+    reversed.  With one, `count` instances are generated with a random size
+    from `sizes` and a random initial permutation, reproducibly for a seed.
+
+    Yields:
+        Instances, as dicts with an 'id', the 'initial' state and the 'goal' state.
+    """
+    if count is None:
+        for size in sizes:
+            initial = list(range(1, size + 1))
+            yield {'id': 'size-{}'.format(size), 'initial': initial, 'goal': list(reversed(initial))}
+        return
+
+    generator = random.Random(seed)
+    for index in range(count):
+        size = generator.choice(sizes)
+        initial = list(range(1, size + 1))
+        generator.shuffle(initial)
+        yield {'id': index, 'initial': initial, 'goal': list(range(size, 0, -1))}
+
+
+def read(lines):
+    """
+    Read problem instances from lines of JSON, such as a JSONL file.
+
+    Each line is an object with an 'initial' state, and optionally a 'goal'
+    state (defaulting to the values of the initial state, reversed sorted), an
+    'id' (defaulting to the line number) and a 'heuristic' name that overrides
+    the batch's.  Blank lines are skipped.
+
+    Yields:
+        Instances, as dicts.  A line that is not a valid instance yields its
+        line number as the 'id' and an 'error' instead, which `run_batch`
+        passes straight through as its result.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+
+        try:
+            instance = json.loads(line)
+            if not isinstance(instance, dict):
+                raise ValueError('An instance must be a JSON object')
+            instance.setdefault('id', number)
+            instance.setdefault('goal', sorted(instance['initial'], reverse=True))
+        except (ValueError, KeyError, TypeError) as error:
+            instance = {'id': number, 'error': '{}: {}'.format(type(error).__name__, error)}
+        yield instance
+
+
+def solve(instance, heuristic, max_iterations=100000, timeout=None, paths=False):
+    """
+    Solve one instance with a PantsSolver.  This runs in the worker processes.
+
+    Args:
+        instance (dict):       The instance, as from `generate` or `read`
+        heuristic (str):       The name of the heuristic class, unless the instance names one
+        max_iterations (int):  The maximum number of iterations for the solver
+        timeout (float):       The number of seconds to give up after, or None
+        paths (bool):          Include the solution's list of moves in the result
+
+    Returns:
+        The result, as a dict of the instance's 'id' and 'size', the
+        'heuristic', whether it was 'solved', the number of 'moves', the
+        number of nodes 'evaluated', the 'seconds' taken and whether it
+        'timed_out'.  An invalid instance has an 'error' instead.
+    """
+    name = instance.get('heuristic', heuristic)
+    initial, goal = instance['initial'], instance['goal']
+    result = {'id': instance['id'], 'size': len(initial), 'heuristic': name}
+
+    heuristic_class = getattr(heuristics, name, None)
+    if type(heuristic_class) is not type:
+        result['error'] = 'Cannot find heuristic with name "{}"'.format(name)
+        return result
+    if sorted(initial) != sorted(goal):
+        result['error'] = 'The goal is not a permutation of the initial state'
+        return result
+
+    started = time.monotonic()
+    solver = PantsSolver(initial, goal, heuristic_class(goal), max_iterations)
+    solver.solve(time_limit=timeout)
+    seconds = time.monotonic() - started
+
+    result.update({
+        'solved': solver.solved,
+        'moves': solver.solution.depth if solver.solved else None,
+        'evaluated': solver.evaluated,
+        'seconds': round(seconds, 6),
+        'timed_out': not solver.solved and timeout is not None and seconds >= timeout,
+    })
+    if paths:
+        result['path'] = solver.solution.moves if solver.solved else None
+    return result
+
+
+def run_batch(instances, heuristic='Distance', jobs=None, max_iterations=100000, timeout=None, paths=False):
+    """
+    Solve many instances in a pool of worker processes.
+
+    Only a couple of instances per worker are read ahead of the workers, so
+    an endless stream of instances can be solved in bounded memory.
+
+    Args:
+        instances (iterable[dict]):  The instances to solve
+        heuristic (str):             The name of the heuristic class for instances that don't name one
+        jobs (int):                  The number of worker processes (defaults to the CPU count)
+        max_iterations (int):        The maximum number of iterations for each instance
+        timeout (float):             The number of seconds to give each instance, or None
+        paths (bool):                Include each solution's list of moves in its result
+
+    Yields:
+        The result of each instance (see `solve`), in the order they finish.
+    """
+    jobs = jobs or multiprocessing.cpu_count()
+    instances = iter(instances)
+    pending = {}
+
+    with ProcessPoolExecutor(jobs) as executor:
+        try:
+            while True:
+                for instance in instances:
+                    if 'error' in instance:
+                        yield instance
+                        continue
+                    future = executor.submit(solve, instance, heuristic, max_iterations, timeout, paths)
+                    pending[future] = instance
+                    if len(pending) >= 2 * jobs:
+                        break
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    instance = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as error:
+                        yield {'id': instance.get('id'), 'error': '{}: {}'.format(type(error).__name__, error)}
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Solve many Pants Problems in parallel, writing results as JSONL.')
+    parser.add_argument('--input', help='A JSONL file of instances to solve ("-" for standard input)')
+    parser.add_argument('--sizes', default='5-12', help='The sizes of generated instances, such as 5-20 (defaults to 5-12)')
+    parser.add_argument('--random', type=int, help='Generate this many random instances, rather than one per size')
+    parser.add_argument('--seed', type=int, help='The seed for --random instances')
+    parser.add_argument('--heuristic', default='Distance', help='The heuristic class to use (defaults to Distance)')
+    parser.add_argument('--jobs', type=int, help='The number of worker processes (defaults to the CPU count)')
+    parser.add_argument('--timeout', type=float, help='The number of seconds to give each instance')
+    parser.add_argument('--max-iterations', type=int, default=100000,
+                        help='The maximum number of iterations for each instance (defaults to 100000)')
+    parser.add_argument('--paths', action='store_true', help='Include the moves of each solution')
+    parser.add_argument('--output', help='The JSONL file to write results to (defaults to standard output)')
+
+    args = parser.parse_args()
+
+    # The input is read as the instances are solved, so it stays open until the batch is done
+    source = open(args.input) if args.input and args.input != '-' else sys.stdin
+    if args.input:
+        instances = read(source)
+    else:
+        instances = generate(parse_sizes(args.sizes), args.random, args.seed)
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in run_batch(instances, args.heuristic, args.jobs, args.max_iterations, args.timeout, args.paths):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == '__main__':
+    run()
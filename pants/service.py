@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from pants import runner
+
+# The longest line of request (or response) read, in bytes
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+def default_socket():
+    """
+    The Unix socket used when no address is given:  $PANTS_SOCKET, or 'pants.sock' in the temp directory.
+    """
+    return os.environ.get('PANTS_SOCKET') or os.path.join(tempfile.gettempdir(), 'pants.sock')
+
+
+class SolveService:
+    """
+    A long-running solver, answering requests over a socket.
+
+    Requests and responses are single lines of JSON.  A request is either
+    `{"op": "stats"}`, or a problem to solve:
+
+        {"op": "solve", "initial": [...], "goal": [...], "heuristic": "Distance",
+         "max_iterations": 100000, "timeout": 5, "paths": true}
+
+    where everything but the initial state is optional (the goal defaults to
+    the initial values reverse sorted, as in pants.runner.read), and the
+    response is the result of pants.runner.solve.
+
+    Solves run in a pool of worker processes, so the event loop is never
+    blocked and the number of solves at once is bounded.  A request that is
+    identical to one already being solved waits for the same result rather
+    than solving it again, and solved results are kept in a least recently
+    used cache - a solved problem has the same solution whatever its limits.
+    """
+
+    def __init__(self, jobs=None, cache_size=1024, max_iterations=100000, timeout=None):
+        """
+        Initialization method for SolveService
+
+        Args:
+            jobs (int):            The number of worker processes (defaults to the CPU count)
+            cache_size (int):      The number of solved results to keep
+            max_iterations (int):  The iteration limit of requests that don't give one
+            timeout (float):       The time limit of requests that don't give one, or None
+        """
+        self.jobs = jobs or multiprocessing.cpu_count()
+        self.cache_size = cache_size
+        self.max_iterations = max_iterations
+        self.timeout = timeout
+
+        self.executor = None
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.started = time.monotonic()
+        self.counts = dict.fromkeys(('requests', 'solves', 'cache_hits', 'coalesced', 'errors'), 0)
+        self.solve_seconds = 0.0
+
+    async def serve(self, path=None, host=None, port=None):
+        """
+        Serve requests until cancelled, on a Unix socket or else on a TCP port.
+
+        Args:
+            path (str):  The Unix socket (defaults to `default_socket()` when there is no port)
+            host (str):  The TCP host (defaults to localhost)
+            port (int):  The TCP port
+        """
+        self.executor = ProcessPoolExecutor(self.jobs)
+        try:
+            if port is None:
+                path = path or default_socket()
+                if os.path.exists(path):
+                    os.unlink(path)
+                server = await asyncio.start_unix_server(self.handle, path, limit=LINE_LIMIT)
+            else:
+                server = await asyncio.start_server(self.handle, host or '127.0.0.1', port, limit=LINE_LIMIT)
+
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            if port is None and os.path.exists(path):
+                os.unlink(path)
+
+    async def handle(self, reader, writer):
+        """
+        Answer the requests of one connection, one line each, until it is closed.
+
+        Each request is answered in its own task, so a slow solve does not
+        hold up the requests after it.  Responses carry the request's 'id' (if
+        it has one), as they can arrive in a different order.  A line longer
+        than LINE_LIMIT is answered with an error, and ends the connection.
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def send(response):
+            async with lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        async def answer(line):
+            await send(await self.respond(line))
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The rest of the line may still be arriving, so nothing after it can be read
+                    self.counts['requests'] += 1
+                    self.counts['errors'] += 1
+                    await send({'error': 'ValueError: A request must be shorter than {} bytes'.format(LINE_LIMIT)})
+                    break
+                if not line:
+                    break
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line):
+        """
+        The response to one line of request.
+        """
+        self.counts['requests'] += 1
+        request = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('A request must be a JSON object')
+
+            op = request.get('op', 'solve')
+            if op == 'stats':
+                response = self.stats()
+            elif op == 'solve':
+                response = await self.solve(request)
+            else:
+                response = {'error': 'Unknown op "{}"'.format(op)}
+        except Exception as error:
+            # Including anything raised in a worker, or by a broken pool
+            response = {'error': '{}: {}'.format(type(error).__name__, error)}
+
+        if 'error' in response:
+            self.counts['errors'] += 1
+        if isinstance(request, dict) and 'id' in request:
+            response = dict(response, id=request['id'])
+        return response
+
+    async def solve(self, request):
+        """
+        Solve a problem, from the cache, with an identical solve in flight, or in a worker.
+
+        Returns:
+            The result (see pants.runner.solve).
+        """
+        initial = list(request['initial'])
+        goal = list(request.get('goal') or sorted(initial, reverse=True))
+        heuristic = request.get('heuristic', 'Distance')
+        max_iterations = int(request.get('max_iterations') or self.max_iterations)
+        timeout = request.get('timeout', self.timeout)
+        paths = bool(request.get('paths'))
+
+        problem = (tuple(initial), tuple(goal), heuristic)
+        result = self.cache.get(problem)
+        if result is not None:
+            self.cache.move_to_end(problem)
+            self.counts['cache_hits'] += 1
+        else:
+            key = problem + (max_iterations, timeout)
+            future = self.in_flight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self.dispatch(problem, max_iterations, timeout))
+                self.in_flight[key] = future
+                future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            else:
+                self.counts['coalesced'] += 1
+            # Shielded, so a client hanging up does not cancel the solve of the others
+            result = await asyncio.shield(future)
+
+        result = dict(result)
+        if not paths:
+            result.pop('path', None)
+        return result
+
+    async def dispatch(self, problem, max_iterations, timeout):
+        """
+        Solve a problem in a worker process, and cache the result if it is solved.
+        """
+        initial, goal, heuristic = problem
+        instance = {'id': None, 'initial': list(initial), 'goal': list(goal)}
+
+        self.counts['solves'] += 1
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, runner.solve, instance, heuristic,
+                                            max_iterations, timeout, True)
+        result.pop('id')
+        self.solve_seconds += result.get('seconds', 0.0)
+
+        if result.get('solved'):
+            self.cache[problem] = result
+            self.cache.move_to_end(problem)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        """
+        The service's counters, as a dict.
+        """
+        stats = dict(self.counts)
+        stats.update({
+            'in_flight': len(self.in_flight),
+            'cached': len(self.cache),
+            'jobs': self.jobs,
+            'uptime': round(time.monotonic() - self.started, 3),
+            'solve_seconds': round(self.solve_seconds, 6),
+        })
+        return stats
+
+
+async def request(messages, path=None, host=None, port=None):
+    """
+    Send requests to a running SolveService over one connection.
+
+    Args:
+        messages (list[dict]):  The requests
+        path (str):             The Unix socket (defaults to `default_socket()` when there is no port)
+        host (str):             The TCP host (defaults to localhost)
+        port (int):             The TCP port
+
+    Returns:
+        The responses, in the order they arrived.
+    """
+    if port is None:
+        reader, writer = await asyncio.open_unix_connection(path or default_socket(), limit=LINE_LIMIT)
+    else:
+        reader, writer = await asyncio.open_connection(host or '127.0.0.1', port, limit=LINE_LIMIT)
+
+    try:
+        for message in messages:
+            writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+
+        responses = []
+        for _ in messages:
+            responses.append(json.loads(await reader.readline()))
+        return responses
+    finally:
+        writer.close()
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Run, or send requests to, a local Pants Problem solving service.')
+    parser.add_argument('command', choices=['serve', 'solve', 'stats'],
+                        help='Start the service, or send it a problem to solve, or ask for its statistics')
+    parser.add_argument('--socket', help='The Unix socket (defaults to $PANTS_SOCKET, or pants.sock in the temp directory)')
+    parser.add_argument('--port', type=int, help='Use this localhost TCP port instead of a Unix socket')
+    parser.add_argument('--jobs', type=int, help='serve:  the number of worker processes (defaults to the CPU count)')
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help='serve:  the number of solved results to keep (defaults to 1024)')
+    parser.add_argument('--size', type=int, default=5, help='solve:  the size of the problem set (defaults to 5)')
+    parser.add_argument('--initial', help='solve:  the initial state as a JSON list, instead of --size')
+    parser.add_argument('--goal', help='solve:  the goal state as a JSON list (defaults to the values reverse sorted)')
+    parser.add_argument('--heuristic', default='Distance', help='solve:  the heuristic class to use (defaults to Distance)')
+    parser.add_argument('--max-iterations', type=int,
+                        help='serve:  the default iteration limit (100000);  solve:  the limit for this problem')
+    parser.add_argument('--timeout', type=float,
+                        help='serve:  the default time limit in seconds;  solve:  the limit for this problem')
+    parser.add_argument('--paths', action='store_true', help='solve:  include the moves of the solution')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        service = SolveService(args.jobs, args.cache_size, args.max_iterations or 100000, args.timeout)
+        try:
+            asyncio.run(service.serve(args.socket, port=args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.command == 'stats':
+        message = {'op': 'stats'}
+    else:
+        initial = json.loads(args.initial) if args.initial else list(range(1, args.size + 1))
+        message = {'op': 'solve', 'initial': initial, 'heuristic': args.heuristic, 'paths': args.paths}
+        if args.goal:
+            message['goal'] = json.loads(args.goal)
+        if args.max_iterations:
+            message['max_iterations'] = args.max_iterations
+        if args.timeout is not None:
+            message['timeout'] = args.timeout
+
+    response, = asyncio.run(request([message], args.socket, port=args.port))
+    print(json.dumps(response))
+
+
+if __name__ == '__main__':
+    run()
@@ -1,7 +1,11 @@
-from heapq import heappush, heappop
+import time
 
+from pants import checkpoint
 from pants.state import PantsState
 from pants.path import PantsPath
+from pants.frontier import make_frontier, FIFO
+from pants.heuristics import companion
+from pants.symmetry import mirror
 
 class PantsSolver:
     """
@@ -13,20 +17,32 @@ class PantsSolver:
     3) A heuristic for exploring the problem set
     """
 
-    def __init__(self, initial, goal, heuristic, max_iterations=100000):
+    def __init__(self, initial, goal, heuristic, max_iterations=100000, frontier='auto', tie_break=FIFO,
+                 symmetry=False):
         """
         Initialization method for PantsSolver
 
         Args:
             initial (list[int]):  The initial state of the problem
             goal (list[int]):     The desired goal state of the problem
-            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths
+            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths,
+                                  and optionally a 'score_child' method for scoring incrementally
             max_iterations (int): The maximum number of iterations to evaluate when solving the problem
+            frontier (str):       The working set's priority queue - 'heap', 'bucket', or 'auto'
+                                  to use buckets when the heuristic declares `integer_scores`
+            tie_break (str):      The order of paths with equal scores - 'fifo', 'lifo' or 'deepest'
+            symmetry (bool):      Treat mirror image states as duplicates (see pants.symmetry.Mirror)
         """
-        self.working_set = []
+        self.working_set = make_frontier(frontier, tie_break, heuristic)
+        self.closed = set()
+        self.symmetry = mirror(goal) if symmetry else None
+        self.initial = initial
         self.goal = goal
         self.heuristic = heuristic
+        self.score_child = companion(heuristic, 'score_child')
         self.evaluated = 0
+        self.expanded = 0
+        self.iterations = 0
         self.solution = None
         self.max_iterations = max_iterations
 
@@ -38,11 +54,50 @@ class PantsSolver:
         Add a new PantsPath to the working set.
 
         Note:  This uses the heuristic to score the PantsPath when adding to the
-               underlying priority queue
+               underlying priority queue.  Paths ending in a state that has
+               already been expanded are skipped.
         """
-        heappush(self.working_set, (self.heuristic.score(path), path))
+        if self.key(path) in self.closed:
+            return
+
+        path.score = self.score(path)
+        self.working_set.push(self.priority(path), path)
         self.evaluated += 1
 
+    def key(self, path):
+        """
+        The key of a PantsPath's last state in the closed set.
+
+        With `symmetry`, a state and its mirror image share a key, so only
+        one of them is ever expanded.
+        """
+        if self.symmetry is None:
+            return path.last_state.key
+        return self.symmetry.key(path.last_state)
+
+    def priority(self, path):
+        """
+        The rank of a scored PantsPath in the working set (lower == better).
+
+        Plain best-first search ranks by the heuristic score alone.
+        """
+        return path.score
+
+    def score(self, path):
+        """
+        Score a PantsPath with the heuristic.
+
+        If the heuristic implements `score_child`, and the path extends an
+        already scored parent by a known move, the score is derived from the
+        parent's score instead of rescanning the whole state.
+        """
+        parent = path.parent
+        if self.score_child is not None and parent is not None \
+                and parent.score is not None and path.move is not None:
+            return self.score_child(parent.score, parent, path.move)
+
+        return self.heuristic.score(path)
+
     def pop_best(self):
         """
         Pops the best (lowest score) PantsPath from the priority queue.
@@ -51,10 +106,26 @@ class PantsSolver:
             The PantsPath from the working set with the lowest score.
         """
         # Ignoring the score for now...
-        score, path = heappop(self.working_set)
+        score, path = self.working_set.pop()
 
         return path
 
+    def close(self, path):
+        """
+        Mark the last state of a popped PantsPath as expanded.
+
+        The same state may have been queued from several branches before it
+        was first expanded - only the first (best) one is worth expanding.
+
+        Returns:
+            True if the path should be expanded, False if it is a duplicate.
+        """
+        key = self.key(path)
+        if key in self.closed:
+            return False
+        self.closed.add(key)
+        return True
+
     @property
     def solved(self):
         """
@@ -74,27 +145,155 @@ class PantsSolver:
         2) Evaluate if the PantsPath results in the goal state
         3) If not, generate child nodes representing all additional
            valid moves, and add them to the working set
+
+        Every expanded state is recorded in the closed set, so a state
+        reached again from a different branch is never scored or expanded twice.
         """
         best = self.pop_best()
 
-        # TODO:  Should this be a method on PantsState?
-        if best.last_state.state == self.goal:
+        if not self.close(best):
+            return
+        self.expanded += 1
+
+        if self.is_goal(best):
             self.solution = best
         else:
-            for path in best.children:
+            for path in self.expand(best):
                 self.add_path(path)
 
-    def solve(self):
+    def is_goal(self, path):
+        """
+        Does a PantsPath end in the goal state?
+        """
+        return path.last_state.state == self.goal
+
+    def expand(self, path):
+        """
+        Generate the children of an expanded PantsPath, to be added to the working set.
+
+        Returns:
+            A list of new PantsPaths, one for each valid move.
+        """
+        return list(path.successors)
+
+    def solve(self, time_limit=None):
         """
         Attempt to solve the pants problem.
 
-        This simply calls `iterate()` until one of two
+        This simply calls `iterate()` until one of these
         conditions occur:
         1) A solution is found
         2) The number of calls to `iterate()` exceeds `max_iterations`
+        3) The working set is exhausted (there is no solution)
+        4) More than `time_limit` seconds have passed (checked every 256 iterations)
+
+        Calling `solve()` again carries on from where it stopped, for up to
+        another `max_iterations`.
+
+        Args:
+            time_limit (float):  The maximum number of seconds to search for, or None for no limit
         """
-        for _ in range(self.max_iterations):
-            if self.solved:
+        stop_at = None if time_limit is None else time.monotonic() + time_limit
+
+        for iteration in range(self.max_iterations):
+            if self.solved or not self.working_set:
+                return
+            elif stop_at is not None and not iteration % 256 and time.monotonic() >= stop_at:
                 return
             else:
                 self.iterate()
+                self.iterations += 1
+
+    def iter_solve(self, every=10000, iterations=None):
+        """
+        Attempt to solve the pants problem, a slice at a time.
+
+        Unlike `solve()` this is not limited by `max_iterations`:  it carries
+        on until the problem is solved, the working set is exhausted, or
+        `iterations` more iterations have been run.  The caller may also stop
+        at any snapshot (and save a checkpoint, or carry on later).
+
+        Args:
+            every (int):       The number of iterations between snapshots
+            iterations (int):  The maximum number of iterations to run, or None for no limit
+
+        Yields:
+            A snapshot (see `snapshot()`) every `every` iterations, and when the search stops.
+        """
+        stop_at = None if iterations is None else self.iterations + iterations
+
+        while not self.solved and self.working_set and self.iterations != stop_at:
+            count = every if stop_at is None else min(every, stop_at - self.iterations)
+            for _ in range(count):
+                if self.solved or not self.working_set:
+                    break
+                self.iterate()
+                self.iterations += 1
+
+            if self.solved or not self.working_set or self.iterations == stop_at:
+                break
+            yield self.snapshot()
+
+        yield self.snapshot()
+
+    def snapshot(self):
+        """
+        The progress of the search so far.
+
+        Returns:
+            A dict of the number of iterations, nodes evaluated and expanded,
+            the size of the working set and the closed set, and whether the
+            problem is solved.
+        """
+        return {
+            'iterations': self.iterations,
+            'evaluated': self.evaluated,
+            'expanded': self.expanded,
+            'working_set': len(self.working_set),
+            'closed': len(self.closed),
+            'solved': self.solved,
+        }
+
+    def checkpoint(self, filename):
+        """
+        Save the search so far to a file (see pants.checkpoint), to be continued with `resume()`.
+        """
+        checkpoint.save(self, filename)
+
+    @classmethod
+    def resume(cls, filename, heuristic, **kwargs):
+        """
+        Continue a search saved with `checkpoint()`, possibly in another process.
+
+        Args:
+            filename (str):     The checkpoint file
+            heuristic (object): The heuristic, which must be the one the search was started with
+            kwargs:             Any other arguments of the solver (e.g. the `weight` of
+                                AStarSolver).  The frontier and tie break default to the saved ones.
+
+        Returns:
+            A new solver, in the same state as the saved one.
+        """
+        metadata, entries, closed, costs = checkpoint.load(filename)
+        if metadata['solver'] != cls.__name__:
+            raise ValueError('{} is a checkpoint of a {}, not a {}'.format(filename, metadata['solver'], cls.__name__))
+
+        kwargs.setdefault('frontier', metadata['frontier'])
+        kwargs.setdefault('tie_break', metadata['tie_break'])
+        kwargs.setdefault('symmetry', metadata.get('symmetry', False))
+        solver = cls(metadata['initial'], metadata['goal'], heuristic, **kwargs)
+
+        solver.working_set = make_frontier(kwargs['frontier'], kwargs['tie_break'], heuristic)
+        for score, path in entries:
+            path.score = score
+            solver.working_set.push(solver.priority(path), path)
+        solver.closed = closed
+        if costs is not None:
+            solver.costs = costs
+
+        solver.evaluated = metadata['evaluated']
+        solver.expanded = metadata['expanded']
+        solver.iterations = metadata['iterations']
+        if metadata['solution'] is not None:
+            solver.solution = PantsPath.from_moves(PantsState(0, metadata['initial']), metadata['solution'])
+        return solver
@@ -1,3 +1,52 @@
+from array import array
+
+
+# The four moves, in the order PantsPaths generate them
+MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT = range(4)
+MOVES = ('move_pointer_left', 'move_pointer_right', 'swap_left', 'swap_right')
+
+# The move that undoes each move
+INVERSE = (MOVE_POINTER_RIGHT, MOVE_POINTER_LEFT, SWAP_RIGHT, SWAP_LEFT)
+
+
+def pack(pointer, state):
+    """
+    Pack a pointer and a state list into a compact, immutable key.
+
+    Small problems (every value below 256, and the pointer below 255) pack into
+    one byte per cell, others (larger or negative values) fall back to eight
+    signed bytes per cell after a 0xff marker.
+
+    Args:
+        pointer (int):      The pointer position
+        state (list[int]):  The state list
+
+    Returns:
+        A bytes object uniquely identifying the (pointer, state) pair.
+    """
+    if pointer < 255:
+        try:
+            return bytes([pointer]) + bytes(state)
+        except ValueError:
+            pass
+    return b'\xff' + array('q', [pointer] + state).tobytes()
+
+
+def unpack(key):
+    """
+    The inverse of `pack`.
+
+    Returns:
+        A (pointer, state list) tuple.
+    """
+    if key[0] != 255:
+        return key[0], list(key[1:])
+
+    values = array('q')
+    values.frombytes(key[1:])
+    return values[0], values[1:].tolist()
+
+
 class PantsState:
     """
     An individual state of the Pants Problem.
@@ -25,6 +74,29 @@ class PantsState:
         """
         self.pointer = pointer
         self.state = state
+        self._key = None
+
+    @property
+    def key(self):
+        """
+        A compact, hashable key identifying this PantsState.
+
+        Two PantsStates have the same key if and only if they are equal.  The
+        key is computed once and cached, so the state list must not be mutated
+        after the key has been read.
+        """
+        if self._key is None:
+            self._key = pack(self.pointer, self.state)
+        return self._key
+
+    def apply(self, move):
+        """
+        Apply one of the four moves by number (see MOVES).
+
+        Returns:
+            The PantsState resulting from the move, or None if it cannot be made.
+        """
+        return getattr(self, MOVES[move])()
 
     def move_pointer_left(self):
         """
@@ -119,3 +191,9 @@ class PantsState:
             return self.pointer == other.pointer and self.state == other.state
         else:
             return False
+
+    def __hash__(self):
+        """
+        Hash a PantsState by its packed key, so it can be used in sets and dicts.
+        """
+        return hash(self.key)
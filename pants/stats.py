@@ -0,0 +1,174 @@
+from time import perf_counter
+
+# The phases of an iteration that are timed, one per solver hook ('add' is
+# add_path's own duplicate check, without the scoring and pushing it calls)
+PHASES = ('pop', 'close', 'goal', 'successors', 'add', 'score', 'push')
+
+
+class SolverStats:
+    """
+    Instrumentation for a PantsSolver (or a subclass).
+
+    Creating a SolverStats replaces methods of that one solver object with
+    counting and timing wrappers - the classes, and every other solver, are
+    untouched, so a solver that is not instrumented pays nothing for it.
+
+    It counts iterations, the paths pruned as duplicates (both when they are
+    generated and when they are popped) and the largest size of the working
+    set.  With `timers`, it also adds up the time spent in each of the PHASES
+    of an iteration, and in iterations as a whole.  Only the solver's hooks
+    are timed (is_goal and expand for the goal test and generating
+    successors), so every subclass keeps its own iterate:  the difference is
+    the solver's own bookkeeping.  With `progress`, the callback is called
+    with the SolverStats every `every` iterations.
+    """
+
+    def __init__(self, solver, timers=True, progress=None, every=10000):
+        """
+        Initialization method for SolverStats
+
+        Args:
+            solver (PantsSolver):  The solver to instrument, before it is solved
+            timers (bool):         Time the phases of each iteration
+            progress (callable):   A function called with this SolverStats every `every` iterations
+            every (int):           The number of iterations between calls of `progress`
+        """
+        self.solver = solver
+        self.timers = timers
+        self.progress = progress
+        self.every = every
+
+        self.iterations = 0
+        self.duplicates = 0
+        self.frontier_peak = len(solver.working_set)
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.total = 0.0
+
+        self.started = perf_counter()
+        self.last_report = (self.started, solver.evaluated)
+        self.nodes_per_second = None
+
+        self.attach()
+
+    def attach(self):
+        """
+        Replace the solver's methods with the instrumented ones.
+        """
+        solver = self.solver
+        self.iterate = solver.iterate
+        solver.iterate = self.counted_iterate
+
+        add_path = solver.add_path
+
+        def counted_add_path(path):
+            evaluated = solver.evaluated
+            add_path(path)
+            if solver.evaluated == evaluated:
+                self.duplicates += 1
+        solver.add_path = counted_add_path
+
+        close = solver.close
+
+        def counted_close(path):
+            if close(path):
+                return True
+            self.duplicates += 1
+            return False
+        solver.close = counted_close
+
+        working_set = solver.working_set
+        push = working_set.push
+
+        def counted_push(priority, path):
+            push(priority, path)
+            if len(working_set) > self.frontier_peak:
+                self.frontier_peak = len(working_set)
+        working_set.push = counted_push
+
+        if self.timers:
+            solver.pop_best = self.timed('pop', solver.pop_best)
+            solver.close = self.timed('close', solver.close)
+            solver.is_goal = self.timed('goal', solver.is_goal)
+            solver.expand = self.timed('successors', solver.expand)
+            solver.score = self.timed('score', solver.score)
+            if getattr(solver, 'score_batch', None) is not None:
+                solver.score_batch = self.timed('score', solver.score_batch)
+            working_set.push = self.timed('push', working_set.push)
+            solver.add_path = self.timed('add', solver.add_path, within=('score', 'push'))
+
+    def timed(self, phase, method, within=()):
+        """
+        Wrap a method so that the time spent in it is added to a phase.
+
+        The time of any phases `within` it (timed by their own wrappers) is
+        only counted once, in those phases.
+        """
+        seconds = self.seconds
+
+        def timed_method(*args):
+            started = perf_counter()
+            try:
+                return method(*args)
+            finally:
+                seconds[phase] += perf_counter() - started
+        if not within:
+            return timed_method
+
+        def timed_outer(*args):
+            before = sum(seconds[inner] for inner in within)
+            try:
+                return timed_method(*args)
+            finally:
+                seconds[phase] -= sum(seconds[inner] for inner in within) - before
+        return timed_outer
+
+    def counted_iterate(self):
+        """
+        The solver's iterate, counted (and timed as a whole), calling `progress` when it is due.
+        """
+        started = perf_counter() if self.timers else None
+        self.iterate()
+        if started is not None:
+            self.total += perf_counter() - started
+
+        self.iterations += 1
+        if self.progress is not None and not self.iterations % self.every:
+            self.report()
+            self.progress(self)
+
+    def report(self):
+        """
+        Update the nodes evaluated per second, since the last report.
+        """
+        now, evaluated = perf_counter(), self.solver.evaluated
+        then, before = self.last_report
+        if now > then:
+            self.nodes_per_second = (evaluated - before) / (now - then)
+        self.last_report = (now, evaluated)
+
+    @property
+    def elapsed(self):
+        """
+        The number of seconds since the solver was instrumented.
+        """
+        return perf_counter() - self.started
+
+    def summary(self):
+        """
+        The statistics, as a dict.
+        """
+        solver = self.solver
+        elapsed = self.elapsed
+        summary = {
+            'iterations': self.iterations,
+            'evaluated': solver.evaluated,
+            'expanded': solver.expanded,
+            'duplicates': self.duplicates,
+            'frontier': len(solver.working_set),
+            'frontier_peak': self.frontier_peak,
+            'seconds': elapsed,
+            'nodes_per_second': solver.evaluated / elapsed if elapsed else None,
+        }
+        if self.timers:
+            summary['phases'] = dict(self.seconds, other=max(self.total - sum(self.seconds.values()), 0.0))
+        return summary
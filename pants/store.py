@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import tempfile
+
+from pants.path import PantsPath
+from pants.state import PantsState, pack
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS remainders (
+    goal BLOB NOT NULL,
+    state BLOB NOT NULL,
+    distance INTEGER NOT NULL,
+    move INTEGER,
+    exact INTEGER NOT NULL,
+    PRIMARY KEY (goal, state)
+) WITHOUT ROWID
+'''
+
+# Keep the shorter remainder of a state, or the same length if it is now known to be exact
+UPSERT = '''
+INSERT INTO remainders (goal, state, distance, move, exact) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (goal, state) DO UPDATE SET distance = excluded.distance, move = excluded.move, exact = excluded.exact
+WHERE excluded.distance < remainders.distance
+   OR (excluded.distance = remainders.distance AND excluded.exact > remainders.exact)
+'''
+
+
+def default_filename():
+    """
+    The store used when none is named:  $PANTS_STORE, or 'pants-store.sqlite' in the temp directory.
+    """
+    return os.environ.get('PANTS_STORE') or os.path.join(tempfile.gettempdir(), 'pants-store.sqlite')
+
+
+class SolutionStore:
+    """
+    A persistent store of the best known remainders of solutions, shared by
+    every run (and every process) that opens the same file.
+
+    For each goal, every state that a solution has passed through is kept
+    with its distance to the goal along the best known solution, and the
+    next move of that solution.  The state that move leads to is always in
+    the store too, with a smaller distance (a remainder is only ever
+    replaced by a shorter one), so the whole remainder is rebuilt by
+    following the moves.  A distance is `exact` when it came from a solver
+    that only finds shortest solutions.
+
+    States are keyed by their packed key (see pants.state.pack), and goals
+    by the packed goal list.  A solver only reads the remainders of its own
+    goal, which are loaded into memory once.
+    """
+
+    def __init__(self, filename=None):
+        """
+        Initialization method for SolutionStore
+
+        Args:
+            filename (str):  The SQLite file, created if needed (defaults to `default_filename()`)
+        """
+        self.filename = default_filename() if filename is None else filename
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.filename)
+        with self.connection:
+            self.connection.execute(SCHEMA)
+        self.goals = {}
+
+    def close(self):
+        self.connection.close()
+
+    def remainders(self, goal):
+        """
+        The known remainders for a goal, loaded once per store.
+
+        Returns:
+            A dict from state key to (distance, move, exact) tuples.
+        """
+        goal_key = pack(0, goal)
+        remainders = self.goals.get(goal_key)
+        if remainders is None:
+            rows = self.connection.execute(
+                'SELECT state, distance, move, exact FROM remainders WHERE goal = ?', (goal_key,))
+            remainders = {state: (distance, move, bool(exact)) for state, distance, move, exact in rows}
+            self.goals[goal_key] = remainders
+        return remainders
+
+    def distance(self, goal, pants_state):
+        """
+        The length of the best known remainder from a PantsState, or None if there is none.
+        """
+        remainder = self.remainders(goal).get(pants_state.key)
+        return None if remainder is None else remainder[0]
+
+    def suffix(self, goal, pants_state):
+        """
+        The moves of the best known remainder from a PantsState.
+
+        Returns:
+            A list of moves, or None if the remainder is not known.
+        """
+        remainders = self.remainders(goal)
+        remainder = remainders.get(pants_state.key)
+        if remainder is None:
+            return None
+
+        moves = []
+        while remainder[0]:
+            distance, move, _ = remainder
+            moves.append(move)
+            pants_state = pants_state.apply(move)
+            remainder = None if pants_state is None else remainders.get(pants_state.key)
+
+            # Only a store written by something else could break the chain
+            if remainder is None or remainder[0] >= distance:
+                return None
+        return moves
+
+    def record(self, goal, path, exact=False):
+        """
+        Record the remainders of every state along a solution.
+
+        Args:
+            goal (list[int]):  The goal the solution reaches
+            path (PantsPath):  The solution
+            exact (bool):      The solution is a shortest one, and so are all of its remainders
+
+        Returns:
+            The number of states whose remainder was new or improved.
+        """
+        goal_key = pack(0, goal)
+        remainders = self.remainders(goal)
+
+        # A state visited twice keeps its shorter remainder
+        rows = {}
+        moves = path.moves
+        for distance, state in enumerate(reversed(path.states)):
+            key = state.key
+            if key not in rows:
+                rows[key] = (distance, moves[-distance] if distance else None)
+
+        improved = 0
+        with self.connection:
+            for key, (distance, move) in rows.items():
+                known = remainders.get(key)
+                if known is not None and (known[0] < distance or known[0] == distance and known[2] >= exact):
+                    continue
+                self.connection.execute(UPSERT, (goal_key, key, distance, move, int(exact)))
+                remainders[key] = (distance, move, exact)
+                improved += 1
+        return improved
+
+    def solution(self, initial, goal):
+        """
+        The best known solution of a problem, as a PantsPath, or None if it is not known.
+        """
+        start = PantsState(0, initial)
+        moves = self.suffix(goal, start)
+        return None if moves is None else PantsPath.from_moves(start, moves)
+
+    def attach(self, solver, exact=False):
+        """
+        Make a PantsSolver (or a subclass) use and update the store.
+
+        Like pants.stats.SolverStats, this replaces methods of the one solver
+        object.  Every path added to the working set whose state has a known
+        remainder is completed with it, so the goal is reached as soon as the
+        search touches any state of an earlier solution.  The path itself is
+        dropped - the known remainder cuts the search off there - unless the
+        solver must find a shortest solution and the remainder is not known
+        to be exact.  When the solver is solved, its solution is recorded.
+
+        The working set is replaced, so a SolverStats must be attached after the store.
+
+        Args:
+            solver (PantsSolver):  The solver, before it is solved
+            exact (bool):          The solver only finds shortest solutions
+        """
+        goal = solver.goal
+        remainders = self.remainders(goal)
+        add_path = solver.add_path
+
+        def complete(path):
+            # Returns True when the path was completed, and need not be searched any further
+            remainder = remainders.get(path.last_state.key)
+            if remainder is None or not remainder[0]:
+                return False
+            moves = self.suffix(goal, path.last_state)
+            if moves is None:
+                return False
+
+            # Macro searches (see pants.macros) are completed one move at a time
+            if hasattr(path, 'expand'):
+                path = path.expand()
+            add_path(path.extend(moves))
+            return remainder[2] or not exact
+
+        def stored_add_path(path):
+            if not complete(path):
+                add_path(path)
+        solver.add_path = stored_add_path
+
+        # The paths already queued (the initial state) may have remainders too
+        entries = solver.working_set.ordered()
+        solver.working_set = type(solver.working_set)(solver.working_set.tie_break)
+        for priority, path in entries:
+            if not complete(path):
+                solver.working_set.push(priority, path)
+
+        solve, iter_solve = solver.solve, solver.iter_solve
+
+        def stored_solve(*args, **kwargs):
+            solve(*args, **kwargs)
+            if solver.solved:
+                self.record(goal, solver.solution, exact)
+
+        def stored_iter_solve(*args, **kwargs):
+            for snapshot in iter_solve(*args, **kwargs):
+                if solver.solved:
+                    self.record(goal, solver.solution, exact)
+                yield snapshot
+        solver.solve, solver.iter_solve = stored_solve, stored_iter_solve
@@ -0,0 +1,106 @@
+from pants.state import PantsState, MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+
+# The move a mirror image makes for each move
+MIRRORED = (MOVE_POINTER_RIGHT, MOVE_POINTER_LEFT, SWAP_RIGHT, SWAP_LEFT)
+
+
+def parity(initial, goal):
+    """
+    The parity of the permutation taking `initial` to `goal`.
+
+    A swap changes both the parity of the permutation and of the pointer, and
+    moving the pointer by two changes neither, so every state reachable from
+    `initial` (pointer 0) has a pointer of this parity when its permutation
+    is `goal`.
+
+    Returns:
+        0 or 1, or None if `goal` is not a permutation of `initial`.
+    """
+    if sorted(initial) != sorted(goal) or len(set(goal)) != len(goal):
+        return None
+
+    position = {value: index for index, value in enumerate(initial)}
+    permutation = [position[value] for value in goal]
+    seen = [False] * len(permutation)
+    cycles = 0
+    for start in range(len(permutation)):
+        if not seen[start]:
+            cycles += 1
+            index = start
+            while not seen[index]:
+                seen[index] = True
+                index = permutation[index]
+
+    return (len(permutation) - cycles) % 2
+
+
+def mirror(goal):
+    """
+    The Mirror of a problem, or None if it would never find a duplicate.
+
+    The mirror image of a state has the same permutation parity, but its
+    pointer parity changes when the size is even - so for even sizes a
+    state's image is never reachable from the same initial state (see
+    `parity`), and only odd sizes benefit from the symmetry.  The relabelling
+    needs every value of the goal to be distinct, so goals with repeated
+    values have no Mirror either.
+    """
+    if len(goal) % 2 == 0 or len(set(goal)) != len(goal):
+        return None
+    return Mirror(goal)
+
+
+class Mirror:
+    """
+    The mirror symmetry of a Pants Problem.
+
+    Reversing the state list, reflecting the pointer (position `p` becomes
+    `size - 1 - p`) and relabelling each value with the value at the mirrored
+    position of the goal maps the goal onto itself, and every move onto its
+    mirror image (left and right exchanged).  So a state and its image are
+    exactly as many moves from the goal, and a search only needs to visit one
+    of them:  `key` gives both the same key.
+    """
+
+    def __init__(self, goal):
+        """
+        Initialization method for Mirror
+
+        Args:
+            goal (list[int]):  The goal state of the problem
+        """
+        self.size = len(goal)
+        position = {value: index for index, value in enumerate(goal)}
+        self.relabel = {value: goal[self.size - 1 - position[value]] for value in goal}
+
+        # Byte packed keys are mirrored with a translation table (see pants.state.pack)
+        table = list(range(256))
+        for value, image in self.relabel.items():
+            if 0 <= value < 256 and 0 <= image < 256:
+                table[value] = image
+        self.table = bytes(table)
+
+    def image(self, pants_state):
+        """
+        The mirror image of a PantsState.
+        """
+        relabel = self.relabel
+        return PantsState(self.size - 1 - pants_state.pointer, [relabel[value] for value in reversed(pants_state.state)])
+
+    def key(self, pants_state):
+        """
+        A key shared by a PantsState and its mirror image - the smaller of their keys.
+        """
+        key = pants_state.key
+        if key[0] != 255:
+            image = bytes([self.size - 1 - key[0]]) + key[:0:-1].translate(self.table)
+        else:
+            image = self.image(pants_state).key
+        return image if image < key else key
+
+    @staticmethod
+    def moves(moves):
+        """
+        The moves that take a state's mirror image where `moves` take the state.
+        """
+        return [MIRRORED[move] for move in moves]
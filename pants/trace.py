@@ -0,0 +1,389 @@
+import argparse
+import mmap
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+MAGIC = b'PTR1'
+HEADER = struct.Struct('<4sI')
+
+# kind, move, depth, score, node, parent, state
+RECORD = struct.Struct('<BBIfQQQ')
+PUSH, EXPAND, GOAL = range(3)
+NONE = 0xffffffff
+NO_MOVE = 0xff
+# Larger scores (e.g. TrimmedBF's) are recorded as the largest 32-bit float
+FLOAT_MAX = struct.unpack('<f', b'\xff\xff\x7f\x7f')[0]
+NAN = float('nan')
+MASK = 0xffffffffffffffff
+
+
+class SearchTrace:
+    """
+    Records a PantsSolver's (or a subclass's) search to a binary file.
+
+    Like pants.stats.SolverStats, creating a SearchTrace replaces methods of
+    that one solver object, so solvers that are not traced pay nothing.
+
+    A fixed width record (see RECORD) is appended for each path pushed onto
+    the working set, each expansion, and the goal when it is expanded:  the
+    kind of record, the move that led to the path, its depth and heuristic
+    score, the identities (`id`) of the path and of its parent, and for
+    expansions a 64-bit hash of its state (mirror images share one with
+    `symmetry`).  Nothing is kept per path while tracing - `analyze` numbers
+    the paths afterwards, as an identity only belongs to one path between
+    its push and the next push with the same identity.
+
+    Records are packed into a preallocated buffer, which is written out
+    whenever it is full.  See `analyze` for reading a trace back.
+    """
+
+    def __init__(self, solver, filename, buffer_records=1 << 15):
+        """
+        Initialization method for SearchTrace
+
+        Args:
+            solver (PantsSolver):  The solver to trace, before it is solved
+            filename (str):        The trace file, overwritten if it exists
+            buffer_records (int):  The number of records written at once
+        """
+        self.solver = solver
+        self.filename = filename
+        self.file = open(filename, 'wb', buffering=0)
+        self.file.write(HEADER.pack(MAGIC, RECORD.size))
+
+        self.buffer = bytearray(RECORD.size * buffer_records)
+        self.offset = 0
+        self.expanded = None
+        self.goal = None
+        self.working_set = None
+
+        # The paths already queued (the initial state) are recorded first
+        for _, path in solver.working_set.ordered():
+            self.record(PUSH, path)
+        self.attach()
+
+    def record(self, kind, path, depth=None):
+        """
+        Append a record for a path, outside the search's own loop.
+        """
+        parent, score = path.parent, path.score
+        RECORD.pack_into(self.buffer, self.offset, kind, NO_MOVE if path.move is None else path.move,
+                         path.depth if depth is None else depth,
+                         NAN if score is None else score if score < FLOAT_MAX else FLOAT_MAX,
+                         id(path), 0 if parent is None else id(parent), 0)
+        self.advance()
+
+    def advance(self):
+        """
+        Move past the record just packed, writing out the buffer when it is full.
+        """
+        self.offset += RECORD.size
+        if self.offset == len(self.buffer):
+            self.file.write(self.buffer)
+            self.offset = 0
+
+    def attach(self):
+        """
+        Replace the solver's methods with the recording ones.
+        """
+        solver = self.solver
+        close, iterate, key, pack_into = solver.close, solver.iterate, solver.key, RECORD.pack_into
+        buffer, size, limit = self.buffer, RECORD.size, len(self.buffer)
+
+        def traced_close(path):
+            if not close(path):
+                return False
+            self.expanded = path
+            parent, score, move = path.parent, path.score, path.move
+            offset = self.offset
+            pack_into(buffer, offset, EXPAND, NO_MOVE if move is None else move, path.depth,
+                      NAN if score is None else score if score < FLOAT_MAX else FLOAT_MAX,
+                      id(path), 0 if parent is None else id(parent), hash(key(path)) & MASK)
+            offset += size
+            if offset == limit:
+                self.file.write(buffer)
+                offset = 0
+            self.offset = offset
+            return True
+        solver.close = traced_close
+
+        def traced_iterate():
+            iterate()
+            if solver.solution is not None and solver.solution is not self.goal:
+                self.goal = solver.solution
+                self.record_goal()
+
+            # Some solvers replace their working set (e.g. AnytimeSolver between weights)
+            if solver.working_set is not self.working_set:
+                self.attach_working_set()
+        solver.iterate = traced_iterate
+
+        self.attach_working_set()
+
+    def attach_working_set(self):
+        """
+        Record every push onto the solver's current working set.
+        """
+        working_set = self.working_set = self.solver.working_set
+        push, pack_into = working_set.push, RECORD.pack_into
+        buffer, size, limit = self.buffer, RECORD.size, len(self.buffer)
+
+        def traced_push(priority, path):
+            push(priority, path)
+            parent, score, move = path.parent, path.score, path.move
+            offset = self.offset
+            pack_into(buffer, offset, PUSH, NO_MOVE if move is None else move, path.depth,
+                      NAN if score is None else score if score < FLOAT_MAX else FLOAT_MAX,
+                      id(path), 0 if parent is None else id(parent), 0)
+            offset += size
+            if offset == limit:
+                self.file.write(buffer)
+                offset = 0
+            self.offset = offset
+        working_set.push = traced_push
+
+    def record_goal(self):
+        """
+        Append a record for a new solution.
+
+        Some solvers rebuild the solution from the path they expanded (e.g.
+        pants.macros.MacroSolver), so it is recorded as that path.
+        """
+        solution, expanded = self.goal, self.expanded
+        if expanded is not None and expanded.last_state == solution.last_state:
+            path = expanded
+        else:
+            path = solution
+        self.record(GOAL, path, solution.depth)
+
+    def close(self):
+        """
+        Write out the buffer, and close the trace file.
+        """
+        if not self.file.closed:
+            self.file.write(self.buffer[:self.offset])
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load(filename):
+    """
+    Memory-map a trace written by a SearchTrace.
+
+    Returns:
+        A NumPy record array with the fields 'kind', 'move', 'depth',
+        'score', 'node', 'parent' and 'state', backed by the file.  The
+        'node' and 'parent' fields are identities - see `number`.
+    """
+    if numpy is None:
+        raise RuntimeError('Analyzing a trace needs NumPy')
+
+    with open(filename, 'rb') as source:
+        magic, size = HEADER.unpack(source.read(HEADER.size))
+        if magic != MAGIC or size != RECORD.size:
+            raise ValueError('{} is not a search trace'.format(filename))
+
+        dtype = numpy.dtype([('kind', '<u1'), ('move', '<u1'), ('depth', '<u4'), ('score', '<f4'),
+                             ('node', '<u8'), ('parent', '<u8'), ('state', '<u8')])
+        length = source.seek(0, 2) - HEADER.size
+        if length < RECORD.size:
+            return numpy.zeros(0, dtype=dtype)
+
+        # The mapping stays open as long as the array refers to it
+        mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    return numpy.frombuffer(mapping, dtype=dtype, count=length // RECORD.size, offset=HEADER.size)
+
+
+def number(records):
+    """
+    Number the paths of a trace in the order they were pushed.
+
+    The identity of a record's path (or parent) belongs to the last path
+    pushed with it before the record - a path keeps its identity for as
+    long as it is alive, and its children and expansion come after its push.
+
+    Returns:
+        A (nodes, parents) tuple of arrays:  the number of each record's
+        path and of its parent, or NONE if it was never pushed.
+    """
+    count = len(records)
+    pushed = numpy.flatnonzero(records['kind'] == PUSH)
+    if not len(pushed):
+        unknown = numpy.full(count, NONE, dtype=numpy.uint32)
+        return unknown, unknown.copy()
+
+    _, dense = numpy.unique(numpy.concatenate([records['node'], records['parent']]), return_inverse=True)
+    dense = dense.astype(numpy.int64).reshape(-1)
+
+    # Pushes sorted by identity, then by position
+    stride = count + 1
+    keys = dense[pushed] * stride + pushed
+    order = numpy.argsort(keys, kind='stable')
+    keys = keys[order]
+
+    def last_push(identities, positions):
+        found = numpy.searchsorted(keys, identities * stride + positions, side='right') - 1
+        clipped = found.clip(0)
+        matches = (found >= 0) & (keys[clipped] // stride == identities)
+        return numpy.where(matches, order[clipped], NONE).astype(numpy.uint32)
+
+    positions = numpy.arange(count, dtype=numpy.int64)
+    return last_push(dense[:count], positions), last_push(dense[count:], positions - 1)
+
+
+def branching_factor(nodes, depth):
+    """
+    The effective branching factor:  the `b` for which a uniform tree of
+    depth `depth` has `nodes` nodes, 1 + b + b^2 + ... + b^depth.
+    """
+    if depth <= 0 or nodes <= depth + 1:
+        return 1.0
+
+    # The last level alone has b^depth nodes
+    low, high = 1.0, float(nodes) ** (1.0 / depth)
+    for _ in range(100):
+        middle = (low + high) / 2
+        if sum(middle ** level for level in range(depth + 1)) > nodes:
+            high = middle
+        else:
+            low = middle
+    return low
+
+
+def analyze(filename, depth_bins=20):
+    """
+    Summarize a trace.
+
+    The report covers:
+    1) The scores of expanded paths by depth, in up to `depth_bins` ranges of depth
+    2) Plateaus:  runs of expansions that did not find a lower score than
+       any before them
+    3) Re-expansions:  expansions of a state that had already been expanded
+    4) Branching:  paths pushed per expansion, and the effective branching
+       factor for the depth of the solution
+    5) The fraction of expansions that were not on the final solution path
+
+    Returns:
+        The report, as a dict.
+    """
+    records = load(filename)
+    nodes, parents = number(records)
+    kinds = records['kind']
+    expansions = records[kinds == EXPAND]
+    pushes = records[kinds == PUSH]
+    goals = numpy.flatnonzero(kinds == GOAL)
+
+    report = {
+        'records': len(records),
+        'pushed': len(pushes),
+        'expanded': len(expansions),
+        'solved': len(goals) > 0,
+    }
+    if not len(expansions):
+        return report
+
+    # Scores by depth
+    depths = expansions['depth'].astype(numpy.int64)
+    scores = expansions['score'].astype(numpy.float64)
+    width = max(1, -(-(int(depths.max()) + 1) // depth_bins))
+    bins = depths // width
+    by_depth = []
+    for index in numpy.unique(bins):
+        selected = scores[bins == index]
+        by_depth.append({
+            'depths': [int(index * width), int(index * width + width - 1)],
+            'expanded': len(selected),
+            'min': float(selected.min()),
+            'mean': float(selected.mean()),
+            'max': float(selected.max()),
+        })
+    report['scores_by_depth'] = by_depth
+
+    # Plateaus end when an expansion beats the lowest score so far
+    best = numpy.minimum.accumulate(scores)
+    improvements = numpy.flatnonzero(scores[1:] < best[:-1]) + 1
+    lengths = numpy.diff(numpy.concatenate([[0], improvements, [len(scores)]]))
+    report['plateaus'] = {
+        'count': len(lengths),
+        'mean': float(lengths.mean()),
+        'longest': int(lengths.max()),
+        'longest_starts_at': int(numpy.concatenate([[0], improvements])[lengths.argmax()]),
+    }
+
+    # Re-expansions
+    _, counts = numpy.unique(expansions['state'], return_counts=True)
+    report['reexpansions'] = {
+        'total': int(len(expansions) - len(counts)),
+        'states': int((counts > 1).sum()),
+        'most': int(counts.max()),
+    }
+
+    # Branching
+    report['branching'] = {'pushed_per_expansion': len(pushes) / len(expansions)}
+
+    # The solution path, from the goal back through the parents
+    if len(goals):
+        goal = goals[-1]
+        depth = int(records['depth'][goal])
+        pushed_parents = parents[kinds == PUSH]
+
+        on_path = []
+        node = int(nodes[goal])
+        while node != NONE and len(on_path) <= depth:
+            on_path.append(node)
+            node = int(pushed_parents[node])
+
+        on = numpy.isin(nodes[kinds == EXPAND], numpy.array(on_path, dtype=numpy.uint32)).sum()
+        report['solution_depth'] = depth
+        report['branching']['effective'] = branching_factor(len(expansions), depth)
+        report['off_path'] = float(1 - on / len(expansions))
+    return report
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Analyze a search trace (written with pants.py --trace).')
+    parser.add_argument('trace', help='The trace file')
+    parser.add_argument('--bins', type=int, default=20, help='The number of depth ranges to report (defaults to 20)')
+
+    args = parser.parse_args()
+    report = analyze(args.trace, args.bins)
+
+    print('Records:  {} ({} pushed, {} expanded)'.format(report['records'], report['pushed'], report['expanded']))
+    if not report['expanded']:
+        return
+    if report['solved']:
+        print('Solution depth:  {}'.format(report['solution_depth']))
+        print('Expansions off the solution path:  {:.1%}'.format(report['off_path']))
+
+    branching = report['branching']
+    print('Pushed per expansion:  {:.2f}'.format(branching['pushed_per_expansion']))
+    if 'effective' in branching:
+        print('Effective branching factor:  {:.4f}'.format(branching['effective']))
+
+    reexpansions = report['reexpansions']
+    print('Re-expansions:  {} ({} states, at most {} times)'.format(
+        reexpansions['total'], reexpansions['states'], reexpansions['most']))
+
+    plateaus = report['plateaus']
+    print('Plateaus:  {} (mean {:.1f} expansions, longest {} from expansion {})'.format(
+        plateaus['count'], plateaus['mean'], plateaus['longest'], plateaus['longest_starts_at']))
+
+    print('Scores by depth:')
+    print('    {:>13}  {:>9}  {:>9}  {:>9}  {:>9}'.format('depth', 'expanded', 'min', 'mean', 'max'))
+    for row in report['scores_by_depth']:
+        print('    {:>13}  {:>9}  {:>9.2f}  {:>9.2f}  {:>9.2f}'.format(
+            '{}-{}'.format(*row['depths']), row['expanded'], row['min'], row['mean'], row['max']))
+
+
+if __name__ == '__main__':
+    run()
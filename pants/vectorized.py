@@ -0,0 +1,87 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pants.solver import PantsSolver
+from pants.frontier import FIFO
+from pants.heuristics import companion
+
+
+class VectorizedSolver(PantsSolver):
+    """
+    A PantsSolver that expands several PantsPaths at once and scores all of
+    their children with a single NumPy call.
+
+    Each iteration pops the best `batch_size` PantsPaths from the working set,
+    stacks the states of all their children into one 2-D array, and passes it
+    to the heuristic's `score_batch`.  For large sizes this replaces thousands
+    of Python-level score computations with a few array operations.
+
+    Heuristics without `score_batch` (or a missing NumPy) fall back to scoring
+    the children one at a time.  With a `batch_size` of 1 the search is the
+    same as PantsSolver's.
+    """
+
+    def __init__(self, initial, goal, heuristic, batch_size=16, max_iterations=100000,
+                 frontier='auto', tie_break=FIFO, symmetry=False):
+        """
+        Initialization method for VectorizedSolver
+
+        Args:
+            initial (list[int]):  The initial state of the problem
+            goal (list[int]):     The desired goal state of the problem
+            heuristic (object):   An object that implements a 'score' method for evaluating PantsPaths,
+                                  and ideally a 'score_batch' method for scoring arrays of states
+            batch_size (int):     The number of PantsPaths to expand in each iteration
+            max_iterations (int): The maximum number of iterations to evaluate when solving the problem
+            frontier (str):       The working set's priority queue - 'heap', 'bucket', or 'auto'
+            tie_break (str):      The order of paths with equal scores - 'fifo', 'lifo' or 'deepest'
+            symmetry (bool):      Treat mirror image states as duplicates (see pants.symmetry.Mirror)
+        """
+        self.batch_size = batch_size
+        self.score_batch = companion(heuristic, 'score_batch') if numpy is not None else None
+
+        super().__init__(initial, goal, heuristic, max_iterations, frontier, tie_break, symmetry)
+
+    def iterate(self):
+        """
+        Performs a single cycle of the solution algorithm, on a batch of the
+        best PantsPaths.
+        """
+        batch = []
+        while self.working_set and len(batch) < self.batch_size:
+            best = self.pop_best()
+            if not self.close(best):
+                continue
+            self.expanded += 1
+
+            if self.is_goal(best):
+                self.solution = best
+                return
+            batch.append(best)
+
+        children = [child for parent in batch for child in self.expand(parent)
+                    if self.key(child) not in self.closed]
+
+        if self.score_batch is None or not children:
+            for child in children:
+                self.add_path(child)
+            return
+
+        states = numpy.array([child.last_state.state for child in children])
+        pointers = numpy.array([child.last_state.pointer for child in children])
+        scores = self.score_batch(states, pointers).tolist()
+
+        # Added one by one, so anything wrapping add_path (e.g. a SolutionStore) sees every child
+        for child, score in zip(children, scores):
+            child.score = score
+            self.add_path(child)
+
+    def score(self, path):
+        """
+        Score a PantsPath, unless it was already scored as part of a batch.
+        """
+        if path.score is not None:
+            return path.score
+        return super().score(path)
@@ -0,0 +1,11 @@
+from pants.state import PantsState
+
+
+def replay(initial, moves):
+    """
+    The state list reached by applying a series of moves to `initial`, from pointer 0.
+    """
+    state = PantsState(0, initial)
+    for move in moves:
+        state = state.apply(move)
+    return state.state
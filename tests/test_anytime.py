@@ -0,0 +1,68 @@
+import unittest
+
+from pants.anytime import AnytimeSolver
+from pants.astar import AStarSolver
+from pants.heuristics import Distance, EuclideanDistance, KendallTau
+from pants.state import PantsState
+
+
+class AnytimeSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 7))
+        self.goal = list(reversed(self.initial))
+
+    def test_improves_to_optimal(self):
+        optimal = AStarSolver(self.initial, self.goal, KendallTau(self.goal))
+        optimal.solve()
+
+        solver = AnytimeSolver(self.initial, self.goal, KendallTau(self.goal), greedy=Distance(self.goal))
+        solver.solve()
+
+        self.assertTrue(solver.optimal)
+        self.assertEqual(optimal.solution.depth, solver.solution.depth)
+
+        # The first solution comes from the greedy search, and each one after is shorter
+        moves = [improvement['moves'] for improvement in solver.improvements]
+        self.assertEqual(float('inf'), solver.improvements[0]['weight'])
+        self.assertEqual(sorted(moves, reverse=True), moves)
+        self.assertEqual(len(set(moves)), len(moves))
+        self.assertEqual(solver.solution.depth, moves[-1])
+
+        seconds = [improvement['seconds'] for improvement in solver.improvements]
+        self.assertEqual(sorted(seconds), seconds)
+
+        state = PantsState(0, self.initial)
+        for move in solver.solution.moves:
+            state = state.apply(move)
+        self.assertEqual(self.goal, state.state)
+
+    def test_without_greedy(self):
+        solver = AnytimeSolver(self.initial, self.goal, KendallTau(self.goal))
+        solver.solve()
+
+        self.assertTrue(solver.optimal)
+        self.assertEqual(5, solver.improvements[0]['weight'])
+
+    def test_time_limit(self):
+        initial = list(range(1, 20))
+        goal = list(reversed(initial))
+        solver = AnytimeSolver(initial, goal, KendallTau(goal), greedy=EuclideanDistance(goal))
+        solver.solve(time_limit=0)
+
+        self.assertFalse(solver.solved)
+        self.assertEqual(0, solver.iterations)
+
+        # Solving again finds a first solution, and improves it before the time is up
+        solver.solve(time_limit=0.5)
+        self.assertTrue(solver.solved)
+        self.assertFalse(solver.optimal)
+        self.assertLess(solver.solution.depth, solver.improvements[0]['moves'])
+
+    def test_last_weight(self):
+        solver = AnytimeSolver(self.initial, self.goal, KendallTau(self.goal), weights=[3, 2])
+        solver.solve()
+
+        self.assertTrue(solver.finished)
+        self.assertFalse(solver.optimal)
+        self.assertEqual(2, solver.weight)
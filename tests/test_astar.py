@@ -0,0 +1,60 @@
+import unittest
+
+from pants.astar import AStarSolver
+from pants.solver import PantsSolver
+from pants.heuristics import BreadthFirst, KendallTau, Nada
+from pants.frontier import HeapFrontier, BucketFrontier
+
+
+class AStarSolverTest(unittest.TestCase):
+
+    def solve(self, size, heuristic_class, weight=1.0):
+        initial = list(range(1, size + 1))
+        goal = list(reversed(initial))
+        solver = AStarSolver(
+            initial=initial,
+            goal=goal,
+            heuristic=heuristic_class(goal),
+            weight=weight
+        )
+        solver.solve()
+
+        return solver
+
+    def test_admissible_heuristic_is_optimal(self):
+        goal = [6, 5, 4, 3, 2, 1]
+        breadth_first = PantsSolver(
+            initial=[1, 2, 3, 4, 5, 6],
+            goal=goal,
+            heuristic=BreadthFirst(goal)
+        )
+        breadth_first.solve()
+
+        solver = self.solve(6, KendallTau)
+
+        self.assertTrue(solver.solved)
+        self.assertEqual(len(breadth_first.solution.states), len(solver.solution.states))
+        self.assertLess(solver.evaluated, breadth_first.evaluated)
+
+    def test_zero_heuristic_is_uniform_cost(self):
+        solver = self.solve(5, Nada, weight=0)
+
+        self.assertEqual(13, solver.solution.depth)
+
+    def test_weight_trades_length_for_speed(self):
+        optimal = self.solve(7, KendallTau)
+        weighted = self.solve(7, KendallTau, weight=2)
+
+        self.assertTrue(weighted.solved)
+        self.assertLessEqual(optimal.solution.depth, weighted.solution.depth)
+        self.assertLess(weighted.evaluated, optimal.evaluated)
+
+    def test_costs_track_cheapest_path(self):
+        solver = self.solve(5, KendallTau)
+
+        for path in [solver.solution] + [path for _, path in solver.working_set]:
+            self.assertLessEqual(solver.costs[path.last_state.key], path.depth)
+
+    def test_fractional_weight_uses_heap(self):
+        self.assertIsInstance(self.solve(5, KendallTau, weight=1.5).working_set, HeapFrontier)
+        self.assertIsInstance(self.solve(5, KendallTau, weight=2.0).working_set, BucketFrontier)
@@ -0,0 +1,65 @@
+import unittest
+
+from pants.benchmark import compare, heuristic_names, results_table, run_case
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline = [
+            {'heuristic': 'Distance', 'size': 5, 'solved': True, 'moves': 13, 'evaluated': 44, 'expanded': 20,
+             'seconds': 0.01},
+            {'heuristic': 'Distance', 'size': 6, 'solved': True, 'moves': 24, 'evaluated': 94, 'expanded': 40,
+             'seconds': 0.01},
+        ]
+
+    def test_heuristic_names(self):
+        names = heuristic_names()
+
+        self.assertEqual('BreadthFirst', names[0])
+        self.assertIn('Distance', names)
+        self.assertNotIn('PatternDatabase', names)
+
+    def test_run_case(self):
+        result = run_case('Distance', 5)
+
+        self.assertTrue(result['solved'])
+        self.assertEqual(14, result['moves'])
+        self.assertGreater(result['evaluated'], result['expanded'])
+        self.assertGreater(result['peak_rss_kb'], 0)
+
+    def test_traced_case(self):
+        plain = run_case('Distance', 6)
+        traced = run_case('Distance', 6, trace=True)
+
+        self.assertEqual(plain['moves'], traced['moves'])
+        self.assertEqual(plain['evaluated'], traced['evaluated'])
+
+    def test_unsolved_case(self):
+        result = run_case('BreadthFirst', 8, max_iterations=100)
+
+        self.assertFalse(result['solved'])
+        self.assertLessEqual(result['expanded'], 100)
+
+    def test_compare(self):
+        results = [
+            dict(self.baseline[0], evaluated=50, seconds=0.5),
+            dict(self.baseline[1], solved=False, moves=None),
+        ]
+        regressions = compare(results, self.baseline)
+
+        self.assertEqual([('evaluated', 5), ('seconds', 5), ('solved', 6)],
+                         [(regression['metric'], regression['size']) for regression in regressions])
+        self.assertEqual([], compare(self.baseline, self.baseline))
+
+    def test_results_table(self):
+        table = results_table(self.baseline, 'Distance')
+
+        self.assertEqual([
+            'RESULTS:',
+            '------------',
+            'Max Size: 6',
+            'Size :              5   6',
+            'Moves:              13  24',
+            'Nodes Evaluated :   44  94',
+        ], table.splitlines())
@@ -0,0 +1,55 @@
+import unittest
+
+from pants.bidirectional import BidirectionalSolver
+from pants.solver import PantsSolver
+from pants.heuristics import BreadthFirst
+from pants.state import PantsState
+
+
+class BidirectionalSolverTest(unittest.TestCase):
+
+    def test_backward_search_starts_at_every_reachable_pointer(self):
+        solver = BidirectionalSolver([1, 2, 3, 4, 5], [5, 4, 3, 2, 1])
+
+        # Reversing 5 values is an even permutation, so only even pointers can be reached
+        self.assertEqual(1, len(solver.forward_frontier))
+        self.assertEqual([0, 2, 4], [path.last_state.pointer for path in solver.backward_frontier])
+        self.assertEqual(4, solver.evaluated)
+
+        # The goal with the pointer at 0 is the mirror image of the goal with the pointer at 4
+        solver = BidirectionalSolver([1, 2, 3, 4, 5], [5, 4, 3, 2, 1], symmetry=True)
+        self.assertEqual(2, len(solver.backward_frontier))
+
+    def test_solution_matches_breadth_first(self):
+        for size in range(3, 7):
+            initial = list(range(1, size + 1))
+            goal = list(reversed(initial))
+
+            breadth_first = PantsSolver(initial, goal, BreadthFirst(goal))
+            breadth_first.solve()
+
+            solver = BidirectionalSolver(initial, goal)
+            solver.solve()
+
+            self.assertEqual(breadth_first.solution.depth, solver.solution.depth)
+            if size >= 5:
+                self.assertLess(solver.evaluated, breadth_first.evaluated)
+
+    def test_spliced_solution_is_valid(self):
+        solver = BidirectionalSolver([1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1])
+        solver.solve()
+
+        states = solver.solution.states
+        self.assertEqual(PantsState(0, [1, 2, 3, 4, 5, 6]), states[0])
+        self.assertEqual([6, 5, 4, 3, 2, 1], states[-1].state)
+
+        node = solver.solution
+        while node.parent is not None:
+            self.assertEqual(node.last_state, node.parent.last_state.apply(node.move))
+            node = node.parent
+
+    def test_already_solved(self):
+        solver = BidirectionalSolver([2, 1], [2, 1])
+        solver.solve()
+
+        self.assertEqual(0, solver.solution.depth)
@@ -0,0 +1,141 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from pants.bounded import BeamSolver, BoundedSolver, node_bytes
+from pants.heuristics import Distance, EuclideanDistance
+from pants.path import PantsPath
+from pants.solver import PantsSolver
+from tests.helpers import replay
+
+
+class BeamSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 20))
+        self.goal = list(reversed(self.initial))
+
+    def test_solve(self):
+        solver = BeamSolver(self.initial, self.goal, EuclideanDistance(self.goal), width=10)
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertEqual(self.goal, replay(self.initial, solver.solution.moves))
+
+    def test_width_one_is_greedy(self):
+        goal = list(reversed(range(1, 7)))
+        solver = BeamSolver(list(range(1, 7)), goal, EuclideanDistance(goal), width=1)
+        solver.solve()
+
+        # Every layer keeps one path, which is expanded once
+        self.assertTrue(solver.solved)
+        self.assertEqual(solver.solution.depth, solver.expanded)
+
+    def test_max_iterations(self):
+        solver = BeamSolver(self.initial, self.goal, Distance(self.goal), width=50, max_iterations=100)
+        solver.solve()
+
+        self.assertFalse(solver.solved)
+        self.assertLessEqual(solver.expanded, 100 + 50)
+
+
+class BoundedSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 20))
+        self.goal = list(reversed(self.initial))
+
+    def test_unbounded_matches_best_first(self):
+        plain = PantsSolver(self.initial, self.goal, EuclideanDistance(self.goal))
+        plain.solve()
+
+        solver = BoundedSolver(self.initial, self.goal, EuclideanDistance(self.goal), max_nodes=10 ** 6)
+        solver.solve()
+
+        self.assertEqual(plain.solution.moves, solver.solution.moves)
+        self.assertEqual(plain.evaluated, solver.evaluated)
+        self.assertEqual(0, solver.evictions)
+
+    def test_bounded(self):
+        solver = BoundedSolver(self.initial, self.goal, EuclideanDistance(self.goal), max_nodes=100)
+
+        peak = 0
+        push = solver.working_set.push
+
+        def counted_push(priority, path):
+            nonlocal peak
+            push(priority, path)
+            peak = max(peak, len(solver.working_set))
+        solver.working_set.push = counted_push
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertEqual(self.goal, replay(self.initial, solver.solution.moves))
+        self.assertGreater(solver.evictions, 0)
+        # The working set is evicted as soon as it passes the budget
+        self.assertLessEqual(peak, 101)
+        self.assertLessEqual(len(solver.closed), 100)
+
+    def test_evict_backs_up_to_parents(self):
+        solver = BoundedSolver(self.initial, self.goal, Distance(self.goal), max_nodes=1000)
+        for _ in range(20):
+            solver.iterate()
+        entries = solver.working_set.ordered()
+        evicted = entries[len(entries) - len(entries) // 4:]
+
+        solver.evict()
+
+        # Fewer paths are kept, the best is still first, and each evicted
+        # path has an ancestor back in the working set to regenerate it
+        after = solver.working_set.ordered()
+        self.assertLess(len(after), len(entries))
+        self.assertIs(entries[0][1], after[0][1])
+        ancestors = {id(path) for _, path in after}
+        for _, path in evicted:
+            node = path.parent
+            while id(node) not in ancestors:
+                node = node.parent
+            self.assertIsInstance(node, PantsPath)
+            self.assertNotIn(node.last_state.key, solver.closed)
+
+    def test_max_bytes(self):
+        solver = BoundedSolver(self.initial, self.goal, Distance(self.goal), max_bytes=1000 * node_bytes(19))
+        self.assertEqual(1000, solver.max_nodes)
+
+        with self.assertRaises(ValueError):
+            BoundedSolver(self.initial, self.goal, Distance(self.goal))
+        with self.assertRaises(ValueError):
+            BoundedSolver(self.initial, self.goal, Distance(self.goal), max_nodes=2)
+
+    def test_resume(self):
+        solver = BoundedSolver(self.initial, self.goal, Distance(self.goal), max_nodes=500, max_iterations=300)
+        solver.solve()
+
+        directory = tempfile.mkdtemp()
+        filename = os.path.join(directory, 'search.ckpt')
+        try:
+            solver.checkpoint(filename)
+            resumed = BoundedSolver.resume(filename, Distance(self.goal), max_nodes=500)
+        finally:
+            os.unlink(filename)
+            os.rmdir(directory)
+
+        self.assertIsInstance(resumed.closed, dict)
+        self.assertEqual(set(solver.closed), set(resumed.closed))
+        self.assertEqual(len(solver.working_set), len(resumed.working_set))
+
+    def test_resume_from_command_line(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'search.ckpt')
+            command = [sys.executable, 'pants.py', '--size=13', '--heuristic=Distance', '--algorithm=bounded',
+                       '--max-nodes=5000']
+            subprocess.run(command + ['--checkpoint=' + filename, '--checkpoint-every=100'], check=True,
+                           capture_output=True, cwd=root)
+            output = subprocess.run(command + ['--resume=' + filename], check=True, capture_output=True, text=True,
+                                    cwd=root).stdout
+
+        self.assertIn('Resumed:', output)
+        self.assertIn('5000 nodes', output)
@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from pants.astar import AStarSolver
+from pants.frontier import DEEPEST, LIFO
+from pants.heuristics import Distance, EuclideanDistance, KendallTau, TrimmedDistance
+from pants.solver import PantsSolver
+from pants.vectorized import numpy
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'search.ckpt')
+        self.initial = list(range(1, 13))
+        self.goal = list(reversed(self.initial))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertResumesExactly(self, cls, heuristic, iterations=200, **kwargs):
+        uninterrupted = cls(self.initial, self.goal, heuristic, **kwargs)
+        uninterrupted.solve()
+
+        solver = cls(self.initial, self.goal, heuristic, **kwargs)
+        list(solver.iter_solve(every=50, iterations=iterations))
+        solver.checkpoint(self.filename)
+
+        weight = {'weight': kwargs['weight']} if 'weight' in kwargs else {}
+        resumed = cls.resume(self.filename, heuristic, **weight)
+        self.assertEqual(iterations, resumed.iterations)
+        self.assertEqual(solver.evaluated, resumed.evaluated)
+        self.assertEqual(solver.closed, resumed.closed)
+
+        list(resumed.iter_solve())
+        self.assertEqual(uninterrupted.solution.moves, resumed.solution.moves)
+        self.assertEqual(uninterrupted.evaluated, resumed.evaluated)
+        self.assertEqual(uninterrupted.expanded, resumed.expanded)
+
+    def test_resume_best_first(self):
+        self.assertResumesExactly(PantsSolver, Distance(self.goal))
+
+    def test_resume_tie_breaks(self):
+        self.assertResumesExactly(PantsSolver, Distance(self.goal), 50, tie_break=LIFO, frontier='heap')
+        self.assertResumesExactly(PantsSolver, Distance(self.goal), 50, tie_break=DEEPEST)
+
+    def test_resume_float_scores(self):
+        self.assertResumesExactly(PantsSolver, EuclideanDistance(self.goal), iterations=20)
+
+    def test_resume_large_scores(self):
+        # TrimmedDistance scores a revisit as 17**17, which does not fit in 64 bits
+        self.initial = list(range(1, 18))
+        self.goal = list(reversed(self.initial))
+        heuristic = TrimmedDistance(self.goal)
+        solver = PantsSolver(self.initial, self.goal, heuristic)
+        list(solver.iter_solve(iterations=30))
+        self.assertGreater(max(path.score for _, path in solver.working_set), 1 << 63)
+        solver.checkpoint(self.filename)
+
+        resumed = PantsSolver.resume(self.filename, heuristic)
+        self.assertEqual([score for score, _ in solver.working_set.ordered()],
+                         [score for score, _ in resumed.working_set.ordered()])
+        for _ in range(30):
+            solver.iterate()
+            resumed.iterate()
+        self.assertEqual(solver.evaluated, resumed.evaluated)
+        self.assertEqual(solver.closed, resumed.closed)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_integer_scores(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        list(solver.iter_solve(iterations=20))
+        for _, path in solver.working_set:
+            path.score = numpy.int64(path.score)
+        solver.checkpoint(self.filename)
+
+        resumed = PantsSolver.resume(self.filename, Distance(self.goal))
+        self.assertTrue(all(type(score) is int for score, _ in resumed.working_set.ordered()))
+        self.assertEqual([score for score, _ in solver.working_set.ordered()],
+                         [score for score, _ in resumed.working_set.ordered()])
+
+    def test_resume_astar(self):
+        self.initial = list(range(1, 7))
+        self.goal = list(reversed(self.initial))
+        self.assertResumesExactly(AStarSolver, KendallTau(self.goal), weight=1)
+
+    def test_resume_solved(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        solver.solve()
+        solver.checkpoint(self.filename)
+
+        resumed = PantsSolver.resume(self.filename, Distance(self.goal))
+        self.assertTrue(resumed.solved)
+        self.assertEqual(solver.solution.moves, resumed.solution.moves)
+
+    def test_resume_wrong_solver(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        solver.checkpoint(self.filename)
+
+        with self.assertRaises(ValueError):
+            AStarSolver.resume(self.filename, Distance(self.goal))
+
+    def test_not_a_checkpoint(self):
+        with open(self.filename, 'wb') as output:
+            output.write(b'PDB1' + bytes(20))
+
+        with self.assertRaises(ValueError):
+            PantsSolver.resume(self.filename, Distance(self.goal))
+
+    def test_resume_in_new_process(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        list(solver.iter_solve(iterations=100))
+        solver.checkpoint(self.filename)
+
+        script = ('import sys; from pants.solver import PantsSolver; from pants.heuristics import Distance\n'
+                  'solver = PantsSolver.resume(sys.argv[1], Distance(list(range(12, 0, -1))))\n'
+                  'solver.solve(); print(solver.solution.depth, solver.evaluated)')
+        output = subprocess.run([sys.executable, '-c', script, self.filename], check=True, capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+
+        uninterrupted = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        uninterrupted.solve()
+        self.assertEqual('{} {}'.format(uninterrupted.solution.depth, uninterrupted.evaluated), output.strip())
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from pants.constructive import ConstructiveSolver
+from pants.oracle import OracleSolver
+from pants.state import PantsState
+
+
+class ConstructiveSolverTest(unittest.TestCase):
+
+    def apply(self, initial, moves):
+        state = PantsState(0, initial)
+        for move in moves:
+            state = state.apply(move)
+            self.assertIsNotNone(state)
+        return state.state
+
+    def test_reverses(self):
+        for size in range(1, 12):
+            initial = list(range(1, size + 1))
+            goal = list(reversed(initial))
+            solver = ConstructiveSolver(initial, goal)
+            self.assertEqual(goal, self.apply(initial, solver.moves()))
+
+    def test_random_permutations(self):
+        rng = random.Random(0)
+        for size in range(2, 10):
+            for _ in range(50):
+                initial = list(range(1, size + 1))
+                goal = initial[:]
+                rng.shuffle(initial)
+                rng.shuffle(goal)
+                solver = ConstructiveSolver(initial, goal)
+                self.assertEqual(goal, self.apply(initial, solver.moves()))
+
+    def test_close_to_optimal(self):
+        initial = list(range(1, 8))
+        goal = list(reversed(initial))
+        oracle = OracleSolver(initial, goal)
+        oracle.solve()
+
+        solver = ConstructiveSolver(initial, goal)
+        path = solver.path()
+        self.assertTrue(solver.solved)
+        self.assertEqual(goal, path.last_state.state)
+        self.assertLessEqual(oracle.solution.depth, path.depth)
+        self.assertLessEqual(path.depth, 1.5 * oracle.solution.depth)
+
+    def test_large(self):
+        initial = list(range(1, 1001))
+        goal = list(reversed(initial))
+        solver = ConstructiveSolver(initial, goal)
+        solver.solve()
+
+        # Every pair is inverted, and each swap fixes one of them
+        inversions = len(initial) * (len(initial) - 1) // 2
+        self.assertGreaterEqual(solver.length, inversions)
+        self.assertLessEqual(solver.length, 1.1 * inversions)
+        self.assertEqual(solver.length, sum(count for _, count in solver.runs()))
+
+    def test_not_a_permutation(self):
+        with self.assertRaises(ValueError):
+            ConstructiveSolver([1, 2, 3], [1, 2, 4])
@@ -0,0 +1,107 @@
+import unittest
+
+from pants.frontier import HeapFrontier, BucketFrontier, make_frontier, FIFO, LIFO, DEEPEST
+from pants.path import PantsPath
+from pants.state import PantsState
+from pants.heuristics import Distance, EuclideanDistance
+
+
+def make_paths():
+    """
+    Three paths of depths 0, 2 and 1.
+    """
+    root = PantsPath([PantsState(0, [1, 2, 3])])
+    child = PantsPath([PantsState(1, [2, 1, 3])], root)
+    grandchild = PantsPath([PantsState(2, [2, 3, 1])], child)
+    return [root, grandchild, child]
+
+
+class FrontierTestMixin:
+
+    def pop_all(self, frontier):
+        return [frontier.pop() for _ in range(len(frontier))]
+
+    def test_lowest_priority_first(self):
+        frontier = self.frontier_class()
+        paths = make_paths()
+        for priority, path in zip([3, 1, 2], paths):
+            frontier.push(priority, path)
+
+        self.assertEqual(3, len(frontier))
+        self.assertEqual([(1, paths[1]), (2, paths[2]), (3, paths[0])], self.pop_all(frontier))
+        self.assertEqual(0, len(frontier))
+
+    def test_fifo(self):
+        frontier = self.frontier_class(FIFO)
+        paths = make_paths()
+        for path in paths:
+            frontier.push(1, path)
+
+        self.assertEqual([(1, path) for path in paths], self.pop_all(frontier))
+
+    def test_lifo(self):
+        frontier = self.frontier_class(LIFO)
+        paths = make_paths()
+        for path in paths:
+            frontier.push(1, path)
+
+        self.assertEqual([(1, path) for path in reversed(paths)], self.pop_all(frontier))
+
+    def test_deepest(self):
+        frontier = self.frontier_class(DEEPEST)
+        paths = make_paths()
+        for path in paths:
+            frontier.push(1, path)
+        frontier.push(0, paths[0])
+
+        self.assertEqual([(0, paths[0]), (1, paths[1]), (1, paths[2]), (1, paths[0])], self.pop_all(frontier))
+
+    def test_iterate(self):
+        for tie_break in (FIFO, LIFO, DEEPEST):
+            frontier = self.frontier_class(tie_break)
+            paths = make_paths()
+            for priority, path in zip([3, 1, 3], paths):
+                frontier.push(priority, path)
+
+            self.assertCountEqual([3, 1, 3], [priority for priority, _ in frontier])
+            self.assertCountEqual([path.depth for path in paths], [path.depth for _, path in frontier])
+
+    def test_ordered_recreates_frontier(self):
+        for tie_break in (FIFO, LIFO, DEEPEST):
+            frontier = self.frontier_class(tie_break)
+            paths = make_paths() + make_paths()
+            for priority, path in zip([3, 1, 3, 1, 3, 2], paths):
+                frontier.push(priority, path)
+
+            copy = self.frontier_class(tie_break)
+            for priority, path in frontier.ordered():
+                copy.push(priority, path)
+
+            self.assertEqual([(priority, id(path)) for priority, path in self.pop_all(frontier)],
+                             [(priority, id(path)) for priority, path in self.pop_all(copy)])
+
+    def test_unknown_tie_break(self):
+        with self.assertRaises(ValueError):
+            self.frontier_class('random')
+
+
+class HeapFrontierTest(FrontierTestMixin, unittest.TestCase):
+    frontier_class = HeapFrontier
+
+
+class BucketFrontierTest(FrontierTestMixin, unittest.TestCase):
+    frontier_class = BucketFrontier
+
+
+class MakeFrontierTest(unittest.TestCase):
+
+    def test_auto(self):
+        self.assertIsInstance(make_frontier('auto', FIFO, Distance([2, 1])), BucketFrontier)
+        self.assertIsInstance(make_frontier('auto', FIFO, EuclideanDistance([2, 1])), HeapFrontier)
+
+    def test_explicit(self):
+        self.assertIsInstance(make_frontier('heap', LIFO, Distance([2, 1])), HeapFrontier)
+        self.assertIsInstance(make_frontier('bucket', LIFO, EuclideanDistance([2, 1])), BucketFrontier)
+
+        with self.assertRaises(ValueError):
+            make_frontier('stack', FIFO, Distance([2, 1]))
@@ -0,0 +1,53 @@
+import unittest
+
+from pants.hda import HDASolver, owner
+from pants.heuristics import BreadthFirst, Distance, Inversions
+from pants.state import PantsState
+
+
+class HDASolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 9))
+        self.goal = list(reversed(self.initial))
+
+    def assertSolves(self, solver, initial, goal):
+        self.assertTrue(solver.solved)
+        self.assertEqual(PantsState(0, initial), solver.solution.states[0])
+        self.assertEqual(goal, solver.solution.last_state.state)
+
+    def test_owner(self):
+        key = PantsState(0, self.initial).key
+        self.assertEqual(owner(key, 3), owner(key, 3))
+        self.assertIn(owner(key, 3), range(3))
+
+    def test_solve(self):
+        for workers in (1, 3):
+            solver = HDASolver(self.initial, self.goal, Distance, workers=workers)
+            solver.solve()
+
+            self.assertSolves(solver, self.initial, self.goal)
+            self.assertEqual(workers, len(solver.worker_stats))
+            self.assertEqual(solver.expanded, sum(stats['expanded'] for stats in solver.worker_stats))
+            self.assertGreaterEqual(solver.load_balance, 1.0)
+
+    def test_initial_is_goal(self):
+        solver = HDASolver(self.goal, self.goal, Inversions, workers=2)
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertEqual([], solver.solution.moves)
+
+    def test_breadth_first_is_shortest(self):
+        solver = HDASolver([1, 2, 3, 4], [4, 3, 2, 1], BreadthFirst, workers=2, weight=0)
+        solver.solve()
+
+        self.assertSolves(solver, [1, 2, 3, 4], [4, 3, 2, 1])
+        self.assertEqual(8, solver.solution.depth)
+
+    def test_max_iterations(self):
+        solver = HDASolver(self.initial, self.goal, BreadthFirst, workers=2, max_iterations=10)
+        solver.solve()
+
+        self.assertFalse(solver.solved)
+        self.assertLessEqual(solver.expanded, 10)
@@ -0,0 +1,64 @@
+import random
+import unittest
+
+from pants.state import PantsState
+from pants.path import PantsPath
+from pants import heuristics
+
+
+class IncrementalScoreTest(unittest.TestCase):
+
+    def assertIncrementalMatchesFull(self, heuristic_class, size=9, steps=200):
+        goal = list(range(size, 0, -1))
+        heuristic = heuristic_class(goal)
+        rng = random.Random(size)
+
+        path = PantsPath([PantsState(0, list(range(1, size + 1)))])
+        score = heuristic.score(path)
+
+        for _ in range(steps):
+            child = rng.choice(list(path.successors))
+            score = heuristic.score_child(score, path, child.move)
+
+            self.assertAlmostEqual(heuristic.score(child), score)
+            path = child
+
+    def test_breadth_first(self):
+        self.assertIncrementalMatchesFull(heuristics.BreadthFirst)
+
+    def test_distance(self):
+        self.assertIncrementalMatchesFull(heuristics.Distance)
+
+    def test_euclidean_distance(self):
+        self.assertIncrementalMatchesFull(heuristics.EuclideanDistance)
+
+    def test_inversions(self):
+        self.assertIncrementalMatchesFull(heuristics.Inversions)
+
+    def test_mishmash(self):
+        self.assertIncrementalMatchesFull(heuristics.Mishmash)
+        self.assertIncrementalMatchesFull(heuristics.Mishmash, size=4)
+
+    def test_pauls(self):
+        self.assertIncrementalMatchesFull(heuristics.Pauls)
+
+    def test_half_displacement(self):
+        self.assertIncrementalMatchesFull(heuristics.HalfDisplacement)
+
+    def test_kendall_tau(self):
+        self.assertIncrementalMatchesFull(heuristics.KendallTau)
+
+    def test_inherited_score_child_is_ignored(self):
+        class Squared(heuristics.Distance):
+            def score(self, pants_path):
+                return super().score(pants_path) ** 2
+
+        class Incremental(heuristics.Distance):
+            def score_child(self, parent_score, parent_path, move):
+                return super().score_child(parent_score, parent_path, move)
+
+        goal = [3, 2, 1]
+        self.assertIsNone(heuristics.companion(Squared(goal), 'score_child'))
+        self.assertIsNone(heuristics.companion(Squared(goal), 'score_batch'))
+        self.assertIsNotNone(heuristics.companion(Incremental(goal), 'score_child'))
+        self.assertIsNotNone(heuristics.companion(heuristics.Pauls(goal), 'score_child'))
@@ -0,0 +1,96 @@
+import unittest
+
+from pants.idastar import IDAStarSolver
+from pants.astar import AStarSolver
+from pants.heuristics import Distance, KendallTau, TrimmedBF
+from pants.path import PantsPath
+from pants.state import PantsState
+
+
+class IDAStarSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = [1, 2, 3, 4, 5, 6]
+        self.goal = [6, 5, 4, 3, 2, 1]
+
+    def test_admissible_heuristic_is_optimal(self):
+        astar = AStarSolver(self.initial, self.goal, KendallTau(self.goal))
+        astar.solve()
+
+        solver = IDAStarSolver(self.initial, self.goal, KendallTau(self.goal))
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertEqual(astar.solution.depth, solver.solution.depth)
+        self.assertEqual(self.goal, solver.solution.last_state.state)
+
+    def test_solution_is_valid(self):
+        solver = IDAStarSolver(self.initial, self.goal, Distance(self.goal), weight=2)
+        solver.solve()
+
+        states = solver.solution.states
+        self.assertEqual(PantsState(0, self.initial), states[0])
+        for previous, state in zip(states, states[1:]):
+            self.assertIn(state, [previous.apply(move) for move in range(4)])
+
+    def test_initial_state_is_restored(self):
+        solver = IDAStarSolver(self.initial, self.goal, KendallTau(self.goal), weight=1.5)
+        solver.solve()
+
+        self.assertEqual([1, 2, 3, 4, 5, 6], self.initial)
+        self.assertEqual(PantsState(0, self.initial), solver.solution.states[0])
+
+    def test_heuristic_without_incremental_score(self):
+        solver = IDAStarSolver([1, 2, 3], [3, 2, 1], TrimmedBF([3, 2, 1]), weight=0)
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertEqual(4, solver.solution.depth)
+
+    def test_heuristic_sees_whole_path(self):
+        initial = PantsState(0, self.initial)
+        seen = []
+
+        class Checking:
+            def score(self, path):
+                seen.append(path)
+                return 0
+
+        solver = IDAStarSolver(self.initial, self.goal, Checking(), max_iterations=200)
+        solver.solve()
+
+        for path in seen[1:]:
+            self.assertEqual(len(path.moves), path.depth)
+            self.assertEqual(initial, path.states[0])
+            self.assertEqual(path.last_state, PantsPath.from_moves(initial, path.moves).last_state)
+
+    def test_cursor_depth(self):
+        # Scoring by depth, the parent's score is its true depth - including after backtracking
+        mismatches = []
+
+        class Depth:
+            def score(self, path):
+                return path.depth
+
+            def score_child(self, parent_score, parent_path, move):
+                if parent_path.depth != parent_score:
+                    mismatches.append((parent_path.depth, parent_score))
+                return parent_score + 1
+
+        solver = IDAStarSolver(self.initial, self.goal, Depth(), max_iterations=2000)
+        solver.solve()
+
+        self.assertEqual([], mismatches)
+
+    def test_max_iterations(self):
+        solver = IDAStarSolver(self.initial, self.goal, KendallTau(self.goal), max_iterations=10)
+        solver.solve()
+
+        self.assertFalse(solver.solved)
+        self.assertEqual(10, solver.expanded)
+
+    def test_already_solved(self):
+        solver = IDAStarSolver([2, 1], [2, 1], KendallTau([2, 1]))
+        solver.solve()
+
+        self.assertEqual(0, solver.solution.depth)
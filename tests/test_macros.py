@@ -0,0 +1,87 @@
+import random
+import unittest
+
+from pants.astar import AStarSolver
+from pants.heuristics import Distance, KendallTau
+from pants.macros import Macro, MacroAStarSolver, MacroSolver, carry_macros, mine_macros
+from pants.solver import PantsSolver
+from pants.state import PantsState, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+
+
+class MacroTest(unittest.TestCase):
+
+    def test_same_as_moves(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            moves = [rng.randrange(4) for _ in range(rng.randint(1, 6))]
+            size = rng.randint(1, 8)
+            pointer = rng.randrange(size)
+
+            state = PantsState(pointer, list(range(size)))
+            for move in moves:
+                state = state and state.apply(move)
+
+            self.assertEqual(state, Macro(moves).apply(PantsState(pointer, list(range(size)))))
+
+    def test_carry(self):
+        macro = Macro([SWAP_RIGHT] * 3)
+        self.assertEqual(PantsState(4, [1, 3, 4, 5, 2, 6]), macro.apply(PantsState(1, [1, 2, 3, 4, 5, 6])))
+        self.assertIsNone(macro.apply(PantsState(3, [1, 2, 3, 4, 5, 6])))
+
+    def test_carry_macros(self):
+        macros = carry_macros(6)
+        self.assertEqual(4 + 2 * 4 + 2 * 2, len(macros))
+        self.assertEqual(len(macros), len({macro.effect for macro in macros}))
+        self.assertEqual(4 + 2 * 2 + 2 * 1, len(carry_macros(6, max_distance=3)))
+
+    def test_mine_macros(self):
+        solutions = [[SWAP_LEFT, SWAP_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_LEFT, SWAP_RIGHT]] * 3
+        macros = mine_macros(solutions, count=2)
+        self.assertEqual(6, len(macros))
+        # Runs that undo themselves are never counted
+        for macro in macros:
+            self.assertNotIn((SWAP_LEFT, SWAP_RIGHT), list(zip(macro.moves, macro.moves[1:])))
+
+
+class MacroSolverTest(unittest.TestCase):
+
+    def check(self, initial, solution):
+        state = PantsState(0, initial)
+        for move in solution.moves:
+            state = state.apply(move)
+        self.assertEqual(solution.last_state, state)
+        self.assertEqual(solution.depth, len(solution.states) - 1)
+
+    def test_fewer_expansions(self):
+        initial = list(range(1, 14))
+        goal = list(reversed(initial))
+
+        plain = PantsSolver(initial, goal, Distance(goal))
+        plain.solve()
+        solver = MacroSolver(initial, goal, Distance(goal))
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertEqual(goal, solver.solution.last_state.state)
+        self.check(initial, solver.solution)
+        self.assertLess(solver.expanded, plain.expanded / 5)
+
+    def test_astar(self):
+        initial = list(range(1, 7))
+        goal = list(reversed(initial))
+
+        optimal = AStarSolver(initial, goal, KendallTau(goal))
+        optimal.solve()
+        solver = MacroAStarSolver(initial, goal, KendallTau(goal))
+        solver.solve()
+
+        # The primitive moves are macros too, so nothing is lost
+        self.check(initial, solver.solution)
+        self.assertEqual(optimal.solution.depth, solver.solution.depth)
+
+    def test_symmetry(self):
+        initial = list(range(1, 10))
+        goal = list(reversed(initial))
+        solver = MacroSolver(initial, goal, Distance(goal), symmetry=True)
+        solver.solve()
+        self.check(initial, solver.solution)
@@ -0,0 +1,59 @@
+import unittest
+
+from pants.heuristics import Distance
+from pants.optimize import cancel_inverses, cut_cycles, replay, shorten, shortest_moves
+from pants.oracle import OracleSolver
+from pants.path import PantsPath
+from pants.solver import PantsSolver
+from pants.state import PantsState, MOVE_POINTER_LEFT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
+
+
+class OptimizeTest(unittest.TestCase):
+
+    def test_cancel_inverses(self):
+        moves = [SWAP_RIGHT, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT, MOVE_POINTER_LEFT, SWAP_RIGHT]
+        self.assertEqual([SWAP_RIGHT, SWAP_RIGHT], cancel_inverses(moves))
+
+    def test_cut_cycles(self):
+        # Four swaps to the right and back again, around the first swap
+        moves = [SWAP_RIGHT, SWAP_RIGHT, SWAP_LEFT, SWAP_RIGHT, SWAP_LEFT, SWAP_LEFT, MOVE_POINTER_RIGHT]
+        states = replay(PantsState(0, [1, 2, 3, 4]), moves)
+        kept_states, kept_moves = cut_cycles(states, moves)
+
+        self.assertEqual([MOVE_POINTER_RIGHT], kept_moves)
+        self.assertEqual(states[-1], kept_states[-1])
+        self.assertEqual(replay(states[0], kept_moves), kept_states)
+
+    def test_shortest_moves(self):
+        start = PantsState(0, [10, 20, 30, 40, 50])
+        target = PantsState(3, [20, 30, 10, 50, 40])
+        moves = shortest_moves(start, [target], 6)
+        self.assertEqual(target, replay(start, moves)[-1])
+
+        # Carry 10 two places right, then step over and swap 50 left
+        self.assertEqual(4, len(moves))
+        self.assertIsNone(shortest_moves(start, [target], 2))
+
+    def test_shorten(self):
+        initial = list(range(1, 14))
+        goal = list(reversed(initial))
+        solver = PantsSolver(initial, goal, Distance(goal))
+        solver.solve()
+
+        path = shorten(solver.solution)
+        self.assertLess(path.depth, solver.solution.depth)
+        self.assertEqual(PantsState(0, initial), path.states[0])
+        self.assertEqual(goal, path.last_state.state)
+        self.assertEqual(path, PantsPath.from_moves(path.states[0], path.moves))
+
+    def test_shorten_to_optimal(self):
+        # Windows as long as the whole solution leave nothing to shorten
+        initial = list(range(1, 6))
+        goal = list(reversed(initial))
+        optimal = OracleSolver(initial, goal)
+        optimal.solve()
+
+        solver = PantsSolver(initial, goal, Distance(goal))
+        solver.solve()
+        path = shorten(solver.solution, window=solver.solution.depth)
+        self.assertEqual(optimal.solution.depth, path.depth)
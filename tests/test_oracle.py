@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from pants.oracle import DistanceOracle, OracleSolver, numpy, sweep
+from pants.pdb import PatternDatabase, UNREACHED
+from pants.solver import PantsSolver
+from pants.heuristics import BreadthFirst, Distance, KendallTau
+
+
+class DistanceOracleTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.goal = [6, 5, 4, 3, 2, 1]
+        cls.initial = [1, 2, 3, 4, 5, 6]
+        cls.oracle = DistanceOracle.build(cls.goal)
+
+    def test_distance_matches_breadth_first(self):
+        solver = PantsSolver(self.initial, self.goal, BreadthFirst(self.goal))
+        solver.solve()
+
+        self.assertEqual(solver.solution.depth, self.oracle.distance(self.initial, 0))
+
+    def test_every_state_is_reachable(self):
+        self.assertNotIn(UNREACHED, bytes(self.oracle.database.table))
+
+    def test_path_is_optimal(self):
+        path = self.oracle.path(self.initial, 0)
+
+        self.assertEqual(self.oracle.distance(self.initial, 0), path.depth)
+        self.assertEqual(self.goal, path.last_state.state)
+
+    def test_path_from_any_state(self):
+        path = self.oracle.path([2, 1, 3, 4, 5, 6], 0)
+
+        self.assertEqual(self.oracle.distance([2, 1, 3, 4, 5, 6], 0), path.depth)
+        for state in path.states:
+            self.assertEqual(self.oracle.distance(state.state, state.pointer), path.depth - path.states.index(state))
+
+    def test_admissible_heuristic_has_no_violations(self):
+        accuracy = self.oracle.accuracy(KendallTau(self.goal), samples=500)
+
+        self.assertEqual(500, accuracy['states'])
+        self.assertEqual(0, accuracy['violations'])
+        self.assertLess(accuracy['mean_ratio'], 1)
+
+    def test_inadmissible_heuristic_has_violations(self):
+        accuracy = self.oracle.accuracy(Distance(self.goal))
+
+        self.assertEqual(len(self.oracle.database.table), accuracy['states'])
+        self.assertGreater(accuracy['violations'], 0)
+
+    def test_waste(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        solver.solve()
+
+        waste = self.oracle.waste(solver, self.initial)
+
+        self.assertEqual(19, waste['optimal'])
+        self.assertEqual(solver.solution.depth - 19, waste['excess_moves'])
+        self.assertEqual(solver.evaluated - 20, waste['wasted'])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_vectorized_sweep_matches_pattern_database(self):
+        self.assertEqual(PatternDatabase.build(self.goal, self.goal).table, sweep(self.goal))
+
+    def test_too_large(self):
+        with self.assertRaises(ValueError):
+            DistanceOracle.build(list(range(11)))
+
+
+class OracleSolverTest(unittest.TestCase):
+
+    def test_solve(self):
+        goal = [5, 4, 3, 2, 1]
+
+        with tempfile.TemporaryDirectory() as directory:
+            solver = OracleSolver([1, 2, 3, 4, 5], goal, DistanceOracle.open(goal, directory))
+            solver.solve()
+
+            self.assertTrue(solver.solved)
+            self.assertEqual(13, solver.solution.depth)
+            self.assertEqual(1, len(os.listdir(directory)))
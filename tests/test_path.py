@@ -1,5 +1,5 @@
 import unittest
-from pants.state import PantsState
+from pants.state import PantsState, MOVE_POINTER_RIGHT, SWAP_LEFT, SWAP_RIGHT
 from pants.path import PantsPath
 
 class PantsPathTest(unittest.TestCase):
@@ -60,3 +60,48 @@ class PantsPathTest(unittest.TestCase):
         ]
 
         self.assertEqual(expected_paths, actual_child_paths)
+
+    def test_successors_include_already_visited(self):
+        initial_states = [
+            PantsState(0, [1, 2, 3, 4, 5]),
+            PantsState(1, [2, 1, 3, 4, 5]),
+        ]
+        initial_path = PantsPath(initial_states)
+
+        actual_child_paths = list(initial_path.successors)
+
+        self.assertEqual(3, len(actual_child_paths))
+        self.assertEqual(PantsPath(initial_states + [initial_states[0]]), actual_child_paths[1])
+
+    def test_children_link_to_parent(self):
+        initial_path = PantsPath([PantsState(2, [1, 2, 3, 4, 5])])
+
+        child = list(initial_path.children)[1]
+
+        self.assertIs(initial_path, child.parent)
+        self.assertEqual(1, child.depth)
+        self.assertEqual(MOVE_POINTER_RIGHT, child.move)
+
+    def test_states_rebuilt_from_parents(self):
+        states = [
+            PantsState(0, [1, 2, 3]),
+            PantsState(2, [1, 2, 3]),
+            PantsState(1, [1, 3, 2]),
+        ]
+        path = PantsPath(states)
+
+        self.assertEqual(2, path.depth)
+        self.assertEqual(states, path.states)
+        self.assertEqual(states[:2], path.parent.states)
+        self.assertEqual('[*1 2 3]\n[1 2 *3]\n[1 *3 2]', str(path))
+
+        grandchild = list(path.children)[0]
+        self.assertEqual(SWAP_LEFT, grandchild.move)
+        self.assertEqual(states + [PantsState(0, [3, 1, 2])], grandchild.states)
+
+    def test_moves_round_trip(self):
+        moves = [SWAP_RIGHT, MOVE_POINTER_RIGHT, SWAP_LEFT]
+        path = PantsPath.from_moves(PantsState(0, [1, 2, 3, 4]), moves)
+
+        self.assertEqual(moves, path.moves)
+        self.assertEqual(PantsState(2, [2, 1, 4, 3]), path.last_state)
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from itertools import permutations
+
+from pants.pdb import PatternDatabase, rank_positions, count_positions
+from pants.astar import AStarSolver
+from pants.heuristics import KendallTau, PatternDatabases
+
+
+class RankTest(unittest.TestCase):
+
+    def test_full_permutations_rank_in_order(self):
+        ranks = [rank_positions(p, 4) for p in permutations(range(4))]
+
+        self.assertEqual(list(range(24)), ranks)
+
+    def test_partial_permutations_rank_densely(self):
+        ranks = sorted(rank_positions(p, 6) for p in permutations(range(6), 3))
+
+        self.assertEqual(list(range(count_positions(6, 3))), ranks)
+
+
+class PatternDatabaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.goal = [5, 4, 3, 2, 1]
+
+    def test_full_pattern_is_exact(self):
+        database = PatternDatabase.build(self.goal, self.goal)
+
+        # The optimal solution of the reversal takes 13 moves
+        self.assertEqual(13, database.distance([1, 2, 3, 4, 5], 0))
+        self.assertEqual(0, database.distance([5, 4, 3, 2, 1], 3))
+        self.assertEqual(1, database.distance([5, 4, 2, 3, 1], 3))
+
+    def test_pattern_ignores_other_values(self):
+        database = PatternDatabase.build(self.goal, [5, 4])
+
+        self.assertEqual(0, database.distance([5, 4, 1, 2, 3], 0))
+        self.assertEqual(1, database.distance([4, 5, 1, 2, 3], 1))
+
+    def test_save_and_load(self):
+        database = PatternDatabase.build(self.goal, [5, 4, 3])
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'test.pdb')
+            database.save(filename)
+            loaded = PatternDatabase.load(filename)
+
+            self.assertEqual(self.goal, loaded.goal)
+            self.assertEqual([5, 4, 3], loaded.pattern)
+            self.assertEqual(bytes(database.table), bytes(loaded.table))
+
+            loaded.table.release()
+            loaded.source.close()
+
+    def test_open_builds_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = PatternDatabase.open(self.goal, [5, 4], directory)
+            self.assertEqual(1, len(os.listdir(directory)))
+
+            second = PatternDatabase.open(self.goal, [5, 4], directory)
+            self.assertEqual(bytes(first.table), bytes(second.table))
+
+            for database in (first, second):
+                database.table.release()
+                database.source.close()
+
+
+class PatternDatabasesTest(unittest.TestCase):
+
+    def test_optimal_with_fewer_nodes(self):
+        goal = [7, 6, 5, 4, 3, 2, 1]
+        initial = list(reversed(goal))
+
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ['PANTS_PDB_DIR'] = directory
+            try:
+                heuristic = PatternDatabases(goal)
+            finally:
+                del os.environ['PANTS_PDB_DIR']
+
+            kendall = AStarSolver(initial, goal, KendallTau(goal))
+            kendall.solve()
+            solver = AStarSolver(initial, goal, heuristic)
+            solver.solve()
+
+            self.assertEqual(kendall.solution.depth, solver.solution.depth)
+            self.assertLess(solver.evaluated, kendall.evaluated)
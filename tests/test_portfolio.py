@@ -0,0 +1,46 @@
+import time
+import unittest
+
+from pants.portfolio import PortfolioSolver
+from pants.state import PantsState
+
+
+class PortfolioSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 9))
+        self.goal = list(reversed(self.initial))
+
+    def test_first_solution_wins(self):
+        solver = PortfolioSolver(self.initial, self.goal, ['Distance', 'EuclideanDistance'], jobs=2)
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertIn(solver.winner, ['Distance', 'EuclideanDistance'])
+        self.assertEqual(solver.results[solver.winner]['moves'], solver.solution.depth)
+        self.assertEqual(PantsState(0, self.initial), solver.solution.states[0])
+        self.assertEqual(self.goal, solver.solution.last_state.state)
+
+    def test_shortest_solution_wins(self):
+        solver = PortfolioSolver(self.initial, self.goal, ['Distance', 'EuclideanDistance', 'KendallTau'],
+                                 jobs=2, shortest=True)
+        solver.solve()
+
+        self.assertEqual(3, len(solver.results))
+        shortest = min(result['moves'] for result in solver.results.values())
+        self.assertEqual(shortest, solver.solution.depth)
+        self.assertEqual(shortest, solver.results[solver.winner]['moves'])
+
+    def test_deadline_stops_slow_workers(self):
+        started = time.time()
+        solver = PortfolioSolver(list(range(1, 13)), list(range(12, 0, -1)), ['Distance', 'BreadthFirst'],
+                                 jobs=2, deadline=1, shortest=True, max_iterations=10**7)
+        solver.solve()
+
+        self.assertLess(time.time() - started, 5)
+        self.assertEqual('Distance', solver.winner)
+        self.assertNotIn('BreadthFirst', solver.results)
+
+    def test_unknown_heuristic(self):
+        with self.assertRaises(ValueError):
+            PortfolioSolver(self.initial, self.goal, ['Distance', 'Nope'])
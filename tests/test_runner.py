@@ -0,0 +1,73 @@
+import io
+import unittest
+
+from pants.runner import generate, parse_sizes, read, run_batch, solve
+
+
+class RunnerTest(unittest.TestCase):
+
+    def test_parse_sizes(self):
+        self.assertEqual([8], parse_sizes('8'))
+        self.assertEqual([5, 6, 7], parse_sizes('5-7'))
+        self.assertEqual([5, 7, 9, 10, 11], parse_sizes('5,7,9-11'))
+
+    def test_generate_sizes(self):
+        instances = list(generate([3, 4]))
+
+        self.assertEqual(['size-3', 'size-4'], [instance['id'] for instance in instances])
+        self.assertEqual([1, 2, 3], instances[0]['initial'])
+        self.assertEqual([3, 2, 1], instances[0]['goal'])
+
+    def test_generate_random(self):
+        instances = list(generate([5, 6], 10, seed=3))
+
+        self.assertEqual(10, len(instances))
+        self.assertEqual(instances, list(generate([5, 6], 10, seed=3)))
+        for instance in instances:
+            self.assertEqual(sorted(instance['initial']), sorted(instance['goal']))
+
+    def test_read(self):
+        lines = io.StringIO('{"initial": [1, 3, 2]}\n\n{"id": "x", "initial": [1, 2], "goal": [1, 2]}\n')
+        instances = list(read(lines))
+
+        self.assertEqual({'id': 1, 'initial': [1, 3, 2], 'goal': [3, 2, 1]}, instances[0])
+        self.assertEqual('x', instances[1]['id'])
+
+    def test_read_invalid(self):
+        lines = io.StringIO('not json\n{"goal": [1]}\n[1, 2]\n{"initial": [2, 1]}\n')
+        instances = list(read(lines))
+
+        self.assertEqual([1, 2, 3], [instance['id'] for instance in instances if 'error' in instance])
+        self.assertEqual({'id': 4, 'initial': [2, 1], 'goal': [2, 1]}, instances[3])
+
+    def test_solve(self):
+        result = solve({'id': 7, 'initial': [1, 2, 3, 4], 'goal': [4, 3, 2, 1]}, 'BreadthFirst', paths=True)
+
+        self.assertTrue(result['solved'])
+        self.assertEqual(8, result['moves'])
+        self.assertEqual(8, len(result['path']))
+        self.assertFalse(result['timed_out'])
+
+    def test_solve_timeout(self):
+        instance = {'id': 0, 'initial': list(range(1, 13)), 'goal': list(range(12, 0, -1))}
+        result = solve(instance, 'BreadthFirst', max_iterations=10**7, timeout=0)
+
+        self.assertFalse(result['solved'])
+        self.assertTrue(result['timed_out'])
+
+    def test_solve_invalid(self):
+        self.assertIn('error', solve({'id': 0, 'initial': [1, 2], 'goal': [1, 3]}, 'Distance'))
+        self.assertIn('error', solve({'id': 0, 'initial': [1, 2], 'goal': [2, 1]}, 'Nope'))
+
+    def test_run_batch(self):
+        results = list(run_batch(generate([4, 5, 6], 9, seed=1), 'Distance', jobs=2))
+
+        self.assertEqual(list(range(9)), sorted(result['id'] for result in results))
+        self.assertTrue(all(result['solved'] for result in results))
+
+    def test_run_batch_invalid(self):
+        lines = io.StringIO('{"initial": [1, 2, 3]}\nnot json\n{"initial": [3, 1, 2]}\n')
+        results = list(run_batch(read(lines), 'Distance', jobs=1))
+
+        self.assertEqual([1, 2, 3], sorted(result['id'] for result in results))
+        self.assertEqual([2], [result['id'] for result in results if 'error' in result])
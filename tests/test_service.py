@@ -0,0 +1,131 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pants.service import SolveService, request
+
+
+class SolveServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'pants.sock')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_service(self, client, **kwargs):
+        """
+        Run a client coroutine against a SolveService on a temporary socket.
+        """
+        service = SolveService(jobs=1, **kwargs)
+
+        async def main():
+            server = asyncio.ensure_future(service.serve(self.path))
+            while not os.path.exists(self.path):
+                await asyncio.sleep(0.01)
+            try:
+                return await client()
+            finally:
+                server.cancel()
+                try:
+                    await server
+                except asyncio.CancelledError:
+                    pass
+
+        return service, asyncio.run(main())
+
+    def test_solve(self):
+        async def client():
+            return await request([{'id': 'a', 'initial': [1, 2, 3, 4], 'heuristic': 'BreadthFirst', 'paths': True}],
+                                 self.path)
+
+        _, (response,) = self.run_service(client)
+        self.assertEqual('a', response['id'])
+        self.assertTrue(response['solved'])
+        self.assertEqual(8, response['moves'])
+        self.assertEqual(8, len(response['path']))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_coalesce_and_cache(self):
+        initial = list(range(1, 12))
+
+        async def client():
+            # Five identical requests at once share one solve, and the sixth is cached
+            responses = await asyncio.gather(*[request([{'initial': initial}], self.path) for _ in range(5)])
+            responses.append(await request([{'initial': initial, 'max_iterations': 10}], self.path))
+            stats, = await request([{'op': 'stats'}], self.path)
+            return responses, stats
+
+        _, (responses, stats) = self.run_service(client)
+        self.assertEqual(1, len({response[0]['moves'] for response in responses}))
+        self.assertEqual(1, stats['solves'])
+        self.assertEqual(4, stats['coalesced'])
+        self.assertEqual(1, stats['cache_hits'])
+        self.assertEqual(1, stats['cached'])
+        self.assertNotIn('path', responses[0][0])
+
+    def test_cache_eviction(self):
+        async def client():
+            for size in (4, 5, 6, 4):
+                await request([{'initial': list(range(1, size + 1))}], self.path)
+            return await request([{'op': 'stats'}], self.path)
+
+        service, (stats,) = self.run_service(client, cache_size=2)
+        self.assertEqual(4, stats['solves'])
+        self.assertEqual(0, stats['cache_hits'])
+        # The size 5 result was the least recently used
+        self.assertEqual([(1, 2, 3, 4, 5, 6), (1, 2, 3, 4)], [problem[0] for problem in service.cache])
+
+    def test_limits(self):
+        async def client():
+            return await request([{'initial': list(range(1, 12)), 'heuristic': 'BreadthFirst', 'max_iterations': 50},
+                                  {'initial': list(range(1, 12)), 'heuristic': 'BreadthFirst', 'timeout': 0}],
+                                 self.path)
+
+        service, responses = self.run_service(client)
+        self.assertTrue(all(not response['solved'] for response in responses))
+        self.assertEqual([False, True], sorted(response['timed_out'] for response in responses))
+        self.assertEqual(0, len(service.cache))
+
+    def test_errors(self):
+        async def client():
+            return await request([{'op': 'nope'}, [1, 2], {'goal': [1]}, {'initial': [1, 2], 'heuristic': 'Nope'}],
+                                 self.path)
+
+        service, responses = self.run_service(client)
+        self.assertTrue(all('error' in response for response in responses))
+        self.assertEqual(4, service.counts['errors'])
+
+    def test_worker_error(self):
+        # Values too large for a state key raise OverflowError in the worker
+        async def client():
+            return await request([{'id': 7, 'initial': [2 ** 70, 1]}, {'op': 'stats'}], self.path)
+
+        service, responses = self.run_service(client)
+        error, = [response for response in responses if 'id' in response]
+        self.assertEqual(7, error['id'])
+        self.assertIn('OverflowError', error['error'])
+        self.assertEqual(1, service.counts['errors'])
+        self.assertEqual(0, len(service.cache))
+
+    def test_long_requests(self):
+        initial = list(range(1, 20001))
+
+        async def client():
+            return await request([{'initial': initial, 'max_iterations': 1}], self.path)
+
+        _, (response,) = self.run_service(client)
+        self.assertEqual(20000, response['size'])
+        self.assertFalse(response['solved'])
+
+    def test_too_long_request(self):
+        async def client():
+            return await request([{'initial': list(range(1, 1001))}], self.path)
+
+        with mock.patch('pants.service.LINE_LIMIT', 1024):
+            service, (response,) = self.run_service(client)
+        self.assertIn('shorter than 1024 bytes', response['error'])
+        self.assertEqual(1, service.counts['errors'])
@@ -3,7 +3,7 @@ import unittest
 from pants.state import PantsState
 from pants.path import PantsPath
 from pants.solver import PantsSolver
-from pants.heuristics import BreadthFirst
+from pants.heuristics import BreadthFirst, Distance
 
 
 class PantsSolverTest(unittest.TestCase):
@@ -24,7 +24,7 @@ class PantsSolverTest(unittest.TestCase):
         best = self.solver.pop_best()
 
         self.assertEqual(PantsPath([PantsState(0, [1, 2, 3, 4, 5])]), best)
-        self.assertEqual([], self.solver.working_set)
+        self.assertEqual(0, len(self.solver.working_set))
 
     def test_next_iteration(self):
         self.solver.iterate()
@@ -38,3 +38,74 @@ class PantsSolverTest(unittest.TestCase):
         ])
 
         self.assertEqual(expected_best, best)
+
+    def test_expanded_states_are_closed(self):
+        self.solver.iterate()
+        self.solver.iterate()
+
+        self.assertIn(PantsState(0, [1, 2, 3, 4, 5]).key, self.solver.closed)
+        self.assertIn(PantsState(2, [1, 2, 3, 4, 5]).key, self.solver.closed)
+
+        # Moving the pointer back to the start is not queued again
+        self.assertEqual(6, self.solver.evaluated)
+
+    def test_solve(self):
+        self.solver.solve()
+
+        self.assertTrue(self.solver.solved)
+        self.assertEqual([5, 4, 3, 2, 1], self.solver.solution.last_state.state)
+        self.assertEqual(13, len(self.solver.solution.states) - 1)
+
+    def test_time_limit(self):
+        solver = PantsSolver(list(range(1, 13)), list(range(12, 0, -1)), BreadthFirst(None), max_iterations=10**7)
+        solver.solve(time_limit=0)
+
+        self.assertFalse(solver.solved)
+        self.assertEqual(0, len(solver.closed))
+
+    def test_solve_continues(self):
+        solver = PantsSolver(list(range(1, 11)), list(range(10, 0, -1)), Distance(list(range(10, 0, -1))),
+                             max_iterations=50)
+        solver.solve()
+        self.assertFalse(solver.solved)
+        self.assertEqual(50, solver.iterations)
+
+        solver.max_iterations = 100000
+        solver.solve()
+        self.assertTrue(solver.solved)
+
+    def test_iter_solve(self):
+        snapshots = list(self.solver.iter_solve(every=100))
+
+        self.assertTrue(self.solver.solved)
+        self.assertEqual([100, 200], [snapshot['iterations'] for snapshot in snapshots[:2]])
+        self.assertEqual(self.solver.snapshot(), snapshots[-1])
+        self.assertTrue(snapshots[-1]['solved'])
+        self.assertFalse(any(snapshot['solved'] for snapshot in snapshots[:-1]))
+
+    def test_iter_solve_iterations(self):
+        snapshots = list(self.solver.iter_solve(every=40, iterations=100))
+
+        self.assertEqual([40, 80, 100], [snapshot['iterations'] for snapshot in snapshots])
+        self.assertFalse(self.solver.solved)
+
+    def test_incremental_scores_match_full_scores(self):
+        heuristic = Distance([5, 4, 3, 2, 1])
+        solver = PantsSolver(
+            initial=[1, 2, 3, 4, 5],
+            goal=[5, 4, 3, 2, 1],
+            heuristic=heuristic
+        )
+
+        for _ in range(10):
+            solver.iterate()
+
+        for score, path in solver.working_set:
+            self.assertEqual(heuristic.score(path), score)
+
+    def test_negative_values(self):
+        solver = PantsSolver([0, -1, 2], [2, -1, 0], Distance([2, -1, 0]))
+        solver.solve()
+
+        self.assertTrue(solver.solved)
+        self.assertEqual([2, -1, 0], solver.solution.last_state.state)
@@ -1,5 +1,5 @@
 import unittest
-from pants.state import PantsState
+from pants.state import PantsState, pack, unpack
 
 class PantsStateTest(unittest.TestCase):
 
@@ -68,3 +68,36 @@ class PantsStateTest(unittest.TestCase):
         actual_string = str(PantsState(2, [3, 5, 2, 1, 4]))
 
         self.assertEqual(expected_string, actual_string)
+
+    def test_equal_states_share_key_and_hash(self):
+        first = PantsState(2, [3, 5, 2, 1, 4])
+        second = PantsState(2, [3, 5, 2, 1, 4])
+
+        self.assertEqual(first.key, second.key)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(1, len({first, second}))
+
+    def test_pointer_changes_key(self):
+        self.assertNotEqual(PantsState(1, [1, 2, 3]).key, PantsState(2, [1, 2, 3]).key)
+
+    def test_large_values_key(self):
+        state = list(range(300, 0, -1))
+
+        self.assertEqual(PantsState(299, state).key, PantsState(299, list(state)).key)
+        self.assertNotEqual(PantsState(298, state).key, PantsState(299, state).key)
+
+    def test_pointer_255_key(self):
+        # A first byte of 255 marks the wide format, so pointer 255 must not pack into bytes
+        state = [1] * 256
+        key = PantsState(255, state).key
+
+        self.assertEqual((255, state), unpack(key))
+        self.assertNotEqual(PantsState(254, state).key, key)
+
+    def test_negative_values_key(self):
+        self.assertNotEqual(PantsState(0, [0, -1, 2]).key, PantsState(0, [0, 1, 2]).key)
+        self.assertEqual(PantsState(0, [0, -1, 2]).key, PantsState(0, [0, -1, 2]).key)
+
+    def test_unpack(self):
+        for pointer, state in [(3, [3, 5, 2, 1, 4]), (299, list(range(300, 0, -1))), (255, list(range(256))), (1, [0, -1, 2])]:
+            self.assertEqual((pointer, state), unpack(pack(pointer, state)))
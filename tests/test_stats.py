@@ -0,0 +1,94 @@
+import unittest
+
+from pants.astar import AStarSolver
+from pants.heuristics import Distance, KendallTau
+from pants.macros import MacroSolver
+from pants.solver import PantsSolver
+from pants.stats import PHASES, SolverStats
+
+
+class CountingSolver(PantsSolver):
+
+    calls = 0
+
+    def add_path(self, path):
+        self.calls += 1
+        super().add_path(path)
+
+
+class SolverStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 9))
+        self.goal = list(reversed(self.initial))
+
+    def test_instrumented_solution_is_unchanged(self):
+        plain = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        plain.solve()
+
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        SolverStats(solver)
+        solver.solve()
+
+        self.assertEqual(plain.solution.moves, solver.solution.moves)
+        self.assertEqual(plain.evaluated, solver.evaluated)
+        self.assertEqual(plain.expanded, solver.expanded)
+
+    def test_counters(self):
+        solver = CountingSolver(self.initial, self.goal, Distance(self.goal))
+        stats = SolverStats(solver)
+        solver.solve()
+        summary = stats.summary()
+
+        # Paths are pruned either when they are generated or when they are popped
+        generated = solver.calls - 1
+        popped = summary['iterations']
+        self.assertEqual((generated - (solver.evaluated - 1)) + (popped - solver.expanded), summary['duplicates'])
+        self.assertGreater(summary['duplicates'], 0)
+        self.assertGreaterEqual(summary['frontier_peak'], summary['frontier'])
+
+    def test_phases(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        stats = SolverStats(solver)
+        solver.solve()
+        phases = stats.summary()['phases']
+
+        self.assertEqual(set(PHASES) | {'other'}, set(phases))
+        self.assertGreater(phases['score'], 0)
+        self.assertGreater(phases['goal'], 0)
+        self.assertGreater(phases['successors'], 0)
+        self.assertGreater(phases['add'], 0)
+        self.assertNotIn('phases', SolverStats(PantsSolver(self.initial, self.goal, Distance(self.goal)),
+                                               timers=False).summary())
+
+    def test_subclass_iterate(self):
+        # Subclasses keep their own iterate, and their phases are timed through the hooks
+        plain = MacroSolver(self.initial, self.goal, Distance(self.goal))
+        plain.solve()
+
+        solver = MacroSolver(self.initial, self.goal, Distance(self.goal))
+        stats = SolverStats(solver)
+        solver.solve()
+        phases = stats.summary()['phases']
+
+        self.assertEqual(plain.solution.moves, solver.solution.moves)
+        self.assertEqual(plain.expanded, solver.expanded)
+        self.assertGreater(phases['score'], 0)
+        self.assertGreater(phases['push'], 0)
+
+    def test_progress(self):
+        reports = []
+        solver = AStarSolver([1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1], KendallTau([6, 5, 4, 3, 2, 1]))
+        stats = SolverStats(solver, timers=False, progress=reports.append, every=10)
+        solver.solve()
+
+        self.assertEqual(stats.iterations // 10, len(reports))
+        self.assertIsNotNone(stats.nodes_per_second)
+
+    def test_other_solvers_are_untouched(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        SolverStats(solver)
+
+        other = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        self.assertNotIn('iterate', vars(other))
+        self.assertIn('iterate', vars(solver))
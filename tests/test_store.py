@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from pants.astar import AStarSolver
+from pants.heuristics import Distance, KendallTau
+from pants.path import PantsPath
+from pants.solver import PantsSolver
+from pants.state import PantsState
+from pants.store import SolutionStore
+from pants.vectorized import VectorizedSolver
+
+
+class SolutionStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'store.sqlite')
+        self.initial = list(range(1, 10))
+        self.goal = list(reversed(self.initial))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record_and_reload(self):
+        solver = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        solver.solve()
+
+        store = SolutionStore(self.filename)
+        self.assertEqual(solver.solution.depth + 1, store.record(self.goal, solver.solution))
+        self.assertEqual(0, store.record(self.goal, solver.solution))
+        store.close()
+
+        store = SolutionStore(self.filename)
+        self.assertEqual(solver.solution, store.solution(self.initial, self.goal))
+        self.assertEqual(solver.solution.depth, store.distance(self.goal, PantsState(0, self.initial)))
+        self.assertIsNone(store.solution(self.initial, self.initial))
+        store.close()
+
+    def test_keeps_shorter(self):
+        store = SolutionStore(self.filename)
+        long = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        long.solve()
+        short = AStarSolver(self.initial, self.goal, KendallTau(self.goal), weight=2)
+        short.solve()
+        self.assertLess(short.solution.depth, long.solution.depth)
+
+        store.record(self.goal, short.solution)
+        store.record(self.goal, long.solution)
+        self.assertEqual(short.solution.depth, store.solution(self.initial, self.goal).depth)
+
+        # Every state of the longer solution is completed by the best known remainder
+        for state in long.solution.states:
+            path = PantsPath.from_moves(state, store.suffix(self.goal, state))
+            self.assertEqual(self.goal, path.last_state.state)
+        store.close()
+
+    def test_attach(self):
+        store = SolutionStore(self.filename)
+        first = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        store.attach(first)
+        first.solve()
+        self.assertEqual(first.solution.depth, store.distance(self.goal, PantsState(0, self.initial)))
+
+        # The same problem is solved straight from the store
+        again = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        store.attach(again)
+        again.solve()
+        self.assertEqual(first.solution, again.solution)
+        self.assertLess(again.evaluated, 5)
+
+        # A related problem, starting part way along the first solution
+        state = [state for state in first.solution.states[1:] if state.pointer == 0][0]
+        related = PantsSolver(state.state, self.goal, Distance(self.goal))
+        store.attach(related)
+        related.solve()
+        self.assertEqual(store.distance(self.goal, state), related.solution.depth)
+        self.assertLess(related.evaluated, 5)
+        store.close()
+
+    def test_attach_vectorized(self):
+        first = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        first.solve()
+
+        # Only the remainders from two moves in are known, so the batched children must be completed
+        store = SolutionStore(self.filename)
+        store.record(self.goal, PantsPath.from_moves(first.solution.states[2], first.solution.moves[2:]))
+        solver = VectorizedSolver(self.initial, self.goal, Distance(self.goal), batch_size=4)
+        store.attach(solver)
+        solver.solve()
+
+        self.assertEqual(first.solution.depth, solver.solution.depth)
+        self.assertLess(solver.evaluated, 20)
+        store.close()
+
+    def test_exact(self):
+        initial = list(range(1, 7))
+        goal = list(reversed(initial))
+        store = SolutionStore(self.filename)
+
+        greedy = PantsSolver(initial, goal, Distance(goal))
+        store.attach(greedy)
+        greedy.solve()
+
+        # A shortest solution is still found through states with inexact remainders
+        optimal = AStarSolver(initial, goal, KendallTau(goal))
+        store.attach(optimal, exact=True)
+        optimal.solve()
+        plain = AStarSolver(initial, goal, KendallTau(goal))
+        plain.solve()
+        self.assertEqual(plain.solution.depth, optimal.solution.depth)
+        self.assertTrue(store.remainders(goal)[PantsState(0, initial).key][2])
+        store.close()
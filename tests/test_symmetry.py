@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+
+from pants.astar import AStarSolver
+from pants.bidirectional import BidirectionalSolver
+from pants.heuristics import BreadthFirst, KendallTau
+from pants.solver import PantsSolver
+from pants.state import PantsState
+from pants.symmetry import Mirror, mirror, parity
+from tests.helpers import replay
+
+
+class MirrorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.goal = [5, 4, 3, 2, 1]
+        self.mirror = Mirror(self.goal)
+
+    def test_goal_is_its_own_image(self):
+        for pointer in range(5):
+            image = self.mirror.image(PantsState(pointer, self.goal))
+            self.assertEqual(PantsState(4 - pointer, self.goal), image)
+
+    def test_image_of_image(self):
+        state = PantsState(1, [3, 1, 5, 2, 4])
+        self.assertEqual(PantsState(3, [2, 4, 1, 5, 3]), self.mirror.image(state))
+        self.assertEqual(state, self.mirror.image(self.mirror.image(state)))
+
+    def test_moves_are_mirrored(self):
+        state = PantsState(1, [3, 1, 5, 2, 4])
+        moves = [3, 1, 2, 0, 3]
+        mirrored = self.mirror.image(state)
+        for move, image_move in zip(moves, Mirror.moves(moves)):
+            state = state.apply(move)
+            mirrored = mirrored.apply(image_move)
+            self.assertEqual(self.mirror.image(state), mirrored)
+
+    def test_key(self):
+        state = PantsState(1, [3, 1, 5, 2, 4])
+        image = self.mirror.image(state)
+        self.assertEqual(self.mirror.key(state), self.mirror.key(image))
+        self.assertEqual(min(state.key, image.key), self.mirror.key(state))
+
+        # Large values are packed differently, but mirrored the same way
+        goal = [1000 + value for value in self.goal]
+        large = Mirror(goal)
+        state = PantsState(1, [1003, 1001, 1005, 1002, 1004])
+        self.assertEqual(large.key(state), large.key(large.image(state)))
+
+    def test_parity(self):
+        self.assertEqual(0, parity([1, 2, 3, 4, 5], [5, 4, 3, 2, 1]))
+        self.assertEqual(1, parity([1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1]))
+        self.assertEqual(1, parity([1, 2, 3], [2, 1, 3]))
+        self.assertIsNone(parity([1, 2, 3], [1, 2, 4]))
+
+    def test_only_odd_sizes(self):
+        self.assertIsNone(mirror([4, 3, 2, 1]))
+        self.assertIsInstance(mirror([5, 4, 3, 2, 1]), Mirror)
+
+    def test_no_repeated_values(self):
+        self.assertIsNone(mirror([1, 2, 2, 3, 4]))
+
+        solver = PantsSolver([1, 3, 2, 2, 4], [1, 2, 2, 3, 4], BreadthFirst(None), symmetry=True)
+        solver.solve()
+        self.assertTrue(solver.solved)
+        self.assertEqual(4, solver.solution.depth)
+
+
+class SymmetricSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 8))
+        self.goal = list(reversed(self.initial))
+
+    def test_breadth_first(self):
+        plain = PantsSolver(self.initial, self.goal, BreadthFirst(self.goal), max_iterations=10 ** 6)
+        plain.solve()
+
+        solver = PantsSolver(self.initial, self.goal, BreadthFirst(self.goal), max_iterations=10 ** 6, symmetry=True)
+        solver.solve()
+
+        self.assertEqual(plain.solution.depth, solver.solution.depth)
+        self.assertEqual(self.goal, replay(self.initial, solver.solution.moves))
+        self.assertLess(solver.evaluated, 0.6 * plain.evaluated)
+
+    def test_astar(self):
+        plain = AStarSolver(self.initial, self.goal, KendallTau(self.goal))
+        plain.solve()
+
+        solver = AStarSolver(self.initial, self.goal, KendallTau(self.goal), symmetry=True)
+        solver.solve()
+
+        self.assertEqual(plain.solution.depth, solver.solution.depth)
+        self.assertLess(len(solver.closed), len(plain.closed))
+        self.assertLess(solver.evaluated, 0.7 * plain.evaluated)
+
+    def test_resume(self):
+        solver = PantsSolver(self.initial, self.goal, BreadthFirst(self.goal), max_iterations=500, symmetry=True)
+        solver.solve()
+
+        directory = tempfile.mkdtemp()
+        filename = os.path.join(directory, 'search.ckpt')
+        try:
+            solver.checkpoint(filename)
+            resumed = PantsSolver.resume(filename, BreadthFirst(self.goal))
+        finally:
+            os.unlink(filename)
+            os.rmdir(directory)
+
+        self.assertIsNotNone(resumed.symmetry)
+        self.assertEqual(solver.closed, resumed.closed)
+
+    def test_bidirectional(self):
+        plain = BidirectionalSolver(self.initial, self.goal)
+        plain.solve()
+
+        solver = BidirectionalSolver(self.initial, self.goal, symmetry=True)
+        solver.solve()
+
+        # The halves may meet in mirrored states, but the solution is always in the original orientation
+        self.assertEqual(plain.solution.depth, solver.solution.depth)
+        self.assertEqual(self.goal, replay(self.initial, solver.solution.moves))
+        self.assertLess(solver.evaluated, plain.evaluated)
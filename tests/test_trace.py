@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from pants.astar import AStarSolver
+from pants.heuristics import Distance, KendallTau
+from pants.macros import MacroSolver
+from pants.solver import PantsSolver
+from pants.trace import SearchTrace, HEADER, NONE, PUSH, RECORD, analyze, branching_factor, load, number, numpy
+
+
+class SearchTraceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'search.trace')
+        self.initial = list(range(1, 10))
+        self.goal = list(reversed(self.initial))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def trace(self, solver):
+        with SearchTrace(solver, self.filename):
+            solver.solve()
+        return solver
+
+    def test_fixed_width(self):
+        solver = self.trace(PantsSolver(self.initial, self.goal, Distance(self.goal)))
+
+        # A record per path queued, per expansion and for the goal
+        records = solver.evaluated + solver.expanded + 1
+        self.assertEqual(HEADER.size + records * RECORD.size, os.path.getsize(self.filename))
+
+    def test_solution_unchanged(self):
+        plain = PantsSolver(self.initial, self.goal, Distance(self.goal))
+        plain.solve()
+        traced = self.trace(PantsSolver(self.initial, self.goal, Distance(self.goal)))
+
+        self.assertEqual(plain.solution, traced.solution)
+        self.assertEqual(plain.evaluated, traced.evaluated)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_analyze(self):
+        solver = self.trace(PantsSolver(self.initial, self.goal, Distance(self.goal)))
+        report = analyze(self.filename, depth_bins=4)
+
+        self.assertTrue(report['solved'])
+        self.assertEqual(solver.evaluated, report['pushed'])
+        self.assertEqual(solver.expanded, report['expanded'])
+        self.assertEqual(solver.solution.depth, report['solution_depth'])
+        self.assertEqual(0, report['reexpansions']['total'])
+        self.assertEqual(solver.expanded, sum(row['expanded'] for row in report['scores_by_depth']))
+        self.assertLessEqual(len(report['scores_by_depth']), 4)
+        self.assertEqual(solver.expanded, report['plateaus']['mean'] * report['plateaus']['count'])
+
+        # Every state on the solution path but the goal was expanded before it
+        on_path = solver.solution.depth + 1
+        self.assertAlmostEqual(1 - on_path / solver.expanded, report['off_path'])
+
+        records = load(self.filename)
+        nodes, parents = number(records)
+        self.assertEqual(0, records['parent'][0])
+        self.assertEqual(list(range(solver.evaluated)), nodes[records['kind'] == PUSH].tolist())
+        self.assertEqual(NONE, parents[0])
+        # The initial state is expanded, then its children pushed
+        self.assertEqual(0, parents[2])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_reexpansions(self):
+        initial = list(range(1, 8))
+        goal = list(reversed(initial))
+        solver = self.trace(AStarSolver(initial, goal, KendallTau(goal), weight=3))
+        report = analyze(self.filename)
+
+        self.assertEqual(solver.expanded - len(solver.closed), report['reexpansions']['total'])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_macro_solution(self):
+        solver = self.trace(MacroSolver(self.initial, self.goal, Distance(self.goal)))
+        report = analyze(self.filename)
+
+        self.assertTrue(report['solved'])
+        self.assertLess(report['off_path'], 1)
+
+    def test_branching_factor(self):
+        self.assertAlmostEqual(2, branching_factor(2 ** 11 - 1, 10), places=6)
+        self.assertEqual(1.0, branching_factor(5, 10))
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from pants.vectorized import VectorizedSolver, numpy
+from pants.solver import PantsSolver
+from pants.path import PantsPath
+from pants.state import PantsState
+from pants.stats import SolverStats
+from pants import heuristics
+
+
+class VectorizedSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.initial = list(range(1, 11))
+        self.goal = list(reversed(self.initial))
+
+    def assertValidSolution(self, solver):
+        self.assertTrue(solver.solved)
+        states = solver.solution.states
+        self.assertEqual(PantsState(0, self.initial), states[0])
+        self.assertEqual(self.goal, states[-1].state)
+        for previous, state in zip(states, states[1:]):
+            self.assertIn(state, [previous.apply(move) for move in range(4)])
+
+    def test_batches(self):
+        for heuristic_class in (heuristics.Distance, heuristics.EuclideanDistance, heuristics.KendallTau):
+            solver = VectorizedSolver(self.initial, self.goal, heuristic_class(self.goal), batch_size=8)
+            solver.solve()
+
+            self.assertValidSolution(solver)
+
+    def test_batch_of_one_matches_solver(self):
+        heuristic = heuristics.Distance(self.goal)
+        expected = PantsSolver(self.initial, self.goal, heuristic)
+        expected.solve()
+
+        solver = VectorizedSolver(self.initial, self.goal, heuristic, batch_size=1)
+        solver.solve()
+
+        self.assertEqual(expected.evaluated, solver.evaluated)
+        self.assertEqual(expected.solution, solver.solution)
+
+    def test_batch_goes_through_add_path(self):
+        heuristic = heuristics.Distance(self.goal)
+        solver = VectorizedSolver(self.initial, self.goal, heuristic, batch_size=8)
+        stats = SolverStats(solver)
+        solver.solve()
+
+        added = []
+        expected = VectorizedSolver(self.initial, self.goal, heuristic, batch_size=8)
+        add_path = expected.add_path
+        expected.add_path = lambda path: added.append(path) or add_path(path)
+        expected.solve()
+
+        self.assertEqual(expected.evaluated - 1, len({id(path) for path in added}))
+        self.assertEqual(expected.evaluated, solver.evaluated)
+        self.assertGreater(stats.summary()['phases']['add'], 0)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class ScoreBatchTest(unittest.TestCase):
+
+    def test_batch_scores_match_scores(self):
+        size = 12
+        goal = list(range(size, 0, -1))
+        rng = random.Random(size)
+        states = [PantsState(rng.randrange(size), rng.sample(goal, size)) for _ in range(50)]
+
+        matrix = numpy.array([state.state for state in states])
+        pointers = numpy.array([state.pointer for state in states])
+
+        for heuristic_class in (heuristics.Distance, heuristics.EuclideanDistance,
+                                heuristics.Inversions, heuristics.Pauls):
+            heuristic = heuristic_class(goal)
+            expected = [heuristic.score(PantsPath([state])) for state in states]
+
+            self.assertEqual(expected, heuristic.score_batch(matrix, pointers).tolist())